@@ -6,6 +6,7 @@ import {
   CpuLoadParams,
   CpuUtilizationSloConfig,
   CpuUtilizationSloMappingSpec,
+  DecisionTelemetry,
   ElasticityDecisionLogic
 } from '@org/slos';
 import {
@@ -82,15 +83,18 @@ export class CpuUtilizationSlo
 
   async evaluate(): Promise<SloOutput<SloCompliance>> {
 
-    const sample = await this.cpuLoadMetricSource.getCurrentValue().toPromise()
-      .then(() => this.averageCpuUtilizationMetricSource.getCurrentValue().toPromise())
+    const namespace = this.sloMapping.metadata.namespace;
+    const sample = await DecisionTelemetry.instance.time('metric_fetch', namespace,
+      () => this.cpuLoadMetricSource.getCurrentValue().toPromise()
+        .then(() => this.averageCpuUtilizationMetricSource.getCurrentValue().toPromise()));
     const currSloCompliancePercentage = this.calculateCompliance(sample.value);
     const compliance: SloCompliance = {
       currSloCompliancePercentage,
       tolerance: 0
     };
 
-    const elasticityStrategy = await this.selectStrategy(compliance);
+    const elasticityStrategy = await DecisionTelemetry.instance.time('strategy_selection', namespace,
+      () => this.selectStrategy(compliance));
     Logger.log('chosen strategy', elasticityStrategy);
     return {
       sloMapping: this.sloMapping,
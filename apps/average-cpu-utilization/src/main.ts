@@ -2,10 +2,14 @@ import { KubeConfig } from '@kubernetes/client-node';
 import {
   CpuUtilizationSloMapping,
   CpuUtilizationSloMappingSpec,
+  DecisionTelemetry,
   initPolarisLib as initSloMappingsLib,
+  ScaleTargetCache,
+  TimedSloEvaluator,
 } from '@org/slos';
 import {
   Logger,
+  ObjectKind,
   convertToNumber,
   getEnvironmentVariable,
 } from '@polaris-sloc/core';
@@ -39,8 +43,21 @@ sloControlLoop.microcontrollerFactory.registerFactoryFn(
   () => new CpuUtilizationSlo()
 );
 
+// Expose the latencies of the scaling decisions, if PROMETHEUS_METRICS_ENDPOINT_PORT is set.
+const metricsEndpointPort = getEnvironmentVariable(
+  'PROMETHEUS_METRICS_ENDPOINT_PORT',
+  convertToNumber
+);
+if (metricsEndpointPort) {
+  DecisionTelemetry.instance.start(
+    'average-cpu-utilization',
+    metricsEndpointPort,
+    getEnvironmentVariable('PROMETHEUS_METRICS_ENDPOINT_PATH') || '/metrics'
+  );
+}
+
 // Create an SloEvaluator and start the control loop with an interval read from the SLO_CONTROL_LOOP_INTERVAL_MSEC environment variable (default is 20 seconds).
-const sloEvaluator = polarisRuntime.createSloEvaluator();
+const sloEvaluator = new TimedSloEvaluator(polarisRuntime.createSloEvaluator());
 const intervalMsec =
   getEnvironmentVariable('SLO_CONTROL_LOOP_INTERVAL_MSEC', convertToNumber) ||
   20000;
@@ -63,3 +80,15 @@ watchManager
     Logger.error(error);
     process.exit(1);
   });
+
+// Keep the shared cache of SLO targets up to date by watching the supported target kinds.
+ScaleTargetCache.instance
+  .startWatching(polarisRuntime.createWatchManager(), [
+    new ObjectKind({ group: 'apps', version: 'v1', kind: 'Deployment' }),
+    new ObjectKind({ group: 'apps', version: 'v1', kind: 'StatefulSet' }),
+    new ObjectKind({ group: 'apps', version: 'v1', kind: 'ReplicaSet' }),
+  ])
+  .catch((error) => {
+    Logger.error(error);
+    process.exit(1);
+  });
@@ -66,31 +66,37 @@ export class AverageCpuUtilizationMetricSource extends ComposedMetricSourceBase<
 
   private queryCpuLoad(): TimeInstantQuery<number> {
     const targetFilter = LabelFilters.regex('target_name', `${this.params.sloTarget.name}.*`);
+    const namespaceFilter = LabelFilters.equal('target_namespace', this.params.namespace);
 
     return this.metricsSource.getTimeSeriesSource()
       .select<number>('polaris', 'composed_metrics_polaris_slo_cloud_github_io_v1_cpu_load')
       .filterOnLabel(targetFilter)
+      .filterOnLabel(namespaceFilter)
       .sumByGroup();
   }
 
   private queryCpuLimit(): TimeInstantQuery<number> {
     const resourceFilter = LabelFilters.equal('resource', 'cpu');
     const podFilter = LabelFilters.regex('pod', `${this.params.sloTarget.name}.*`);
+    const namespaceFilter = LabelFilters.equal('namespace', this.params.namespace);
 
     return this.metricsSource.getTimeSeriesSource()
       .select<number>('kube', 'pod_container_resource_limits')
       .filterOnLabel(podFilter)
       .filterOnLabel(resourceFilter)
+      .filterOnLabel(namespaceFilter)
       .minByGroup()
       .multiplyBy(this.queryReplicas());
   }
 
   private queryReplicas(): TimeInstantQuery<number> {
     const deploymentFilter = LabelFilters.equal('deployment', this.params.sloTarget.name);
+    const namespaceFilter = LabelFilters.equal('namespace', this.params.namespace);
 
     return this.metricsSource.getTimeSeriesSource()
       .select<number>('kube', 'deployment_spec_replicas')
       .filterOnLabel(deploymentFilter)
+      .filterOnLabel(namespaceFilter)
       .minByGroup();
   }
 }
@@ -5,18 +5,18 @@ import {
   Sample,
 } from '@polaris-sloc/core';
 import {AverageCpuUtilization, CpuLoad, CpuLoadParams} from '@org/slos';
-import {Observable, of} from 'rxjs';
+import {EMPTY, Observable, of} from 'rxjs';
+import {CpuLoadTestData} from './cpu-load.test-data';
+import {CpuLoadTestDataEndpoint} from './cpu-load.test-data-endpoint';
 
 
 /**
  * Computes the `CpuLoad` composed metric.
  */
-
-const CPU_LOAD: number[] = JSON.parse(process.env['CPU_TEST_DATA'])
-
 export class CpuLoadMetricSource extends ComposedMetricSourceBase<CpuLoad> {
 
   private index = 0;
+  private generation = CpuLoadTestData.instance.generation;
 
   constructor(
     private params: CpuLoadParams,
@@ -27,13 +27,39 @@ export class CpuLoadMetricSource extends ComposedMetricSourceBase<CpuLoad> {
   }
 
   getValueStream(): Observable<Sample<CpuLoad>> {
-    if (this.index >= CPU_LOAD.length) {
+    const testData = CpuLoadTestData.instance;
+    if (testData.trace) {
+      return this.getTraceValue(testData);
+    }
+    const profile = testData.profile;
+    if (!profile || profile.length === 0) {
+      return EMPTY;
+    }
+    if (this.generation !== testData.generation || this.index >= profile.length) {
+      this.generation = testData.generation;
       this.index = 0;
     }
+    const value = profile.valueAt(this.index);
+    CpuLoadTestDataEndpoint.instance.update(this.params, this.index++, value);
+    return of({
+      timestamp: Date.now(),
+      value: {
+        cpuLoadMillis: this.toCpuCores(value)
+      }
+    });
+  }
+
+  /**
+   * Reads the trace value at the current time since the last reset, rather than advancing by one value per call.
+   */
+  private getTraceValue(testData: CpuLoadTestData): Observable<Sample<CpuLoad>> {
+    const index = testData.trace.indexAt(testData.traceElapsedMs);
+    const value = testData.trace.valueAt(index);
+    CpuLoadTestDataEndpoint.instance.update(this.params, index, value);
     return of({
       timestamp: Date.now(),
       value: {
-        cpuLoadMillis: this.toCpuCores(CPU_LOAD[this.index++])
+        cpuLoadMillis: this.toCpuCores(value)
       }
     });
   }
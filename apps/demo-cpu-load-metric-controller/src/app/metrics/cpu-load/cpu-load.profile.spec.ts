@@ -0,0 +1,30 @@
+import { CpuLoadProfile } from './cpu-load.profile';
+
+// The same encodings are produced by profiles.encode_profile() in test/tools/tests/test_profiles.py.
+const encodedProfiles: [number[], string][] = [
+  [[-5, 250], '50534c50' + '0100' + '01' + '00' + '02000000' + 'fbffffff' + '00ff'],
+  [[1000, 1256], '50534c50' + '0100' + '02' + '00' + '02000000' + 'e8030000' + '0000' + '0001'],
+  [[-70000, 0], '50534c50' + '0100' + '04' + '00' + '02000000' + '90eefeff' + '00000000' + '70110100'],
+];
+
+describe('CpuLoadProfile', () => {
+  it.each(encodedProfiles)('encodes %j like profiles.py', (values, encoded) => {
+    expect(CpuLoadProfile.fromValues(values).buffer.toString('hex')).toBe(encoded);
+  });
+
+  it.each(encodedProfiles)('decodes %j', (values, encoded) => {
+    const profile = CpuLoadProfile.decode(Buffer.from(encoded, 'hex'));
+    expect(profile.length).toBe(values.length);
+    expect(values.map((_, i) => profile.valueAt(i))).toEqual(values);
+  });
+
+  it('rounds half to even like profiles.py', () => {
+    const profile = CpuLoadProfile.fromValues([-2.5, 0.5, 1.5, 2.5, 2.6]);
+    expect(profile.buffer.toString('hex')).toBe('50534c50' + '0100' + '01' + '00' + '05000000' + 'feffffff' + '0002040405');
+    expect([0, 1, 2, 3, 4].map(i => profile.valueAt(i))).toEqual([-2, 0, 2, 2, 3]);
+  });
+
+  it('rejects truncated profiles', () => {
+    expect(() => CpuLoadProfile.decode(Buffer.from(encodedProfiles[2][1].slice(0, -2), 'hex'))).toThrow();
+  });
+});
@@ -0,0 +1,85 @@
+const PROFILE_MAGIC = 'PSLP';
+const PROFILE_VERSION = 1;
+const PREAMBLE_LENGTH = 16;
+const VALUE_WIDTHS = [1, 2, 4];
+
+/**
+ * Rounds half to even, like `np.rint()` in `profiles.compact_values()`, e.g., 2.5 to 2 and 3.5 to 4.
+ */
+function roundHalfToEven(value: number): number {
+  const rounded = Math.round(value);
+  return Math.abs(value % 1) === 0.5 && rounded % 2 !== 0 ? rounded - 1 : rounded;
+}
+
+/**
+ * A CPU load profile in millis, kept in the compact binary encoding of `test/tools/profiles.py`.
+ *
+ * The encoding consists of a 16 byte little-endian preamble (magic `PSLP`, uint16 version, uint8 value width,
+ * one padding byte, uint32 count, int32 base) followed by `count` unsigned offsets from `base` of `width` bytes each.
+ * Values are read from the buffer on demand, so that profiles with 10^5 values are not expanded into arrays.
+ */
+export class CpuLoadProfile {
+  private constructor(
+    readonly buffer: Buffer,
+    readonly length: number,
+    private width: number,
+    private base: number
+  ) {}
+
+  /**
+   * Decodes the binary encoding of a profile.
+   *
+   * @throws Error if `buffer` does not contain a valid profile.
+   */
+  static decode(buffer: Buffer): CpuLoadProfile {
+    if (buffer.length < PREAMBLE_LENGTH || buffer.toString('latin1', 0, 4) !== PROFILE_MAGIC) {
+      throw new Error('Not a CPU load profile');
+    }
+    const version = buffer.readUInt16LE(4);
+    const width = buffer.readUInt8(6);
+    const length = buffer.readUInt32LE(8);
+    const base = buffer.readInt32LE(12);
+    if (version !== PROFILE_VERSION || !VALUE_WIDTHS.includes(width)) {
+      throw new Error(`Unsupported CPU load profile version ${version} with value width ${width}`);
+    }
+    if (buffer.length < PREAMBLE_LENGTH + length * width) {
+      throw new Error(`CPU load profile is truncated, expected ${length} values`);
+    }
+    return new CpuLoadProfile(buffer.subarray(0, PREAMBLE_LENGTH + length * width), length, width, base);
+  }
+
+  /**
+   * Encodes a list of values, e.g., from the `CPU_TEST_DATA` JSON array, the same way as `profiles.encode_profile()`.
+   */
+  static fromValues(values: number[]): CpuLoadProfile {
+    const rounded = values.map(value => roundHalfToEven(value));
+    const base = rounded.length > 0 ? rounded.reduce((min, value) => Math.min(min, value)) : 0;
+    const maxOffset = rounded.reduce((max, value) => Math.max(max, value - base), 0);
+    const width = VALUE_WIDTHS.find(width => maxOffset < 2 ** (8 * width));
+    if (width === undefined) {
+      throw new Error('CPU load profile values do not fit into a 32 bit range');
+    }
+    const buffer = Buffer.alloc(PREAMBLE_LENGTH + rounded.length * width);
+    buffer.write(PROFILE_MAGIC, 0, 'latin1');
+    buffer.writeUInt16LE(PROFILE_VERSION, 4);
+    buffer.writeUInt8(width, 6);
+    buffer.writeUInt32LE(rounded.length, 8);
+    buffer.writeInt32LE(base, 12);
+    rounded.forEach((value, i) => buffer.writeUIntLE(value - base, PREAMBLE_LENGTH + i * width, width));
+    return new CpuLoadProfile(buffer, rounded.length, width, base);
+  }
+
+  /**
+   * @returns The value at the specified index.
+   */
+  valueAt(index: number): number {
+    return this.base + this.buffer.readUIntLE(PREAMBLE_LENGTH + index * this.width, this.width);
+  }
+
+  /**
+   * @returns `true` if `other` encodes the same values.
+   */
+  equals(other: CpuLoadProfile): boolean {
+    return !!other && this.buffer.equals(other.buffer);
+  }
+}
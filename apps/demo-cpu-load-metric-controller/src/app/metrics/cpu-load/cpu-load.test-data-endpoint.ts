@@ -0,0 +1,174 @@
+import { createServer, IncomingMessage, Server, ServerResponse } from 'http';
+import { Logger } from '@polaris-sloc/core';
+import { CpuLoadParams } from '@org/slos';
+import { CpuLoadProfile } from './cpu-load.profile';
+import { CpuLoadTestData } from './cpu-load.test-data';
+
+/**
+ * The test data entry that was most recently emitted for a target.
+ */
+export interface TestDataProgress {
+  seq: number;
+  namespace: string;
+  name: string;
+  index: number;
+  value: number;
+  timestamp: number;
+}
+
+interface PendingRequest {
+  since: number;
+  namespace?: string;
+  name?: string;
+  res: ServerResponse;
+  timeout: NodeJS.Timeout;
+}
+
+const DEFAULT_TIMEOUT_MS = 30000;
+const PROFILE_CONTENT_TYPE = 'application/octet-stream';
+
+/**
+ * Exposes the current `CPU_TEST_DATA` position of every `CpuLoadMetricSource` over HTTP.
+ *
+ * `GET /test-data?namespace=<ns>&name=<target>&since=<seq>&timeoutMs=<ms>` returns the latest matching entry
+ * as soon as its `seq` is greater than `since`, or when the timeout expires (long-poll).
+ *
+ * `POST /test-data/reset` with an optional body restarts all metric sources at index 0 (optionally with new test data)
+ * and forgets the reported progress, so that a test session can start the next test from a clean state. The body is
+ * either a JSON array or, with `Content-Type: application/octet-stream`, a binary `CpuLoadProfile`.
+ */
+export class CpuLoadTestDataEndpoint {
+  /** The singleton instance of this endpoint. */
+  static readonly instance = new CpuLoadTestDataEndpoint();
+
+  private seq = 0;
+  private progress = new Map<string, TestDataProgress>();
+  private pending = new Set<PendingRequest>();
+  private server: Server;
+
+  update(params: CpuLoadParams, index: number, value: number): void {
+    const entry: TestDataProgress = {
+      seq: ++this.seq,
+      namespace: params.namespace,
+      name: params.sloTarget.name,
+      index,
+      value,
+      timestamp: Date.now(),
+    };
+    this.progress.set(`${entry.namespace}/${entry.name}`, entry);
+
+    this.pending.forEach(req => {
+      if (this.matches(entry, req.namespace, req.name)) {
+        this.respond(req, entry);
+      }
+    });
+  }
+
+  start(port: number, path = '/test-data'): void {
+    this.server = createServer((req, res) => this.handleRequest(req, res, path));
+    this.server.listen(port);
+    Logger.log(`Serving CPU test data progress on port ${port} at ${path}`);
+  }
+
+  private handleRequest(req: IncomingMessage, res: ServerResponse, path: string): void {
+    const url = new URL(req.url, 'http://localhost');
+    if (req.method === 'POST' && url.pathname === `${path}/reset`) {
+      this.handleReset(req, res);
+      return;
+    }
+    if (req.method !== 'GET' || url.pathname !== path) {
+      res.writeHead(404).end();
+      return;
+    }
+
+    const namespace = url.searchParams.get('namespace') ?? undefined;
+    const name = url.searchParams.get('name') ?? undefined;
+    const since = Number(url.searchParams.get('since') ?? -1);
+    const timeoutMs = Number(url.searchParams.get('timeoutMs') ?? DEFAULT_TIMEOUT_MS);
+
+    const latest = this.findLatest(namespace, name);
+    if (latest && latest.seq > since) {
+      this.send(res, latest);
+      return;
+    }
+
+    const pendingRequest: PendingRequest = {
+      since,
+      namespace,
+      name,
+      res,
+      timeout: setTimeout(() => this.respond(pendingRequest, this.findLatest(namespace, name)), timeoutMs),
+    };
+    this.pending.add(pendingRequest);
+    res.on('close', () => {
+      clearTimeout(pendingRequest.timeout);
+      this.pending.delete(pendingRequest);
+    });
+  }
+
+  private handleReset(req: IncomingMessage, res: ServerResponse): void {
+    const chunks: Buffer[] = [];
+    req.on('data', (chunk: Buffer) => chunks.push(chunk));
+    req.on('end', () => {
+      const body = Buffer.concat(chunks);
+      let profile: CpuLoadProfile;
+      try {
+        profile = this.parseProfile(body, req.headers['content-type']);
+      } catch (e) {
+        res.writeHead(400).end();
+        return;
+      }
+      CpuLoadTestData.instance.reset(profile);
+      this.progress.clear();
+      const newData = profile ? ` with a profile of ${profile.length} values` : '';
+      Logger.log(`CPU test data reset to index 0${newData}`);
+      res.writeHead(204).end();
+    });
+  }
+
+  private parseProfile(body: Buffer, contentType?: string): CpuLoadProfile {
+    if (body.length === 0) {
+      return undefined;
+    }
+    if (contentType?.startsWith(PROFILE_CONTENT_TYPE)) {
+      return CpuLoadProfile.decode(body);
+    }
+    const values: unknown = JSON.parse(body.toString());
+    if (!this.isTestData(values)) {
+      throw new Error('Test data must be a non-empty array of numbers');
+    }
+    return CpuLoadProfile.fromValues(values);
+  }
+
+  private isTestData(values: unknown): values is number[] {
+    return Array.isArray(values) && values.length > 0 && values.every(value => typeof value === 'number');
+  }
+
+  private findLatest(namespace?: string, name?: string): TestDataProgress {
+    let latest: TestDataProgress = null;
+    this.progress.forEach(entry => {
+      if (this.matches(entry, namespace, name) && (!latest || entry.seq > latest.seq)) {
+        latest = entry;
+      }
+    });
+    return latest;
+  }
+
+  private matches(entry: TestDataProgress, namespace?: string, name?: string): boolean {
+    return (!namespace || entry.namespace === namespace) && (!name || entry.name === name);
+  }
+
+  private respond(req: PendingRequest, entry: TestDataProgress): void {
+    clearTimeout(req.timeout);
+    this.pending.delete(req);
+    this.send(req.res, entry);
+  }
+
+  private send(res: ServerResponse, entry: TestDataProgress): void {
+    if (!entry) {
+      res.writeHead(204).end();
+      return;
+    }
+    res.writeHead(200, { 'Content-Type': 'application/json' }).end(JSON.stringify(entry));
+  }
+}
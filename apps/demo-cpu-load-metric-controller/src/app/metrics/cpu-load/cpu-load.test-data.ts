@@ -0,0 +1,119 @@
+import { existsSync, readFileSync, watchFile } from 'fs';
+import { Logger } from '@polaris-sloc/core';
+import { CpuLoadProfile } from './cpu-load.profile';
+import { CpuLoadTrace } from './cpu-load.trace';
+
+const PROFILE_FILE_POLL_INTERVAL_MS = 1000;
+
+/**
+ * Holds the CPU load profile that is replayed by all `CpuLoadMetricSource` instances.
+ *
+ * The profile is read from the binary file at `CPU_TEST_DATA_FILE` (e.g., a mounted ConfigMap), which is watched for
+ * changes, or else from the `CPU_TEST_DATA` JSON array.
+ *
+ * If the trace file at `CPU_TRACE_FILE` exists, it takes precedence over the profile and is replayed by time since the
+ * last reset instead of by step. `CPU_TRACE_TIME_SCALE` speeds up the replay for time-compressed test runs.
+ *
+ * Every `reset()` starts a new generation, which makes all metric sources restart at index 0, and reopens the trace.
+ */
+export class CpuLoadTestData {
+  /** The singleton instance of the test data. */
+  static readonly instance = CpuLoadTestData.fromEnvironment();
+
+  private _profile: CpuLoadProfile;
+  private _trace: CpuLoadTrace = null;
+  private _generation = 0;
+  private _startedAt = Date.now();
+
+  constructor(profile: CpuLoadProfile, private tracePath?: string, readonly traceTimeScale = 1) {
+    this._profile = profile;
+    this.openTrace();
+  }
+
+  private static fromEnvironment(): CpuLoadTestData {
+    const tracePath = process.env['CPU_TRACE_FILE'];
+    const traceTimeScale = Number(process.env['CPU_TRACE_TIME_SCALE'] ?? 1) || 1;
+    const path = process.env['CPU_TEST_DATA_FILE'];
+    let profile: CpuLoadProfile = null;
+    if (path && existsSync(path)) {
+      profile = CpuLoadProfile.decode(readFileSync(path));
+    } else if (process.env['CPU_TEST_DATA'] || (!path && !tracePath)) {
+      profile = CpuLoadProfile.fromValues(JSON.parse(process.env['CPU_TEST_DATA']));
+    }
+    const testData = new CpuLoadTestData(profile, tracePath, traceTimeScale);
+    if (path) {
+      testData.watch(path);
+    }
+    return testData;
+  }
+
+  /** The current profile, or `null` if the profile file does not exist yet. */
+  get profile(): CpuLoadProfile {
+    return this._profile;
+  }
+
+  /** The trace that is replayed instead of the profile, or `null` if there is none. */
+  get trace(): CpuLoadTrace {
+    return this._trace;
+  }
+
+  get generation(): number {
+    return this._generation;
+  }
+
+  /**
+   * @returns The position in the trace in trace time, i.e., the time since the last reset times `traceTimeScale`.
+   */
+  get traceElapsedMs(): number {
+    return (Date.now() - this._startedAt) * this.traceTimeScale;
+  }
+
+  reset(profile?: CpuLoadProfile): void {
+    if (profile) {
+      this._profile = profile;
+    }
+    ++this._generation;
+    this._startedAt = Date.now();
+    this.openTrace();
+  }
+
+  /**
+   * (Re)opens the trace file, so that a trace file that was added, replaced or removed takes effect on the next reset.
+   */
+  private openTrace(): void {
+    this._trace?.close();
+    this._trace = null;
+    if (!this.tracePath || !existsSync(this.tracePath)) {
+      return;
+    }
+    try {
+      this._trace = CpuLoadTrace.open(this.tracePath);
+      const { length, stepMs } = this._trace;
+      Logger.log(`Replaying CPU load trace ${this.tracePath} with ${length} values every ${stepMs} ms`);
+    } catch (e) {
+      Logger.error(`Could not open CPU load trace ${this.tracePath}: ${e}`);
+    }
+  }
+
+  /**
+   * Polls the profile file, because ConfigMap volumes are updated by swapping a symlink, which `fs.watch()` misses.
+   * A file with the same content as the current profile, e.g., one that was already pushed to the test data endpoint,
+   * does not restart the metric sources.
+   */
+  private watch(path: string): void {
+    watchFile(path, { interval: PROFILE_FILE_POLL_INTERVAL_MS }, (curr, prev) => {
+      if (curr.mtimeMs === prev.mtimeMs && curr.ino === prev.ino) {
+        return;
+      }
+      try {
+        const profile = CpuLoadProfile.decode(readFileSync(path));
+        if (!profile.equals(this._profile)) {
+          this.reset(profile);
+          Logger.log(`Loaded CPU load profile with ${profile.length} values from ${path}`);
+        }
+      } catch (e) {
+        Logger.error(`Could not load CPU load profile from ${path}: ${e}`);
+      }
+    });
+  }
+}
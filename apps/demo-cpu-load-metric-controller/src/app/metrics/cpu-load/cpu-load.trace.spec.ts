@@ -0,0 +1,37 @@
+import { mkdtempSync, rmSync, writeFileSync } from 'fs';
+import { tmpdir } from 'os';
+import { join } from 'path';
+import { CpuLoadTrace } from './cpu-load.trace';
+
+// The same trace is written by traces.write_trace() in test/tools/tests/test_traces.py.
+const encodedTrace =
+  '50534c54' + '0100' + '01' + '00' + '03000000' + 'fbffffff' + '983a0000' + '00000040fc54d941' + '00000000' +
+  '00' + 'ff' + '69';
+
+describe('CpuLoadTrace', () => {
+  let dir: string;
+
+  beforeEach(() => dir = mkdtempSync(join(tmpdir(), 'cpu-load-trace-')));
+  afterEach(() => rmSync(dir, { recursive: true, force: true }));
+
+  function writeTrace(hex: string): string {
+    const path = join(dir, 'test.trace');
+    writeFileSync(path, Buffer.from(hex, 'hex'));
+    return path;
+  }
+
+  it('replays a trace written by traces.py', () => {
+    const trace = CpuLoadTrace.open(writeTrace(encodedTrace));
+    try {
+      expect(trace.length).toBe(3);
+      expect(trace.stepMs).toBe(15000);
+      expect([0, 14900, 15000, 44000, 45000].map(ms => trace.valueAt(trace.indexAt(ms)))).toEqual([-5, -5, 250, 100, -5]);
+    } finally {
+      trace.close();
+    }
+  });
+
+  it('rejects files that are not traces', () => {
+    expect(() => CpuLoadTrace.open(writeTrace('50534c50' + encodedTrace.slice(8)))).toThrow();
+  });
+});
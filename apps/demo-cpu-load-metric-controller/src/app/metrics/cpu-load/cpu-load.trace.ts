@@ -0,0 +1,78 @@
+import { closeSync, openSync, readSync } from 'fs';
+
+const TRACE_MAGIC = 'PSLT';
+const TRACE_VERSION = 1;
+const PREAMBLE_LENGTH = 32;
+const VALUE_WIDTHS = [1, 2, 4];
+
+/**
+ * A recorded CPU load trace in millis, resampled to a fixed step by `test/tools/traces.py`.
+ *
+ * The file consists of a 32 byte little-endian preamble (magic `PSLT`, uint16 version, uint8 value width, one padding
+ * byte, uint32 count, int32 base, uint32 step in milliseconds, float64 start as unix seconds, four padding bytes)
+ * followed by `count` unsigned offsets from `base` of `width` bytes each.
+ *
+ * Only the preamble is kept in memory, each value is read from the file when it is needed, so that traces with
+ * millions of values can be replayed without loading them.
+ */
+export class CpuLoadTrace {
+  private readonly valueBuffer: Buffer;
+
+  private constructor(
+    private fd: number,
+    readonly path: string,
+    readonly length: number,
+    readonly stepMs: number,
+    private width: number,
+    private base: number
+  ) {
+    this.valueBuffer = Buffer.alloc(width);
+  }
+
+  /**
+   * Opens a trace file.
+   *
+   * @throws Error if `path` cannot be opened or is not a valid trace.
+   */
+  static open(path: string): CpuLoadTrace {
+    const fd = openSync(path, 'r');
+    try {
+      const preamble = Buffer.alloc(PREAMBLE_LENGTH);
+      const read = readSync(fd, preamble, 0, PREAMBLE_LENGTH, 0);
+      if (read < PREAMBLE_LENGTH || preamble.toString('latin1', 0, 4) !== TRACE_MAGIC) {
+        throw new Error(`${path} is not a CPU load trace`);
+      }
+      const version = preamble.readUInt16LE(4);
+      const width = preamble.readUInt8(6);
+      const length = preamble.readUInt32LE(8);
+      const stepMs = preamble.readUInt32LE(16);
+      if (version !== TRACE_VERSION || !VALUE_WIDTHS.includes(width) || length === 0 || stepMs === 0) {
+        throw new Error(`Unsupported CPU load trace ${path} (version ${version}, ${length} values of width ${width})`);
+      }
+      return new CpuLoadTrace(fd, path, length, stepMs, width, preamble.readInt32LE(12));
+    } catch (e) {
+      closeSync(fd);
+      throw e;
+    }
+  }
+
+  /**
+   * @returns The index of the value at the specified time since the start of the replay. The trace is replayed
+   * cyclically.
+   */
+  indexAt(elapsedMs: number): number {
+    return Math.floor(Math.max(0, elapsedMs) / this.stepMs) % this.length;
+  }
+
+  /**
+   * @returns The value at the specified index.
+   */
+  valueAt(index: number): number {
+    readSync(this.fd, this.valueBuffer, 0, this.width, PREAMBLE_LENGTH + index * this.width);
+    return this.base + this.valueBuffer.readUIntLE(0, this.width);
+  }
+
+  close(): void {
+    closeSync(this.fd);
+  }
+}
@@ -1,2 +1,6 @@
 export * from './cpu-load.metric-source';
 export * from './cpu-load.metric-source.factory';
+export * from './cpu-load.profile';
+export * from './cpu-load.test-data';
+export * from './cpu-load.test-data-endpoint';
+export * from './cpu-load.trace';
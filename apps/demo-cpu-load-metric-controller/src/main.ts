@@ -16,7 +16,7 @@ import {
   PrometheusComposedMetricsCollectorManager,
   initPrometheusQueryBackend,
 } from '@polaris-sloc/prometheus';
-import { CpuLoadMetricSourceFactory } from './app/metrics';
+import { CpuLoadMetricSourceFactory, CpuLoadTestDataEndpoint } from './app/metrics';
 
 // Load the KubeConfig and initialize the @polaris-sloc/kubernetes library.
 const k8sConfig = new KubeConfig();
@@ -56,6 +56,15 @@ promMetricsCollectorManager.start({
   port: metricsEndpointPort,
 });
 
+// Expose the current CPU_TEST_DATA position, so that test harnesses can wait for a value without polling Prometheus.
+const testDataEndpointPort = getEnvironmentVariable(
+  'TEST_DATA_ENDPOINT_PORT',
+  convertToNumber
+);
+if (testDataEndpointPort) {
+  CpuLoadTestDataEndpoint.instance.start(testDataEndpointPort);
+}
+
 // Create a ComposedMetricsManager and watch the supported composed metric type kinds.
 const manager = polarisRuntime.createComposedMetricsManager();
 const intervalMsec =
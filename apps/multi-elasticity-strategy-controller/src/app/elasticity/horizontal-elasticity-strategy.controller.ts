@@ -1,5 +1,13 @@
-import {HorizontalElasticityStrategyControllerBase, PolarisRuntime, Scale, SloTarget,} from '@polaris-sloc/core';
+import {
+  ElasticityStrategy,
+  HorizontalElasticityStrategyControllerBase,
+  PolarisRuntime,
+  Scale,
+  SloCompliance,
+  SloTarget,
+} from '@polaris-sloc/core';
 import {HorizontalElasticityStrategy, HorizontalElasticityStrategyConfig,} from '@polaris-sloc/common-mappings';
+import {DecisionTelemetry} from '@org/slos';
 
 /**
  * Controller for the HorizontalElasticityStrategy.
@@ -14,6 +22,11 @@ export class HorizontalElasticityStrategyController extends HorizontalElasticity
     super(polarisRuntime);
   }
 
+  execute(elasticityStrategy: ElasticityStrategy<SloCompliance, SloTarget, HorizontalElasticityStrategyConfig>): Promise<void> {
+    return DecisionTelemetry.instance.time('strategy_execution', elasticityStrategy.metadata.namespace,
+      () => super.execute(elasticityStrategy));
+  }
+
   protected computeScale(elasticityStrategy: HorizontalElasticityStrategy, currScale: Scale): Promise<Scale> {
     const newScale = new Scale(currScale);
     const multiplier = elasticityStrategy.spec.sloOutputParams.currSloCompliancePercentage / 100;
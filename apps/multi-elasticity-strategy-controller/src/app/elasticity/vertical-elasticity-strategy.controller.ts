@@ -8,6 +8,7 @@ import {
   VerticalElasticityStrategyControllerBase,
 } from '@polaris-sloc/core';
 import {VerticalElasticityStrategyConfig} from '@polaris-sloc/common-mappings';
+import {DecisionTelemetry} from '@org/slos';
 
 /**
  * Controller for the VerticalElasticityStrategy.
@@ -22,6 +23,11 @@ export class VerticalElasticityStrategyController extends VerticalElasticityStra
     super(polarisRuntime);
   }
 
+  execute(elasticityStrategy: ElasticityStrategy<SloCompliance, SloTarget, VerticalElasticityStrategyConfig>): Promise<void> {
+    return DecisionTelemetry.instance.time('strategy_execution', elasticityStrategy.metadata.namespace,
+      () => super.execute(elasticityStrategy));
+  }
+
   async computeResources(
     elasticityStrategy: ElasticityStrategy<SloCompliance, SloTarget, VerticalElasticityStrategyConfig>,
     container: Container,
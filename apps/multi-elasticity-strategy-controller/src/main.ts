@@ -1,8 +1,9 @@
 import { KubeConfig } from '@kubernetes/client-node';
 import {
+  DecisionTelemetry,
   initPolarisLib as initMappingsLib,
 } from '@org/slos';
-import { Logger } from '@polaris-sloc/core';
+import { Logger, convertToNumber, getEnvironmentVariable } from '@polaris-sloc/core';
 import { initPolarisKubernetes } from '@polaris-sloc/kubernetes';
 import {HorizontalElasticityStrategyKind, VerticalElasticityStrategyKind} from '@polaris-sloc/common-mappings';
 import {HorizontalElasticityStrategyController, VerticalElasticityStrategyController} from "./app/elasticity";
@@ -15,6 +16,19 @@ const polarisRuntime = initPolarisKubernetes(k8sConfig);
 // Initialize the used Polaris mapping libraries
 initMappingsLib(polarisRuntime);
 
+// Expose the latencies of the elasticity strategy executions, if PROMETHEUS_METRICS_ENDPOINT_PORT is set.
+const metricsEndpointPort = getEnvironmentVariable(
+  'PROMETHEUS_METRICS_ENDPOINT_PORT',
+  convertToNumber
+);
+if (metricsEndpointPort) {
+  DecisionTelemetry.instance.start(
+    'multi-elasticity-strategy-controller',
+    metricsEndpointPort,
+    getEnvironmentVariable('PROMETHEUS_METRICS_ENDPOINT_PATH') || '/metrics'
+  );
+}
+
 // Create an ElasticityStrategyManager and watch the supported elasticity strategy kinds.
 const manager = polarisRuntime.createElasticityStrategyManager();
 manager
@@ -1,6 +1,8 @@
 export * from './lib/slos';
 export * from './lib/init-polaris-lib';
 export * from './lib/slo-mappings/cpu-utilization.slo-mapping.prm';
+export * from './lib/slo-mappings/scale-target.cache';
 export * from './lib/metrics/average-cpu-utilization-metric.prm';
 export * from './lib/transformer/elasticity-decision-logic.transformer';
 export * from './lib/metrics/cpu-load-metric.prm';
+export * from './lib/telemetry/decision-telemetry';
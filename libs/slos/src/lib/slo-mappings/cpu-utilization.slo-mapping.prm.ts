@@ -26,6 +26,8 @@ import {ElasticityStrategyKind} from '@polaris-sloc/core/src/lib/model/elasticit
 import {of} from 'rxjs';
 import {HorizontalElasticityStrategyKind, VerticalElasticityStrategyKind} from '@polaris-sloc/common-mappings';
 import {CpuLoad, CpuLoadMetric, CpuLoadParams} from "../metrics/cpu-load-metric.prm";
+import {ScaleTargetCache, ScaleTargetRef} from './scale-target.cache';
+import {DecisionTelemetry} from '../telemetry/decision-telemetry';
 
 
 /**
@@ -64,6 +66,18 @@ export interface ScaleClientConfig {
   minReplicas: number;
 }
 
+/**
+ * The target reads that are shared by all queries of a single decision, see `ScaleClient.withSnapshot()`.
+ *
+ * Each decision gets its own snapshot, which is passed to the queries explicitly, so that overlapping decisions
+ * of the same `ScaleClient` never share or reset each other's reads.
+ */
+export interface TargetSnapshot {
+  scale?: Promise<Scale>;
+  target?: Promise<PodTemplateContainer>;
+  apiCalls: number;
+}
+
 export class ScaleClient {
 
   constructor(
@@ -76,22 +90,22 @@ export class ScaleClient {
     this.registerStrategies();
   }
 
-  private queryMap: Map<string, (direction: ScaleDirection) => Promise<boolean>>;
+  private queryMap: Map<string, (direction: ScaleDirection, snapshot?: TargetSnapshot) => Promise<boolean>>;
   private sloMappingSpec: CpuUtilizationSloMappingSpec;
 
   private registerStrategies() {
-    this.queryMap.set('HorizontalElasticityStrategy', (scaleDirection) => this.isHorizontalElasticityStrategyAvailable(scaleDirection));
-    this.queryMap.set('VerticalElasticityStrategy', (scaleDirection) => this.isVerticalElasticityStrategyAvailable(scaleDirection));
+    this.queryMap.set('HorizontalElasticityStrategy', (scaleDirection, snapshot) => this.isHorizontalElasticityStrategyAvailable(scaleDirection, snapshot));
+    this.queryMap.set('VerticalElasticityStrategy', (scaleDirection, snapshot) => this.isVerticalElasticityStrategyAvailable(scaleDirection, snapshot));
   }
 
-  public async selectStrategy(strategy: HorizontalElasticityStrategyKind | VerticalElasticityStrategyKind, scaleDirection: ScaleDirection, fallback: HorizontalElasticityStrategyKind | VerticalElasticityStrategyKind): Promise<HorizontalElasticityStrategyKind | VerticalElasticityStrategyKind> {
+  public async selectStrategy(strategy: HorizontalElasticityStrategyKind | VerticalElasticityStrategyKind, scaleDirection: ScaleDirection, fallback: HorizontalElasticityStrategyKind | VerticalElasticityStrategyKind, snapshot?: TargetSnapshot): Promise<HorizontalElasticityStrategyKind | VerticalElasticityStrategyKind> {
     const strategyQuery = this.queryMap.get(strategy.kind);
     const fallbackQuery = this.queryMap.get(fallback.kind);
 
-    if (strategyQuery && await strategyQuery(scaleDirection)) {
+    if (strategyQuery && await strategyQuery(scaleDirection, snapshot)) {
       Logger.log(`Chosen primary ${strategy} as strategy`)
       return strategy;
-    } else if (fallbackQuery && await fallbackQuery(scaleDirection)) {
+    } else if (fallbackQuery && await fallbackQuery(scaleDirection, snapshot)) {
       Logger.log(`Chosen fallback ${fallback} as strategy`)
       return fallback;
     } else {
@@ -100,20 +114,33 @@ export class ScaleClient {
     }
   }
 
-  public isPrimaryStrategyAvailable(scaleDirection: ScaleDirection): Promise<boolean> {
-    return this.isStrategyAvailable(this.sloMappingSpec.elasticityStrategy, scaleDirection);
+  /**
+   * Executes `decision` with a new snapshot, which `decision` passes to all of its target reads, so that a single
+   * decision reads the target's `Scale` and pod template at most once each.
+   */
+  public async withSnapshot<R>(decision: (snapshot: TargetSnapshot) => Promise<R>): Promise<R> {
+    const snapshot: TargetSnapshot = { apiCalls: 0 };
+    try {
+      return await decision(snapshot);
+    } finally {
+      Logger.log(`Decision issued ${snapshot.apiCalls} API server reads`);
+    }
+  }
+
+  public isPrimaryStrategyAvailable(scaleDirection: ScaleDirection, snapshot?: TargetSnapshot): Promise<boolean> {
+    return this.isStrategyAvailable(this.sloMappingSpec.elasticityStrategy, scaleDirection, snapshot);
   }
 
-  public isStrategyAvailable(strategy: ElasticityStrategyKind<any>, scaleDirection: ScaleDirection): Promise<boolean> {
+  public isStrategyAvailable(strategy: ElasticityStrategyKind<any>, scaleDirection: ScaleDirection, snapshot?: TargetSnapshot): Promise<boolean> {
     const strategyQuery = this.queryMap.get(strategy.kind);
     if (strategyQuery) {
-      return strategyQuery(scaleDirection);
+      return strategyQuery(scaleDirection, snapshot);
     }
     return Promise.resolve(true);
   }
 
-  private async isHorizontalElasticityStrategyAvailable(scaleDirection: ScaleDirection): Promise<boolean> {
-    const scale = await this.loadTargetScale();
+  private async isHorizontalElasticityStrategyAvailable(scaleDirection: ScaleDirection, snapshot?: TargetSnapshot): Promise<boolean> {
+    const scale = await this.loadTargetScale(snapshot);
     const currentReplicas = scale.spec.replicas;
     const config = this.sloMappingSpec.staticElasticityStrategyConfig;
     const maxReplicas = this.config?.maxReplicas ?? config.maxReplicas;
@@ -126,8 +153,8 @@ export class ScaleClient {
     }
   }
 
-  private async isVerticalElasticityStrategyAvailable(scaleDirection: ScaleDirection): Promise<boolean> {
-    const target = await this.loadTarget();
+  private async isVerticalElasticityStrategyAvailable(scaleDirection: ScaleDirection, snapshot?: TargetSnapshot): Promise<boolean> {
+    const target = await this.loadTarget(snapshot);
     const containers = target.spec.template.spec.containers;
     const currentResources = containers[0].resources;
     const config = this.sloMappingSpec.staticElasticityStrategyConfig;
@@ -141,12 +168,51 @@ export class ScaleClient {
     }
   }
 
-  public loadContainerResources(): Promise<ContainerResources> {
-    return this.loadTarget()
+  public loadContainerResources(snapshot?: TargetSnapshot): Promise<ContainerResources> {
+    return this.loadTarget(snapshot)
       .then(x => x.spec.template.spec.containers[0].resources);
   }
 
-  public loadTargetScale(): Promise<Scale> {
+  public loadTargetScale(snapshot?: TargetSnapshot): Promise<Scale> {
+    if (snapshot) {
+      snapshot.scale = snapshot.scale ?? this.readTargetScale(snapshot);
+      return snapshot.scale;
+    }
+    return this.readTargetScale();
+  }
+
+  public loadTarget(snapshot?: TargetSnapshot): Promise<PodTemplateContainer> {
+    if (snapshot) {
+      snapshot.target = snapshot.target ?? this.readTarget(snapshot);
+      return snapshot.target;
+    }
+    return this.readTarget();
+  }
+
+  private getTargetCacheRef(): ScaleTargetRef {
+    const targetRef = this.sloMappingSpec.targetRef;
+    return {
+      group: targetRef.group,
+      kind: targetRef.kind,
+      namespace: this.sloMapping.metadata.namespace,
+      name: targetRef.name,
+    };
+  }
+
+  private readTargetScale(snapshot?: TargetSnapshot): Promise<Scale> {
+    return ScaleTargetCache.instance.getScale(this.getTargetCacheRef(), () => DecisionTelemetry.instance.time(
+      'scale_client_read', this.sloMapping.metadata.namespace, () => this.fetchTargetScale(snapshot)));
+  }
+
+  private readTarget(snapshot?: TargetSnapshot): Promise<PodTemplateContainer> {
+    return ScaleTargetCache.instance.getTarget(this.getTargetCacheRef(), () => DecisionTelemetry.instance.time(
+      'scale_client_read', this.sloMapping.metadata.namespace, () => this.fetchTarget(snapshot)));
+  }
+
+  private fetchTargetScale(snapshot?: TargetSnapshot): Promise<Scale> {
+    if (snapshot) {
+      ++snapshot.apiCalls;
+    }
     const targetRef = new NamespacedObjectReference({
       namespace: this.sloMapping.metadata.namespace,
       ...this.sloMappingSpec.targetRef,
@@ -154,7 +220,10 @@ export class ScaleClient {
     return this.orchestratorClient.getScale(targetRef);
   }
 
-  public async loadTarget(): Promise<PodTemplateContainer> {
+  private async fetchTarget(snapshot?: TargetSnapshot): Promise<PodTemplateContainer> {
+    if (snapshot) {
+      ++snapshot.apiCalls;
+    }
     const targetRef = this.sloMappingSpec.targetRef;
     const queryApiObj = new PodTemplateContainer({
       objectKind: new ObjectKind({
@@ -177,6 +246,14 @@ export class ScaleClient {
 
 }
 
+/**
+ * The reads of a single BestFit decision: the target snapshot and the CPU load, which is queried at most once.
+ */
+interface BestFitDecision {
+  snapshot: TargetSnapshot;
+  cpuLoad?: Promise<number>;
+}
+
 export class BestFitElasticityDecisionLogic extends ElasticityDecisionLogic<
   CpuUtilizationSloConfig,
   SloCompliance,
@@ -213,15 +290,19 @@ export class BestFitElasticityDecisionLogic extends ElasticityDecisionLogic<
     return super.configure(orchestrator, sloMapping, metricsSource);
   }
 
-  async selectElasticityStrategy(sloOutput: SloCompliance): Promise<VerticalElasticityStrategyKind | HorizontalElasticityStrategyKind> {
-    const singleAvailable = await this.findSingleAvailable(sloOutput);
+  selectElasticityStrategy(sloOutput: SloCompliance): Promise<VerticalElasticityStrategyKind | HorizontalElasticityStrategyKind> {
+    return this.scaleClient.withSnapshot(snapshot => this.selectBestFitStrategy(sloOutput, { snapshot }));
+  }
+
+  private async selectBestFitStrategy(sloOutput: SloCompliance, decision: BestFitDecision): Promise<VerticalElasticityStrategyKind | HorizontalElasticityStrategyKind> {
+    const singleAvailable = await this.findSingleAvailable(sloOutput, decision);
 
     if (singleAvailable) {
       Logger.log(`Only a single strategy is available ${singleAvailable.kind}`);
       return singleAvailable;
     }
 
-    const calculations = this.strategies.map(strategy => this.calculateFutureSloCompliance(strategy, sloOutput));
+    const calculations = this.strategies.map(strategy => this.calculateFutureSloCompliance(strategy, sloOutput, decision));
     const scaledCompliance = await Promise.all(calculations);
     Logger.log(`Calculated future compliances: ${scaledCompliance}`)
     const differences = scaledCompliance
@@ -235,9 +316,9 @@ export class BestFitElasticityDecisionLogic extends ElasticityDecisionLogic<
     return strategy;
   }
 
-  private async findSingleAvailable(sloOutput: SloCompliance): Promise<null | VerticalElasticityStrategyKind | HorizontalElasticityStrategyKind> {
+  private async findSingleAvailable(sloOutput: SloCompliance, decision: BestFitDecision): Promise<null | VerticalElasticityStrategyKind | HorizontalElasticityStrategyKind> {
     const scaleDirection = sloOutput.currSloCompliancePercentage > 100 ? 'UP' : 'DOWN';
-    const checkAvailable = this.strategies.map(strategy => this.scaleClient.isStrategyAvailable(strategy, scaleDirection));
+    const checkAvailable = this.strategies.map(strategy => this.scaleClient.isStrategyAvailable(strategy, scaleDirection, decision.snapshot));
     const availabilityQueries = await Promise.all(checkAvailable);
 
     if (availabilityQueries.some(x => x === false)) {
@@ -247,33 +328,33 @@ export class BestFitElasticityDecisionLogic extends ElasticityDecisionLogic<
     return null;
   }
 
-  private calculateFutureSloCompliance(elasticityStrategy: VerticalElasticityStrategyKind | HorizontalElasticityStrategyKind, sloCompliance: SloCompliance): Promise<number> {
+  private calculateFutureSloCompliance(elasticityStrategy: VerticalElasticityStrategyKind | HorizontalElasticityStrategyKind, sloCompliance: SloCompliance, decision: BestFitDecision): Promise<number> {
     if (elasticityStrategy.kind === 'HorizontalElasticityStrategy') {
-      return this.calculateHorizontalFutureCompliance(sloCompliance);
+      return this.calculateHorizontalFutureCompliance(sloCompliance, decision);
     } else {
-      return this.calculateVerticalFutureCompliance(sloCompliance);
+      return this.calculateVerticalFutureCompliance(sloCompliance, decision);
     }
 
   }
 
-  private async calculateHorizontalFutureCompliance(sloCompliance: SloCompliance): Promise<number> {
-    const currReplicas = await this.getCurrReplicas();
+  private async calculateHorizontalFutureCompliance(sloCompliance: SloCompliance, decision: BestFitDecision): Promise<number> {
+    const currReplicas = await this.getCurrReplicas(decision);
     const multiplier = sloCompliance.currSloCompliancePercentage / 100;
     const newReplicas = Math.ceil(currReplicas * multiplier);
     const normalizedReplicas = this.normalizeReplicaCount(newReplicas);
-    const containerCpuMillis = await this.getCurrentContainerSize();
-    const futureCompliance = await this.calculateFutureCompliance(normalizedReplicas, containerCpuMillis, this.sloMappingSpec.sloConfig.targetUtilizationPercentage);
+    const containerCpuMillis = await this.getCurrentContainerSize(decision);
+    const futureCompliance = await this.calculateFutureCompliance(normalizedReplicas, containerCpuMillis, this.sloMappingSpec.sloConfig.targetUtilizationPercentage, decision);
     Logger.log(`Future compliance with HorizontalElasticityStrategy is: ${futureCompliance}`);
     return futureCompliance;
   }
 
-  private getCurrReplicas() {
-    return this.scaleClient.loadTargetScale()
+  private getCurrReplicas(decision: BestFitDecision) {
+    return this.scaleClient.loadTargetScale(decision.snapshot)
       .then(scale => scale.spec.replicas);
   }
 
-  private async calculateFutureCompliance(scale: number, containerCpuMillis: number, target: number) {
-    const cpuLoad = await this.getCpuLoad();
+  private async calculateFutureCompliance(scale: number, containerCpuMillis: number, target: number, decision: BestFitDecision) {
+    const cpuLoad = await this.getCpuLoad(decision);
     Logger.log(`cpuLoad ${cpuLoad}, containerCpuMillis: ${containerCpuMillis}, scale: ${scale}`)
     const rawCpuUsage = cpuLoad / (scale * containerCpuMillis) * 100;
     const cpuUsage = Math.ceil(Math.min(100, Math.max(0, rawCpuUsage)));
@@ -287,23 +368,26 @@ export class BestFitElasticityDecisionLogic extends ElasticityDecisionLogic<
     return newReplicaCount;
   }
 
-  private async getCurrentContainerSize(): Promise<number> {
-    return this.scaleClient.loadContainerResources()
+  private async getCurrentContainerSize(decision: BestFitDecision): Promise<number> {
+    return this.scaleClient.loadContainerResources(decision.snapshot)
       .then(resources => resources.milliCpu);
   }
 
-  private async getCpuLoad(): Promise<number> {
-    const metricValue = await this.cpuLoadMetricSource.getCurrentValue().toPromise();
-    return metricValue.value.cpuLoadMillis * 1000;
+  private getCpuLoad(decision: BestFitDecision): Promise<number> {
+    if (!decision.cpuLoad) {
+      decision.cpuLoad = this.cpuLoadMetricSource.getCurrentValue().toPromise()
+        .then(metricValue => metricValue.value.cpuLoadMillis * 1000);
+    }
+    return decision.cpuLoad;
   }
 
-  private async calculateVerticalFutureCompliance(sloCompliance: SloCompliance): Promise<number> {
-    const currentCpuMillis = await this.getCurrentContainerSize();
+  private async calculateVerticalFutureCompliance(sloCompliance: SloCompliance, decision: BestFitDecision): Promise<number> {
+    const currentCpuMillis = await this.getCurrentContainerSize(decision);
     const newCpuMillis = await this.getNewCpuMillis(currentCpuMillis, sloCompliance);
     const normalizedCpuMillis = this.normalizeCpuMillis(newCpuMillis);
-    const currReplicas = await this.getCurrReplicas();
+    const currReplicas = await this.getCurrReplicas(decision);
 
-    const futureCompliance = await this.calculateFutureCompliance(currReplicas, normalizedCpuMillis, this.sloMappingSpec.sloConfig.targetUtilizationPercentage);
+    const futureCompliance = await this.calculateFutureCompliance(currReplicas, normalizedCpuMillis, this.sloMappingSpec.sloConfig.targetUtilizationPercentage, decision);
     Logger.log(`Future compliance with VerticalElasticityStrategy is: ${futureCompliance}`)
     return futureCompliance;
   }
@@ -353,19 +437,19 @@ export class PriorityDecisionLogic extends ElasticityDecisionLogic<
   private sloMapping: SloMapping<CpuUtilizationSloConfig, SloCompliance>;
   private scaleClient: ScaleClient;
 
-  async selectElasticityStrategy(sloOutput: SloCompliance): Promise<VerticalElasticityStrategyKind | HorizontalElasticityStrategyKind> {
+  selectElasticityStrategy(sloOutput: SloCompliance): Promise<VerticalElasticityStrategyKind | HorizontalElasticityStrategyKind> {
     const scaleDirection = sloOutput.currSloCompliancePercentage >= 100 ? 'UP' : 'DOWN';
     const sloMapping = this.sloMappingSpec;
     const strategies = [sloMapping.elasticityStrategy, sloMapping.secondaryElasticityStrategy];
     if (scaleDirection === 'UP') {
-      return await this.selectPriorityStrategy(strategies, scaleDirection);
+      return this.scaleClient.withSnapshot(snapshot => this.selectPriorityStrategy(strategies, scaleDirection, snapshot));
     } else {
-      return await this.selectPriorityStrategy(strategies.reverse(), scaleDirection);
+      return this.scaleClient.withSnapshot(snapshot => this.selectPriorityStrategy(strategies.reverse(), scaleDirection, snapshot));
     }
   }
 
-  private async selectPriorityStrategy(strategies: (HorizontalElasticityStrategyKind | VerticalElasticityStrategyKind)[] , scaleDirection: ScaleDirection): Promise<HorizontalElasticityStrategyKind | VerticalElasticityStrategyKind> {
-    const strategyRequests = strategies.map(strat => this.scaleClient.isStrategyAvailable(strat, scaleDirection));
+  private async selectPriorityStrategy(strategies: (HorizontalElasticityStrategyKind | VerticalElasticityStrategyKind)[] , scaleDirection: ScaleDirection, snapshot: TargetSnapshot): Promise<HorizontalElasticityStrategyKind | VerticalElasticityStrategyKind> {
+    const strategyRequests = strategies.map(strat => this.scaleClient.isStrategyAvailable(strat, scaleDirection, snapshot));
     const strategyResults = await Promise.all(strategyRequests);
     const available = strategyResults.findIndex(x => x === true);
     if (available === -1) {
@@ -497,9 +581,9 @@ export class ThresholdBasedDecisionLogic extends ElasticityDecisionLogic<
     const scaleDirection = sloOutput.currSloCompliancePercentage >= 100 ? 'UP' : 'DOWN';
     const strategy = this.sloMappingSpec.elasticityStrategy;
     const secondary = this.sloMappingSpec.secondaryElasticityStrategy;
-    return difference > threshold ?
-      this.scaleClient.selectStrategy(strategy, scaleDirection, secondary)
-      : this.scaleClient.selectStrategy(secondary, scaleDirection, strategy);
+    return this.scaleClient.withSnapshot(snapshot => difference > threshold ?
+      this.scaleClient.selectStrategy(strategy, scaleDirection, secondary, snapshot)
+      : this.scaleClient.selectStrategy(secondary, scaleDirection, strategy, snapshot));
   }
 
 }
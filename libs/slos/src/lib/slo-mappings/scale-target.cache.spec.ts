@@ -0,0 +1,75 @@
+import { ApiObject, ObjectKind, PodTemplateContainer, Scale, WatchEventsHandler, WatchManager } from '@polaris-sloc/core';
+import { ScaleTargetCache, ScaleTargetRef } from './scale-target.cache';
+
+const deploymentKind = new ObjectKind({ group: 'apps', version: 'v1', kind: 'Deployment' });
+const ref: ScaleTargetRef = { group: 'apps', kind: 'Deployment', namespace: 'test', name: 'app' };
+
+function deployment(replicas: number): ApiObject<any> {
+  return new ApiObject<any>({
+    objectKind: deploymentKind,
+    metadata: { namespace: 'test', name: 'app' } as any,
+    spec: { replicas, template: { spec: { containers: [] } } },
+  });
+}
+
+async function watchedCache(): Promise<[ScaleTargetCache, WatchEventsHandler]> {
+  let handler: WatchEventsHandler;
+  const watchManager = {
+    startWatchers: async (kinds: ObjectKind[], eventsHandler: WatchEventsHandler) => handler = eventsHandler,
+  } as unknown as WatchManager;
+  const cache = new ScaleTargetCache();
+  await cache.startWatching(watchManager, [deploymentKind]);
+  return [cache, handler];
+}
+
+function scale(replicas: number): Promise<Scale> {
+  return Promise.resolve(new Scale({ spec: { replicas } }));
+}
+
+describe('ScaleTargetCache', () => {
+  it('reads a watched target once and updates it from watch events', async () => {
+    const [cache, handler] = await watchedCache();
+    const load = jest.fn(() => scale(1));
+
+    expect((await cache.getScale(ref, load)).spec.replicas).toBe(1);
+    expect((await cache.getScale(ref, load)).spec.replicas).toBe(1);
+    handler.onObjectModified(deployment(3));
+    expect((await cache.getScale(ref, load)).spec.replicas).toBe(3);
+    const target = await cache.getTarget(ref, () => Promise.reject(new Error('not cached')));
+    expect(target.spec.template).toBeDefined();
+    expect(load).toHaveBeenCalledTimes(1);
+  });
+
+  it('does not cache targets that have not been read', async () => {
+    const [cache, handler] = await watchedCache();
+    handler.onObjectAdded(deployment(3));
+
+    expect((await cache.getScale(ref, () => scale(1))).spec.replicas).toBe(1);
+  });
+
+  it('reads a target again after it has been deleted', async () => {
+    const [cache, handler] = await watchedCache();
+    await cache.getScale(ref, () => scale(1));
+    handler.onObjectDeleted(deployment(1));
+
+    expect((await cache.getScale(ref, () => scale(2))).spec.replicas).toBe(2);
+  });
+
+  it('only shares reads in flight for kinds that are not watched', async () => {
+    const cache = new ScaleTargetCache();
+    const load = jest.fn(() => scale(1));
+
+    await Promise.all([cache.getScale(ref, load), cache.getScale(ref, load)]);
+    expect(load).toHaveBeenCalledTimes(1);
+    await cache.getScale(ref, load);
+    expect(load).toHaveBeenCalledTimes(2);
+  });
+
+  it('does not keep failed reads', async () => {
+    const [cache] = await watchedCache();
+    await expect(cache.getTarget(ref, () => Promise.reject(new Error('failed')))).rejects.toThrow('failed');
+
+    const target = new PodTemplateContainer({ objectKind: deploymentKind, spec: { template: {} } as any });
+    expect(await cache.getTarget(ref, () => Promise.resolve(target))).toBe(target);
+  });
+});
@@ -0,0 +1,149 @@
+import {
+  ApiObject,
+  Logger,
+  ObjectKind,
+  PodTemplateContainer,
+  Scale,
+  WatchEventsHandler,
+  WatchManager,
+} from '@polaris-sloc/core';
+
+/**
+ * Identifies an SLO target, i.e., the object that is read by a `ScaleClient`.
+ */
+export interface ScaleTargetRef {
+  group?: string;
+  kind: string;
+  namespace: string;
+  name: string;
+}
+
+interface ScaleTargetEntry {
+  scale?: Promise<Scale>;
+  target?: Promise<PodTemplateContainer>;
+}
+
+const SCALE_KIND = new ObjectKind({ group: 'autoscaling', version: 'v1', kind: 'Scale' });
+
+/**
+ * A process-wide cache of SLO target reads that is shared by all `ScaleClient` instances.
+ *
+ * For target kinds that are watched (see `startWatching()`), a target is read once and its cached `Scale` and pod
+ * template are then replaced with the object of every watch event, so that the cache stays current without reading
+ * the target again and many SLO mappings on the same control loop tick do not issue one GET each.
+ * Targets that have never been read are not cached, so that the cache only holds SLO targets.
+ * For all other kinds, only reads that are currently in flight are shared.
+ */
+export class ScaleTargetCache {
+  /** The singleton instance of this cache. */
+  static readonly instance = new ScaleTargetCache();
+
+  private entries = new Map<string, ScaleTargetEntry>();
+  private watchedKinds = new Set<string>();
+
+  /**
+   * Starts watching the specified target kinds and updates the cached entries whenever a target of these kinds changes.
+   */
+  async startWatching(watchManager: WatchManager, kinds: ObjectKind[]): Promise<void> {
+    for (const kind of kinds) {
+      await watchManager.startWatchers([kind], this.createWatchHandler(kind));
+      this.watchedKinds.add(this.getKindKey(kind.group, kind.kind));
+      Logger.log(`ScaleTargetCache is watching ${kind.kind}`);
+    }
+  }
+
+  getScale(ref: ScaleTargetRef, load: () => Promise<Scale>): Promise<Scale> {
+    const entry = this.getEntry(ref);
+    if (!entry.scale) {
+      const read = load();
+      entry.scale = read;
+      this.track(ref, read, () => {
+        if (entry.scale === read) {
+          entry.scale = undefined;
+        }
+      });
+    }
+    return entry.scale;
+  }
+
+  getTarget(ref: ScaleTargetRef, load: () => Promise<PodTemplateContainer>): Promise<PodTemplateContainer> {
+    const entry = this.getEntry(ref);
+    if (!entry.target) {
+      const read = load();
+      entry.target = read;
+      this.track(ref, read, () => {
+        if (entry.target === read) {
+          entry.target = undefined;
+        }
+      });
+    }
+    return entry.target;
+  }
+
+  invalidate(ref: ScaleTargetRef): void {
+    this.entries.delete(this.getKey(ref));
+  }
+
+  private getEntry(ref: ScaleTargetRef): ScaleTargetEntry {
+    const key = this.getKey(ref);
+    let entry = this.entries.get(key);
+    if (!entry) {
+      entry = {};
+      this.entries.set(key, entry);
+    }
+    return entry;
+  }
+
+  private track<T>(ref: ScaleTargetRef, read: Promise<T>, clear: () => void): void {
+    const watched = this.watchedKinds.has(this.getKindKey(ref.group, ref.kind));
+    read.then(
+      () => watched ? undefined : clear(),
+      () => clear(),
+    );
+  }
+
+  /**
+   * Replaces the cached reads of a target that has been read before with the watched object.
+   * A `Scale` is only derived if the object has a `spec.replicas` field and a pod template only if it has a
+   * `spec.template` field, otherwise the respective read is evicted.
+   */
+  private update(kind: ObjectKind, obj: ApiObject<any>): void {
+    const entry = this.entries.get(this.getKey(this.getRef(kind, obj)));
+    if (!entry) {
+      return;
+    }
+    const replicas = obj.spec?.replicas;
+    entry.scale = typeof replicas === 'number'
+      ? Promise.resolve(new Scale({ objectKind: SCALE_KIND, metadata: obj.metadata, spec: { replicas } }))
+      : undefined;
+    entry.target = obj.spec?.template
+      ? Promise.resolve(new PodTemplateContainer({ objectKind: kind, metadata: obj.metadata, spec: obj.spec }))
+      : undefined;
+  }
+
+  private createWatchHandler(kind: ObjectKind): WatchEventsHandler {
+    const update = (obj: ApiObject<any>) => this.update(kind, obj);
+    return {
+      onObjectAdded: update,
+      onObjectModified: update,
+      onObjectDeleted: (obj: ApiObject<any>) => this.invalidate(this.getRef(kind, obj)),
+    };
+  }
+
+  private getRef(kind: ObjectKind, obj: ApiObject<any>): ScaleTargetRef {
+    return {
+      group: kind.group,
+      kind: kind.kind,
+      namespace: obj.metadata?.namespace,
+      name: obj.metadata?.name,
+    };
+  }
+
+  private getKey(ref: ScaleTargetRef): string {
+    return `${this.getKindKey(ref.group, ref.kind)}/${ref.namespace}/${ref.name}`;
+  }
+
+  private getKindKey(group: string, kind: string): string {
+    return `${group ?? ''}/${kind}`;
+  }
+}
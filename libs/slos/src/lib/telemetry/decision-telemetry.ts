@@ -0,0 +1,130 @@
+import { createServer, Server } from 'http';
+import { performance } from 'perf_hooks';
+import { Histogram, register, Registry } from 'prom-client';
+import { from } from 'rxjs';
+import { tap } from 'rxjs/operators';
+import { Logger, ServiceLevelObjective, SloEvaluator } from '@polaris-sloc/core';
+
+/**
+ * The steps of a scaling decision whose latency is recorded by `DecisionTelemetry`.
+ *
+ * - `metric_fetch`: reading the composed metrics in `CpuUtilizationSlo.evaluate()`
+ * - `scale_client_read`: reading the SLO target's `Scale` or pod template from the API server in a `ScaleClient`, i.e.,
+ *   only on `ScaleTargetCache` misses
+ * - `strategy_selection`: `ElasticityDecisionLogic.selectElasticityStrategy()`
+ * - `slo_evaluation`: the entire `evaluate()` call of an SLO
+ * - `crd_write`: applying the SLO output, i.e., writing the elasticity strategy CRD
+ * - `decision`: an entire SLO evaluation, including the CRD write
+ * - `strategy_execution`: executing an elasticity strategy in the elasticity strategy controller
+ */
+export type DecisionStage =
+  | 'metric_fetch'
+  | 'scale_client_read'
+  | 'strategy_selection'
+  | 'slo_evaluation'
+  | 'crd_write'
+  | 'decision'
+  | 'strategy_execution';
+
+/** The name of the histogram that is exposed by `DecisionTelemetry`. */
+export const DECISION_LATENCY_METRIC = 'polaris_decision_latency_seconds';
+
+/** The upper bounds of the histogram buckets in seconds. */
+export const DECISION_LATENCY_BUCKETS_SEC = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+
+/**
+ * Records how long each step of a scaling decision takes in a Prometheus histogram.
+ *
+ * The histogram is registered with the default prom-client registry, so that it is exposed together with all other
+ * metrics of the process. It is labeled with the `stage` (see `DecisionStage`) and the `target_namespace` of the SLO
+ * mapping or elasticity strategy, so that tests running in parallel namespaces can be told apart.
+ */
+export class DecisionTelemetry {
+  /** The singleton instance of this telemetry. */
+  static readonly instance = new DecisionTelemetry();
+
+  controller = 'unknown';
+
+  private histogram: Histogram<'controller' | 'stage' | 'target_namespace'>;
+  private server: Server;
+
+  constructor(readonly registry: Registry = register) {
+    this.histogram = new Histogram({
+      name: DECISION_LATENCY_METRIC,
+      help: 'Latency of the steps of scaling decisions.',
+      labelNames: ['controller', 'stage', 'target_namespace'],
+      buckets: DECISION_LATENCY_BUCKETS_SEC,
+      registers: [registry],
+    });
+  }
+
+  observe(stage: DecisionStage, targetNamespace: string, durationMs: number): void {
+    this.histogram.observe(
+      { controller: this.controller, stage, target_namespace: targetNamespace ?? '' },
+      durationMs / 1000
+    );
+  }
+
+  /**
+   * Executes `action` and records its duration for the specified stage, regardless of whether it succeeds.
+   */
+  async time<T>(stage: DecisionStage, targetNamespace: string, action: () => Promise<T>): Promise<T> {
+    const start = performance.now();
+    try {
+      return await action();
+    } finally {
+      this.observe(stage, targetNamespace, performance.now() - start);
+    }
+  }
+
+  /**
+   * Serves the registry on the Polaris metrics endpoint (`PROMETHEUS_METRICS_ENDPOINT_PORT` and `_PATH`).
+   *
+   * Only controllers that do not already serve this endpoint (e.g., with a `PrometheusComposedMetricsCollectorManager`)
+   * need to call this.
+   */
+  start(controller: string, port: number, path = '/metrics'): void {
+    this.controller = controller;
+    this.server = createServer((req, res) => {
+      const url = new URL(req.url, 'http://localhost');
+      if (req.method !== 'GET' || url.pathname !== path) {
+        res.writeHead(404).end();
+        return;
+      }
+      this.registry.metrics().then(
+        metrics => res.writeHead(200, { 'Content-Type': this.registry.contentType }).end(metrics),
+        e => res.writeHead(500).end(`${e}`)
+      );
+    });
+    this.server.listen(port);
+    Logger.log(`Serving Prometheus metrics on port ${port} at ${path}`);
+  }
+}
+
+/**
+ * Wraps an `SloEvaluator` to record the latency of the SLO evaluation, of applying its output (i.e., the elasticity
+ * strategy CRD write), and of the entire decision.
+ */
+export class TimedSloEvaluator implements SloEvaluator {
+  constructor(private evaluator: SloEvaluator, private telemetry = DecisionTelemetry.instance) {}
+
+  async evaluateSlo(key: string, slo: ServiceLevelObjective<any, any>): ReturnType<SloEvaluator['evaluateSlo']> {
+    const targetNamespace = slo.sloMapping?.metadata?.namespace;
+    const start = performance.now();
+    let evaluatedAt: number;
+
+    const timedSlo: ServiceLevelObjective<any, any> = Object.create(slo);
+    timedSlo.evaluate = () => from(slo.evaluate()).pipe(tap(() => evaluatedAt = performance.now()));
+
+    try {
+      return await this.evaluator.evaluateSlo(key, timedSlo);
+    } finally {
+      const end = performance.now();
+      if (evaluatedAt !== undefined) {
+        this.telemetry.observe('slo_evaluation', targetNamespace, evaluatedAt - start);
+        this.telemetry.observe('crd_write', targetNamespace, end - evaluatedAt);
+      }
+      this.telemetry.observe('decision', targetNamespace, end - start);
+    }
+  }
+}
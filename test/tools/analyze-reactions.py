@@ -0,0 +1,14 @@
+import sys
+
+import reaction
+import suite as test
+from store import ResultStore
+
+filters = dict(argument.split('=', 1) for argument in sys.argv[1:])
+runs, reactions = reaction.analyze_store(ResultStore(test.result_store_path), test.load_step_ms / 1000, **filters)
+
+print(f'Reaction times of {len(runs)} runs in seconds, counted per load step')
+print(f'{"strategy":<32}{"stage":<11}{"steps":>7}{"reacted":>9}{"p50":>8}{"p95":>8}{"max":>8}')
+for row in reaction.report(reactions):
+  print(f'{row["strategy"]:<32}{row["stage"]:<11}{row["steps"]:>7}{row["count"]:>9}{row["p50_sec"]:>8.1f}'
+        f'{row["p95_sec"]:>8.1f}{row["max_sec"]:>8.1f}')
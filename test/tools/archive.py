@@ -0,0 +1,93 @@
+import json
+import mmap
+import struct
+
+import numpy as np
+
+from series import Series
+
+archive_magic = b'PSLA'
+archive_version = 1
+archive_alignment = 64
+preamble_format = '<4sHI'
+
+series_names = ['cpu_usage', 'cpu_req', 'container_req', 'pod_count']
+
+
+class TestArchive:
+  def __init__(self, metadata, series, scaling_actions):
+    self.metadata = metadata
+    self.series = series
+    self.scaling_actions = scaling_actions
+
+
+def aligned(offset):
+  return -(-offset // archive_alignment) * archive_alignment
+
+
+def compact_times(times):
+  times = np.asarray(times, dtype=np.int64)
+  base = int(times.min()) if len(times) > 0 else 0
+  offsets = times - base
+  if len(offsets) == 0 or offsets.max() <= np.iinfo(np.uint32).max:
+    return base, offsets.astype(np.uint32)
+  return base, offsets
+
+
+def compact_values(values):
+  values = np.asarray(values, dtype=np.float64)
+  finite = np.isfinite(values).all()
+  if finite and np.array_equal(values, np.round(values)) and np.abs(values).max(initial=0) <= np.iinfo(np.int32).max:
+    return values.astype(np.int32)
+  if np.array_equal(values.astype(np.float32), values, equal_nan=True):
+    return values.astype(np.float32)
+  return values
+
+
+def write_archive(path, metadata, series, scaling_actions):
+  columns = {}
+  blobs = []
+  offset = 0
+  for name, samples in series.items():
+    base, times = compact_times(samples.times)
+    values = compact_values(samples.values)
+    column = {'base': base, 'count': len(times)}
+    for field, array in (('times', times), ('values', values)):
+      offset = aligned(offset)
+      column[field] = {'dtype': array.dtype.str, 'offset': offset}
+      blobs.append((offset, np.ascontiguousarray(array).tobytes()))
+      offset += array.nbytes
+    columns[name] = column
+
+  header = json.dumps({
+    'metadata': metadata,
+    'scaling_actions': scaling_actions,
+    'columns': columns
+  }, separators=(',', ':')).encode()
+  preamble = struct.pack(preamble_format, archive_magic, archive_version, len(header))
+  data_start = aligned(len(preamble) + len(header))
+
+  with open(path, 'wb') as file:
+    file.write(preamble)
+    file.write(header)
+    for blob_offset, blob in blobs:
+      file.write(b'\0' * (data_start + blob_offset - file.tell()))
+      file.write(blob)
+
+
+def read_archive(path):
+  with open(path, 'rb') as file:
+    buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+  magic, version, header_length = struct.unpack_from(preamble_format, buffer)
+  if magic != archive_magic or version != archive_version:
+    raise ValueError(f'{path} is not a version {archive_version} test archive')
+  preamble_length = struct.calcsize(preamble_format)
+  header = json.loads(buffer[preamble_length:preamble_length + header_length])
+  data_start = aligned(preamble_length + header_length)
+
+  series = {}
+  for name, column in header['columns'].items():
+    times, values = (np.frombuffer(buffer, np.dtype(column[field]['dtype']), column['count'],
+                                   data_start + column[field]['offset']) for field in ('times', 'values'))
+    series[name] = Series(times.astype(np.int64) + column['base'], values)
+  return TestArchive(header['metadata'], series, header['scaling_actions'])
@@ -0,0 +1,14 @@
+import sys
+
+import traces
+
+if len(sys.argv) < 3:
+  print('Usage: python convert-trace.py <trace.csv|query-result.json> <output.trace> [step_sec] [scale]')
+  exit(1)
+
+step_sec = float(sys.argv[3]) if len(sys.argv) > 3 else traces.default_step_sec
+scale = float(sys.argv[4]) if len(sys.argv) > 4 else None
+trace = traces.convert(sys.argv[1], sys.argv[2], step_sec, scale)
+values = trace.values
+print(f'Wrote {len(trace)} values at a {trace.step_sec:g} s step to {sys.argv[2]}, '
+      f'{values.min() if len(values) else 0} to {values.max() if len(values) else 0} millis')
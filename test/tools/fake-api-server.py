@@ -0,0 +1,17 @@
+import sys
+import time
+
+from fakeapi import FakeApiServer
+
+port = int(sys.argv[1]) if len(sys.argv) > 1 else 8001
+kubeconfig_path = sys.argv[2] if len(sys.argv) > 2 else './result/fake-api-server.kubeconfig'
+
+with FakeApiServer(port=port) as server:
+  server.kubeconfig(kubeconfig_path)
+  print(f'Fake API server listening on {server.url}, kubeconfig written to {kubeconfig_path}')
+  try:
+    while True:
+      time.sleep(60)
+      print(f'Requests: {sum(server.counts().values())}')
+  except KeyboardInterrupt:
+    pass
@@ -0,0 +1,703 @@
+import copy
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import yaml
+
+default_host = '127.0.0.1'
+default_crd_root = './../manifests/crds'
+watch_history_size = 4096
+default_watch_timeout_sec = 300
+watch_wakeup_sec = 1
+client_path = 'clients'
+server_version = {'major': '1', 'minor': '27', 'gitVersion': 'v1.27.0-fake', 'platform': 'linux/amd64'}
+
+scale_subresource = {'name': 'scale', 'group': 'autoscaling', 'version': 'v1', 'kind': 'Scale',
+                     'verbs': ['get', 'patch', 'update']}
+object_verbs = ['create', 'delete', 'deletecollection', 'get', 'list', 'patch', 'update', 'watch']
+
+
+class ResourceType:
+  def __init__(self, group, version, kind, plural, namespaced=True, subresources=(), singular=None):
+    self.group = group
+    self.version = version
+    self.kind = kind
+    self.plural = plural
+    self.namespaced = namespaced
+    self.subresources = tuple(subresources)
+    self.singular = singular or kind.lower()
+
+  @property
+  def api_version(self):
+    return f'{self.group}/{self.version}' if self.group else self.version
+
+  def discovery(self):
+    resources = [{'name': self.plural, 'singularName': self.singular, 'namespaced': self.namespaced,
+                  'kind': self.kind, 'verbs': object_verbs}]
+    for subresource in self.subresources:
+      if subresource == 'scale':
+        resources.append({**scale_subresource, 'name': f'{self.plural}/scale', 'singularName': '',
+                          'namespaced': self.namespaced})
+      else:
+        resources.append({'name': f'{self.plural}/{subresource}', 'singularName': '', 'namespaced': self.namespaced,
+                          'kind': self.kind, 'verbs': ['get', 'patch', 'update']})
+    return resources
+
+
+builtin_types = [
+  ResourceType('', 'v1', 'Namespace', 'namespaces', namespaced=False, subresources=['status']),
+  ResourceType('', 'v1', 'ConfigMap', 'configmaps'),
+  ResourceType('', 'v1', 'Service', 'services', subresources=['status']),
+  ResourceType('', 'v1', 'ServiceAccount', 'serviceaccounts'),
+  ResourceType('apps', 'v1', 'Deployment', 'deployments', subresources=['scale', 'status']),
+  ResourceType('apps', 'v1', 'StatefulSet', 'statefulsets', subresources=['scale', 'status']),
+  ResourceType('apps', 'v1', 'ReplicaSet', 'replicasets', subresources=['scale', 'status']),
+  ResourceType('apps', 'v1', 'DaemonSet', 'daemonsets', subresources=['status']),
+  ResourceType('rbac.authorization.k8s.io', 'v1', 'ClusterRole', 'clusterroles', namespaced=False),
+  ResourceType('rbac.authorization.k8s.io', 'v1', 'ClusterRoleBinding', 'clusterrolebindings', namespaced=False),
+  ResourceType('rbac.authorization.k8s.io', 'v1', 'Role', 'roles'),
+  ResourceType('rbac.authorization.k8s.io', 'v1', 'RoleBinding', 'rolebindings'),
+  ResourceType('apiextensions.k8s.io', 'v1', 'CustomResourceDefinition', 'customresourcedefinitions',
+               namespaced=False, subresources=['status']),
+  # Installed with the Prometheus operator, which the test cluster setup requires.
+  ResourceType('monitoring.coreos.com', 'v1', 'ServiceMonitor', 'servicemonitors')
+]
+
+
+class ApiError(Exception):
+  def __init__(self, code, reason, message):
+    super().__init__(message)
+    self.code = code
+    self.reason = reason
+    self.message = message
+
+
+def status_object(code, reason, message):
+  return {'kind': 'Status', 'apiVersion': 'v1', 'metadata': {}, 'status': 'Failure' if code >= 400 else 'Success',
+          'message': message, 'reason': reason, 'code': code}
+
+
+def crd_types(crd):
+  spec = crd['spec']
+  names = spec['names']
+  types = []
+  for version in spec['versions']:
+    if not version.get('served', True):
+      continue
+    subresources = list((version.get('subresources') or {}).keys())
+    types.append(ResourceType(spec['group'], version['name'], names['kind'], names['plural'],
+                              namespaced=spec.get('scope', 'Namespaced') == 'Namespaced', subresources=subresources,
+                              singular=names.get('singular')))
+  return types
+
+
+def load_crds(root=default_crd_root):
+  crds = []
+  for name in sorted(os.listdir(root)):
+    if name.endswith(('.yaml', '.yml')):
+      with open(os.path.join(root, name)) as file:
+        crds += [document for document in yaml.safe_load_all(file)
+                 if document is not None and document.get('kind') == 'CustomResourceDefinition']
+  return crds
+
+
+def merge_patch(target, patch):
+  if not isinstance(patch, dict):
+    return copy.deepcopy(patch)
+  result = dict(target) if isinstance(target, dict) else {}
+  for key, value in patch.items():
+    if value is None:
+      result.pop(key, None)
+    else:
+      result[key] = merge_patch(result.get(key), value)
+  return result
+
+
+def is_named_list(items):
+  return all(isinstance(item, dict) and 'name' in item for item in items)
+
+
+def strategic_merge_patch(target, patch):
+  # Lists of named objects (containers, env, ports, ...) are merged by name, like their Kubernetes patch merge key.
+  if isinstance(patch, list) and isinstance(target, list) and is_named_list(patch) and is_named_list(target):
+    merged = list(target)
+    for item in patch:
+      index = next((i for i, existing in enumerate(merged) if existing['name'] == item['name']), None)
+      if item.get('$patch') == 'delete':
+        if index is not None:
+          del merged[index]
+      elif index is None:
+        merged.append(copy.deepcopy(item))
+      else:
+        merged[index] = strategic_merge_patch(merged[index], item)
+    return merged
+  if not isinstance(patch, dict):
+    return copy.deepcopy(patch)
+  result = dict(target) if isinstance(target, dict) else {}
+  for key, value in patch.items():
+    if key.startswith('$'):
+      continue
+    if value is None:
+      result.pop(key, None)
+    else:
+      result[key] = strategic_merge_patch(result.get(key), value)
+  return result
+
+
+def pointer_parts(pointer):
+  return [part.replace('~1', '/').replace('~0', '~') for part in pointer.split('/')[1:]]
+
+
+def json_patch(target, operations):
+  result = copy.deepcopy(target)
+  for operation in operations:
+    parts = pointer_parts(operation['path'])
+    parent = result
+    for part in parts[:-1]:
+      parent = parent[int(part)] if isinstance(parent, list) else parent.setdefault(part, {})
+    last = parts[-1]
+    op = operation['op']
+    if isinstance(parent, list):
+      index = len(parent) if last == '-' else int(last)
+      if op == 'add':
+        parent.insert(index, operation['value'])
+      elif op == 'replace':
+        parent[index] = operation['value']
+      elif op == 'remove':
+        del parent[index]
+      elif op == 'test' and parent[index] != operation['value']:
+        raise ApiError(422, 'Invalid', f'JSON patch test failed at {operation["path"]}')
+    elif op in ('add', 'replace'):
+      parent[last] = operation['value']
+    elif op == 'remove':
+      parent.pop(last, None)
+    elif op == 'test' and parent.get(last) != operation['value']:
+      raise ApiError(422, 'Invalid', f'JSON patch test failed at {operation["path"]}')
+  return result
+
+
+def apply_patch(content_type, target, body):
+  if content_type.startswith('application/json-patch+json'):
+    return json_patch(target, body)
+  if content_type.startswith('application/merge-patch+json'):
+    return merge_patch(target, body)
+  return strategic_merge_patch(target, body)
+
+
+def matches_selectors(obj, query):
+  labels = obj['metadata'].get('labels') or {}
+  for requirement in filter(None, query.get('labelSelector', '').split(',')):
+    if '!=' in requirement:
+      key, value = requirement.split('!=', 1)
+      if labels.get(key.strip()) == value.strip():
+        return False
+    elif '=' in requirement:
+      key, value = requirement.replace('==', '=').split('=', 1)
+      if labels.get(key.strip()) != value.strip():
+        return False
+    elif requirement.strip() not in labels:
+      return False
+  for requirement in filter(None, query.get('fieldSelector', '').split(',')):
+    field, value = requirement.replace('==', '=').split('=', 1)
+    if field == 'metadata.name' and obj['metadata'].get('name') != value:
+      return False
+    if field == 'metadata.namespace' and obj['metadata'].get('namespace') != value:
+      return False
+  return True
+
+
+class FakeApiServer:
+  def __init__(self, host=default_host, port=0, crds=None, crd_root=default_crd_root, history_size=watch_history_size,
+               response_delay_sec=0):
+    self.types = {}
+    self.objects = {}
+    self.history = deque()
+    self.history_size = history_size
+    self.compacted_version = 0
+    self.resource_version = 0
+    self.condition = threading.Condition()
+    self.counts_lock = threading.Lock()
+    self.request_counts = Counter()
+    self.request_log = []
+    self.response_delay_sec = response_delay_sec
+    self.stopping = False
+    for resource_type in builtin_types:
+      self.register_type(resource_type)
+    if crds is None and crd_root is not None and os.path.isdir(crd_root):
+      crds = load_crds(crd_root)
+    for crd in crds or []:
+      self.create(crd)
+
+    self.httpd = ThreadingHTTPServer((host, port), self.handler_class())
+    self.httpd.daemon_threads = True
+    self.thread = None
+
+  @property
+  def url(self):
+    host, port = self.httpd.server_address[:2]
+    return f'http://{host}:{port}'
+
+  def start(self):
+    self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+    self.thread.start()
+    return self
+
+  def stop(self):
+    with self.condition:
+      self.stopping = True
+      self.condition.notify_all()
+    self.httpd.shutdown()
+    self.httpd.server_close()
+
+  def __enter__(self):
+    return self.start()
+
+  def __exit__(self, exc_type, exc_val, exc_tb):
+    self.stop()
+
+  def kubeconfig(self, path, context='fake-api-server', client_name=None):
+    # Requests sent through a named kubeconfig are attributed to that client in the request log.
+    server = f'{self.url}/{client_path}/{client_name}' if client_name else self.url
+    config = {
+      'apiVersion': 'v1',
+      'kind': 'Config',
+      'clusters': [{'name': context, 'cluster': {'server': server}}],
+      'users': [{'name': context, 'user': {}}],
+      'contexts': [{'name': context, 'context': {'cluster': context, 'user': context}}],
+      'current-context': context
+    }
+    directory = os.path.dirname(path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as file:
+      yaml.safe_dump(config, file)
+    return path
+
+  def register_type(self, resource_type):
+    self.types[(resource_type.group, resource_type.version, resource_type.plural)] = resource_type
+
+  def register_crd(self, crd):
+    for resource_type in crd_types(crd):
+      self.register_type(resource_type)
+    crd['status'] = {
+      'conditions': [{'type': 'NamesAccepted', 'status': 'True'}, {'type': 'Established', 'status': 'True'}],
+      'acceptedNames': crd['spec']['names'],
+      'storedVersions': [version['name'] for version in crd['spec']['versions'] if version.get('storage')]
+    }
+
+  def type_of(self, api_version, kind):
+    group, _, version = api_version.rpartition('/')
+    for resource_type in self.types.values():
+      if resource_type.group == group and resource_type.version == version and resource_type.kind == kind:
+        return resource_type
+    raise ApiError(404, 'NotFound', f'The server could not find the requested resource {api_version}/{kind}')
+
+  def count(self, verb, resource, client_name=None):
+    with self.counts_lock:
+      self.request_counts[(verb, resource)] += 1
+      self.request_log.append((time.time(), client_name, verb, resource))
+
+  def counts(self, reset=False):
+    with self.counts_lock:
+      counts = dict(self.request_counts)
+      if reset:
+        self.request_counts.clear()
+    return counts
+
+  def requests(self, since=0, client_name=None):
+    with self.counts_lock:
+      log = list(self.request_log)
+    return [entry for entry in log if entry[0] >= since and (client_name is None or entry[1] == client_name)]
+
+  # Store operations. These are used by the HTTP handlers and can be called directly by load generators.
+
+  def key(self, resource_type, namespace, name):
+    return resource_type.group, resource_type.plural, namespace if resource_type.namespaced else None, name
+
+  def record(self, event_type, resource_type, obj):
+    # Called with self.condition held; every change gets its own resourceVersion, so the history is contiguous.
+    self.resource_version += 1
+    obj['metadata']['resourceVersion'] = str(self.resource_version)
+    if len(self.history) == self.history_size:
+      self.compacted_version = self.history.popleft()[0]
+    self.history.append((self.resource_version, resource_type.group, resource_type.plural, event_type,
+                         copy.deepcopy(obj)))
+    self.condition.notify_all()
+
+  def create(self, obj, namespace=None):
+    obj = copy.deepcopy(obj)
+    resource_type = self.type_of(obj['apiVersion'], obj['kind'])
+    metadata = obj.setdefault('metadata', {})
+    if resource_type.namespaced:
+      metadata['namespace'] = namespace or metadata.get('namespace') or 'default'
+    else:
+      metadata.pop('namespace', None)
+    if not metadata.get('name'):
+      if not metadata.get('generateName'):
+        raise ApiError(422, 'Invalid', 'metadata.name: Required value')
+      metadata['name'] = metadata['generateName'] + uuid.uuid4().hex[:5]
+    key = self.key(resource_type, metadata.get('namespace'), metadata['name'])
+    with self.condition:
+      if key in self.objects:
+        raise ApiError(409, 'AlreadyExists', f'{resource_type.plural} "{metadata["name"]}" already exists')
+      metadata['uid'] = str(uuid.uuid4())
+      metadata['creationTimestamp'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+      metadata['generation'] = 1
+      if resource_type.kind == 'CustomResourceDefinition':
+        self.register_crd(obj)
+      elif resource_type.kind == 'Namespace':
+        obj['status'] = {'phase': 'Active'}
+      self.objects[key] = obj
+      self.record('ADDED', resource_type, obj)
+      return copy.deepcopy(obj)
+
+  def get(self, resource_type, namespace, name):
+    with self.condition:
+      return copy.deepcopy(self.lookup(resource_type, namespace, name))
+
+  def lookup(self, resource_type, namespace, name):
+    obj = self.objects.get(self.key(resource_type, namespace, name))
+    if obj is None:
+      raise ApiError(404, 'NotFound', f'{resource_type.plural} "{name}" not found')
+    return obj
+
+  def list(self, resource_type, namespace=None, query=None):
+    with self.condition:
+      return self.select(resource_type, namespace, query or {}), str(self.resource_version)
+
+  def select(self, resource_type, namespace, query):
+    return [copy.deepcopy(obj) for (group, plural, obj_namespace, _), obj in self.objects.items()
+            if group == resource_type.group and plural == resource_type.plural
+            and (namespace is None or obj_namespace == namespace) and matches_selectors(obj, query)]
+
+  def modify(self, resource_type, namespace, name, change, resource_version=None, subresource=None):
+    with self.condition:
+      current = self.lookup(resource_type, namespace, name)
+      if resource_version and resource_version != current['metadata']['resourceVersion']:
+        raise ApiError(409, 'Conflict', f'Operation cannot be fulfilled on {resource_type.plural} "{name}": '
+                                        'the object has been modified; please apply your changes to the latest version')
+      updated = change(copy.deepcopy(current))
+      if subresource == 'status':
+        updated = {**current, 'status': updated.get('status')}
+      elif subresource is None and 'status' in current:
+        updated['status'] = current['status']
+      metadata = updated.setdefault('metadata', {})
+      for field in ('name', 'namespace', 'uid', 'creationTimestamp', 'generation'):
+        if field in current['metadata']:
+          metadata[field] = current['metadata'][field]
+      if subresource != 'status' and updated.get('spec') != current.get('spec'):
+        metadata['generation'] = current['metadata'].get('generation', 1) + 1
+      if resource_type.kind == 'CustomResourceDefinition':
+        self.register_crd(updated)
+      self.objects[self.key(resource_type, namespace, name)] = updated
+      self.record('MODIFIED', resource_type, updated)
+      return copy.deepcopy(updated)
+
+  def delete(self, resource_type, namespace, name):
+    with self.condition:
+      obj = self.objects.pop(self.key(resource_type, namespace, name), None)
+      if obj is None:
+        raise ApiError(404, 'NotFound', f'{resource_type.plural} "{name}" not found')
+      self.record('DELETED', resource_type, obj)
+      if resource_type.kind == 'Namespace':
+        for key in [key for key in self.objects if key[2] == name]:
+          deleted = self.objects.pop(key)
+          self.record('DELETED', self.type_of(deleted['apiVersion'], deleted['kind']), deleted)
+      return copy.deepcopy(obj)
+
+  def get_scale(self, resource_type, namespace, name):
+    return self.to_scale(self.get(resource_type, namespace, name))
+
+  def set_replicas(self, resource_type, namespace, name, replicas, resource_version=None):
+    def change(obj):
+      obj.setdefault('spec', {})['replicas'] = replicas
+      return obj
+    return self.to_scale(self.modify(resource_type, namespace, name, change, resource_version))
+
+  def to_scale(self, obj):
+    spec = obj.get('spec', {})
+    labels = ((spec.get('selector') or {}).get('matchLabels') or {})
+    return {
+      'apiVersion': 'autoscaling/v1',
+      'kind': 'Scale',
+      'metadata': {key: obj['metadata'][key] for key in ('name', 'namespace', 'uid', 'resourceVersion',
+                                                         'creationTimestamp') if key in obj['metadata']},
+      'spec': {'replicas': spec.get('replicas', 1)},
+      'status': {'replicas': (obj.get('status') or {}).get('replicas', spec.get('replicas', 1)),
+                 'selector': ','.join(f'{key}={value}' for key, value in labels.items())}
+    }
+
+  def events_since(self, version):
+    # Called with self.condition held.
+    if not self.history or version >= self.history[-1][0]:
+      return []
+    start = max(0, version + 1 - self.history[0][0])
+    return [self.history[index] for index in range(start, len(self.history))]
+
+  def handler_class(self):
+    server = self
+
+    class Handler(ApiRequestHandler):
+      api = server
+
+    return Handler
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+  api = None
+  protocol_version = 'HTTP/1.1'
+  disable_nagle_algorithm = True
+
+  def log_message(self, format, *args):
+    pass
+
+  def count(self, verb, resource):
+    self.api.count(verb, resource, self.client_name)
+
+  def do_GET(self):
+    self.dispatch('GET')
+
+  def do_POST(self):
+    self.dispatch('POST')
+
+  def do_PUT(self):
+    self.dispatch('PUT')
+
+  def do_PATCH(self):
+    self.dispatch('PATCH')
+
+  def do_DELETE(self):
+    self.dispatch('DELETE')
+
+  def dispatch(self, method):
+    url = urlparse(self.path)
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    parts = [part for part in url.path.split('/') if part]
+    self.client_name = None
+    if len(parts) >= 2 and parts[0] == client_path:
+      self.client_name, parts = parts[1], parts[2:]
+    try:
+      body = self.read_body()
+      if self.api.response_delay_sec:
+        time.sleep(self.api.response_delay_sec)
+      if method == 'GET' and self.discovery(parts):
+        return
+      self.handle_resource(method, parts, query, body)
+    except ApiError as e:
+      self.send_json(e.code, status_object(e.code, e.reason, e.message))
+    except (BrokenPipeError, ConnectionResetError):
+      pass
+    except (ValueError, KeyError, TypeError, IndexError) as e:
+      self.send_json(400, status_object(400, 'BadRequest', str(e)))
+
+  def read_body(self):
+    length = int(self.headers.get('Content-Length') or 0)
+    if length == 0:
+      return None
+    raw = self.rfile.read(length)
+    try:
+      return json.loads(raw)
+    except ValueError:
+      return yaml.safe_load(raw)
+
+  def discovery(self, parts):
+    api = self.api
+    if parts in (['version'], ['healthz'], ['readyz'], ['livez']):
+      if parts == ['version']:
+        self.send_json(200, server_version)
+      else:
+        self.send_text(200, 'ok')
+      return True
+    if parts == ['api']:
+      self.send_json(200, {'kind': 'APIVersions', 'versions': ['v1'],
+                           'serverAddressByClientCIDRs': [{'clientCIDR': '0.0.0.0/0', 'serverAddress': ''}]})
+      return True
+    if parts == ['apis']:
+      groups = {}
+      for resource_type in api.types.values():
+        if resource_type.group:
+          versions = groups.setdefault(resource_type.group, [])
+          if resource_type.version not in versions:
+            versions.append(resource_type.version)
+      self.send_json(200, {'kind': 'APIGroupList', 'apiVersion': 'v1', 'groups': [
+        {'name': group, 'versions': [{'groupVersion': f'{group}/{version}', 'version': version} for version in versions],
+         'preferredVersion': {'groupVersion': f'{group}/{versions[0]}', 'version': versions[0]}}
+        for group, versions in groups.items()]})
+      return True
+    if parts == ['api', 'v1'] or (len(parts) == 3 and parts[0] == 'apis'):
+      group, version = ('', 'v1') if parts[0] == 'api' else (parts[1], parts[2])
+      resources = [entry for resource_type in api.types.values()
+                   if resource_type.group == group and resource_type.version == version
+                   for entry in resource_type.discovery()]
+      if not resources:
+        raise ApiError(404, 'NotFound', f'The server could not find the requested resource {"/".join(parts)}')
+      self.send_json(200, {'kind': 'APIResourceList', 'apiVersion': 'v1',
+                           'groupVersion': f'{group}/{version}' if group else version, 'resources': resources})
+      return True
+    return False
+
+  def resolve(self, parts):
+    if parts[:2] == ['api', 'v1']:
+      group, version, rest = '', 'v1', parts[2:]
+    elif parts[:1] == ['apis'] and len(parts) >= 4:
+      group, version, rest = parts[1], parts[2], parts[3:]
+    else:
+      raise ApiError(404, 'NotFound', f'The server could not find the requested resource /{"/".join(parts)}')
+
+    namespace = None
+    if len(rest) >= 3 and rest[0] == 'namespaces' and (group, version, rest[2]) in self.api.types:
+      namespace, rest = rest[1], rest[2:]
+    resource_type = self.api.types.get((group, version, rest[0]))
+    if resource_type is None or len(rest) > 3:
+      raise ApiError(404, 'NotFound', f'The server could not find the requested resource /{"/".join(parts)}')
+    name = rest[1] if len(rest) > 1 else None
+    subresource = rest[2] if len(rest) > 2 else None
+    if subresource is not None and subresource not in resource_type.subresources:
+      raise ApiError(404, 'NotFound', f'{resource_type.plural}/{subresource} is not supported')
+    return resource_type, namespace, name, subresource
+
+  def handle_resource(self, method, parts, query, body):
+    api = self.api
+    resource_type, namespace, name, subresource = self.resolve(parts)
+    resource = f'{resource_type.plural}/{subresource}' if subresource else resource_type.plural
+
+    if isinstance(body, dict) and method in ('POST', 'PUT') and subresource is None:
+      body = {'apiVersion': resource_type.api_version, 'kind': resource_type.kind, **body}
+
+    if name is None:
+      if method == 'GET' and str(query.get('watch')).lower() in ('1', 'true'):
+        self.count('watch', resource)
+        return self.watch(resource_type, namespace, query)
+      if method == 'GET':
+        self.count('list', resource)
+        items, version = api.list(resource_type, namespace, query)
+        return self.send_json(200, {'apiVersion': resource_type.api_version, 'kind': f'{resource_type.kind}List',
+                                    'metadata': {'resourceVersion': version}, 'items': items})
+      if method == 'POST':
+        self.count('create', resource)
+        return self.send_json(201, api.create(body, namespace))
+      if method == 'DELETE':
+        self.count('deletecollection', resource)
+        items, _ = api.list(resource_type, namespace, query)
+        for item in items:
+          api.delete(resource_type, item['metadata'].get('namespace'), item['metadata']['name'])
+        return self.send_json(200, {'apiVersion': resource_type.api_version, 'kind': f'{resource_type.kind}List',
+                                    'metadata': {}, 'items': items})
+      raise ApiError(405, 'MethodNotAllowed', f'{method} is not supported on {resource}')
+
+    if subresource == 'scale':
+      return self.handle_scale(method, resource_type, namespace, name, body)
+
+    if method == 'GET':
+      self.count('get', resource)
+      return self.send_json(200, api.get(resource_type, namespace, name))
+    if method == 'PUT':
+      self.count('update', resource)
+      resource_version = (body.get('metadata') or {}).get('resourceVersion')
+      return self.send_json(200, api.modify(resource_type, namespace, name, lambda current: copy.deepcopy(body),
+                                            resource_version, subresource))
+    if method == 'PATCH':
+      self.count('patch', resource)
+      content_type = self.headers.get('Content-Type', 'application/strategic-merge-patch+json')
+      try:
+        return self.send_json(200, api.modify(resource_type, namespace, name,
+                                              lambda current: apply_patch(content_type, current, body),
+                                              subresource=subresource))
+      except ApiError as e:
+        # Server-side apply creates missing objects.
+        if e.code != 404 or not content_type.startswith('application/apply-patch') or subresource:
+          raise
+        return self.send_json(201, api.create(body, namespace))
+    if method == 'DELETE':
+      self.count('delete', resource)
+      deleted = api.delete(resource_type, namespace, name)
+      return self.send_json(200, {**status_object(200, '', ''), 'details': {
+        'name': name, 'kind': resource_type.plural, 'uid': deleted['metadata'].get('uid')}})
+    raise ApiError(405, 'MethodNotAllowed', f'{method} is not supported on {resource}')
+
+  def handle_scale(self, method, resource_type, namespace, name, body):
+    api = self.api
+    resource = f'{resource_type.plural}/scale'
+    if method == 'GET':
+      self.count('get', resource)
+      return self.send_json(200, api.get_scale(resource_type, namespace, name))
+    if method == 'PUT':
+      self.count('update', resource)
+      return self.send_json(200, api.set_replicas(resource_type, namespace, name, body['spec']['replicas'],
+                                                  (body.get('metadata') or {}).get('resourceVersion')))
+    if method == 'PATCH':
+      self.count('patch', resource)
+      content_type = self.headers.get('Content-Type', 'application/merge-patch+json')
+      patched = apply_patch(content_type, api.get_scale(resource_type, namespace, name), body)
+      return self.send_json(200, api.set_replicas(resource_type, namespace, name, patched['spec']['replicas']))
+    raise ApiError(405, 'MethodNotAllowed', f'{method} is not supported on {resource}')
+
+  def watch(self, resource_type, namespace, query):
+    api = self.api
+    deadline = time.monotonic() + float(query.get('timeoutSeconds') or default_watch_timeout_sec)
+    requested = query.get('resourceVersion')
+    with api.condition:
+      if requested in (None, '', '0'):
+        initial = [('ADDED', obj) for obj in api.select(resource_type, namespace, query)]
+        position = api.resource_version
+      elif int(requested) < api.compacted_version:
+        initial = [('ERROR', status_object(410, 'Expired', f'too old resource version: {requested} '
+                                                            f'({api.compacted_version})'))]
+        position = None
+      else:
+        initial = []
+        position = int(requested)
+
+    self.start_stream()
+    for event_type, obj in initial:
+      self.send_event(event_type, obj)
+    while position is not None and not api.stopping:
+      with api.condition:
+        events = api.events_since(position)
+        if not events:
+          remaining = deadline - time.monotonic()
+          if remaining <= 0:
+            break
+          api.condition.wait(min(remaining, watch_wakeup_sec))
+          continue
+        position = events[-1][0]
+      for _, group, plural, event_type, obj in events:
+        if group == resource_type.group and plural == resource_type.plural \
+            and (namespace is None or obj['metadata'].get('namespace') == namespace) and matches_selectors(obj, query):
+          self.send_event(event_type, obj)
+    self.end_stream()
+
+  def start_stream(self):
+    self.send_response(200)
+    self.send_header('Content-Type', 'application/json')
+    self.send_header('Transfer-Encoding', 'chunked')
+    self.end_headers()
+
+  def send_event(self, event_type, obj):
+    data = json.dumps({'type': event_type, 'object': obj}).encode() + b'\n'
+    self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+    self.wfile.flush()
+
+  def end_stream(self):
+    self.wfile.write(b'0\r\n\r\n')
+    self.wfile.flush()
+    self.close_connection = True
+
+  def send_json(self, code, obj):
+    self.send_body(code, json.dumps(obj).encode(), 'application/json')
+
+  def send_text(self, code, text):
+    self.send_body(code, text.encode(), 'text/plain')
+
+  def send_body(self, code, data, content_type):
+    self.send_response(code)
+    self.send_header('Content-Type', content_type)
+    self.send_header('Content-Length', str(len(data)))
+    self.end_headers()
+    self.wfile.write(data)
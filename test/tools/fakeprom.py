@@ -0,0 +1,789 @@
+import json
+import math
+import re
+import threading
+import time
+import warnings
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import requests
+
+from fakeapi import builtin_types
+
+default_host = '127.0.0.1'
+default_scrape_interval_sec = 1
+default_lookback_sec = 300
+scrape_timeout_sec = 5
+sample_buffer_capacity = 256
+max_points_per_query = 11000
+
+aggregations = {'sum', 'min', 'max', 'avg', 'count'}
+range_functions = {'rate', 'increase', 'avg_over_time', 'sum_over_time', 'count_over_time', 'min_over_time',
+                   'max_over_time', 'last_over_time'}
+duration_units = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800, 'y': 31536000}
+
+token_pattern = re.compile(r'''
+  (?P<space>\s+)
+  |(?P<duration>\[[0-9a-z]+\])
+  |(?P<number>[0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?|0x[0-9a-fA-F]+|[Nn]a[Nn]|[Ii]nf)
+  |(?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  |(?P<ident>[a-zA-Z_:][a-zA-Z0-9_:]*)
+  |(?P<op>=~|!~|!=|==|[-+*/%^(){},=])
+''', re.VERBOSE)
+
+
+class PromQLError(Exception):
+  pass
+
+
+def parse_duration(text):
+  total = 0
+  for amount, unit in re.findall(r'([0-9]+)(ms|[smhdwy])', text):
+    total += int(amount) * duration_units[unit]
+  if total == 0 and text not in ('0', '0s'):
+    raise PromQLError(f'Invalid duration: {text}')
+  return total
+
+
+def parse_time(text):
+  try:
+    return float(text)
+  except ValueError:
+    return datetime.fromisoformat(text.replace('Z', '+00:00')).timestamp()
+
+
+def parse_step(text):
+  try:
+    return float(text)
+  except ValueError:
+    return parse_duration(text)
+
+
+def unquote(text):
+  return re.sub(r'\\(.)', lambda match: {'n': '\n', 't': '\t'}.get(match.group(1), match.group(1)), text[1:-1])
+
+
+def tokenize(query):
+  tokens = []
+  position = 0
+  while position < len(query):
+    match = token_pattern.match(query, position)
+    if match is None:
+      raise PromQLError(f'Unexpected character {query[position]!r} at position {position}')
+    position = match.end()
+    if match.lastgroup != 'space':
+      tokens.append((match.lastgroup, match.group()))
+  return tokens
+
+
+# Expressions are parsed into tuples that evaluate() interprets over the whole step grid at once:
+# ('number', value), ('selector', name, matchers, range, offset), ('aggregate', op, grouping, labels, expr),
+# ('call', name, args), ('binary', op, left, right, matching), ('negate', expr)
+
+class Parser:
+  def __init__(self, query):
+    self.tokens = tokenize(query)
+    self.position = 0
+
+  def peek(self, offset=0):
+    index = self.position + offset
+    return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+  def next(self):
+    token = self.peek()
+    self.position += 1
+    return token
+
+  def expect(self, value):
+    kind, text = self.next()
+    if text != value:
+      raise PromQLError(f'Expected {value!r} but found {text!r}')
+
+  def accept(self, value):
+    if self.peek()[1] == value:
+      self.position += 1
+      return True
+    return False
+
+  def parse(self):
+    expr = self.additive()
+    if self.peek()[0] is not None:
+      raise PromQLError(f'Unexpected {self.peek()[1]!r}')
+    return expr
+
+  def additive(self):
+    expr = self.multiplicative()
+    while self.peek()[1] in ('+', '-'):
+      op = self.next()[1]
+      matching = self.matching()
+      expr = ('binary', op, expr, self.multiplicative(), matching)
+    return expr
+
+  def multiplicative(self):
+    expr = self.power()
+    while self.peek()[1] in ('*', '/', '%'):
+      op = self.next()[1]
+      matching = self.matching()
+      expr = ('binary', op, expr, self.power(), matching)
+    return expr
+
+  def power(self):
+    expr = self.unary()
+    if self.peek()[1] == '^':
+      self.next()
+      matching = self.matching()
+      return ('binary', '^', expr, self.power(), matching)
+    return expr
+
+  def unary(self):
+    if self.accept('-'):
+      return ('negate', self.unary())
+    if self.accept('+'):
+      return self.unary()
+    return self.primary()
+
+  def matching(self):
+    kind, text = self.peek()
+    if text not in ('on', 'ignoring'):
+      return None
+    self.next()
+    labels = self.label_list()
+    group = None
+    if self.peek()[1] in ('group_left', 'group_right'):
+      group = self.next()[1]
+      if self.peek()[1] == '(':
+        self.label_list()
+    return text, labels, group
+
+  def label_list(self):
+    self.expect('(')
+    labels = []
+    while not self.accept(')'):
+      kind, text = self.next()
+      if kind != 'ident':
+        raise PromQLError(f'Expected a label name but found {text!r}')
+      labels.append(text)
+      self.accept(',')
+    return labels
+
+  def primary(self):
+    kind, text = self.peek()
+    if kind == 'number':
+      self.next()
+      return 'number', float(int(text, 16) if text.startswith('0x') else text)
+    if text == '(':
+      self.next()
+      expr = self.additive()
+      self.expect(')')
+      return expr
+    if text == '{':
+      return self.selector(None)
+    if kind != 'ident':
+      raise PromQLError(f'Unexpected {text!r}')
+    if text in aggregations and self.peek(1)[1] in ('(', 'by', 'without'):
+      return self.aggregate()
+    if self.peek(1)[1] == '(':
+      return self.call()
+    self.next()
+    return self.selector(text)
+
+  def aggregate(self):
+    op = self.next()[1]
+    grouping, labels = None, []
+    if self.peek()[1] in ('by', 'without'):
+      grouping = self.next()[1]
+      labels = self.label_list()
+    self.expect('(')
+    expr = self.additive()
+    self.expect(')')
+    if self.peek()[1] in ('by', 'without'):
+      grouping = self.next()[1]
+      labels = self.label_list()
+    return 'aggregate', op, grouping, labels, expr
+
+  def call(self):
+    name = self.next()[1]
+    self.expect('(')
+    args = []
+    while not self.accept(')'):
+      args.append(self.additive())
+      self.accept(',')
+    return 'call', name, args
+
+  def selector(self, name):
+    matchers = []
+    if self.accept('{'):
+      while not self.accept('}'):
+        label = self.next()[1]
+        op = self.next()[1]
+        kind, value = self.next()
+        if kind != 'string' or op not in ('=', '!=', '=~', '!~'):
+          raise PromQLError(f'Invalid label matcher for {label}')
+        matchers.append((label, op, unquote(value)))
+        self.accept(',')
+    if name is not None:
+      matchers.insert(0, ('__name__', '=', name))
+    window = None
+    if self.peek()[0] == 'duration':
+      window = parse_duration(self.next()[1][1:-1])
+    offset = 0
+    if self.peek()[1] == 'offset':
+      self.next()
+      text = self.next()[1]
+      if self.peek()[0] == 'ident':
+        text += self.next()[1]
+      offset = parse_duration(text)
+    return 'selector', name, matchers, window, offset
+
+
+def compile_matchers(matchers):
+  compiled = []
+  for label, op, value in matchers:
+    if op in ('=~', '!~'):
+      compiled.append((label, op, re.compile(f'(?:{value})\\Z')))
+    else:
+      compiled.append((label, op, value))
+  return compiled
+
+
+def labels_match(labels, matchers):
+  for label, op, value in matchers:
+    actual = labels.get(label, '')
+    if op == '=' and actual != value or op == '!=' and actual == value:
+      return False
+    if op == '=~' and not value.match(actual) or op == '!~' and value.match(actual):
+      return False
+  return True
+
+
+class SampleBuffer:
+  def __init__(self, capacity=sample_buffer_capacity):
+    self.times = np.empty(capacity, dtype=np.float64)
+    self.values = np.empty(capacity, dtype=np.float64)
+    self.size = 0
+
+  def append(self, timestamp, value):
+    if self.size == len(self.times):
+      self.times = np.resize(self.times, len(self.times) * 2)
+      self.values = np.resize(self.values, len(self.values) * 2)
+    if self.size > 0 and timestamp < self.times[self.size - 1]:
+      return
+    self.times[self.size] = timestamp
+    self.values[self.size] = value
+    self.size += 1
+
+  def snapshot(self):
+    return self.times[:self.size].copy(), self.values[:self.size].copy()
+
+  def delete(self, start, end):
+    keep = (self.times[:self.size] < start) | (self.times[:self.size] > end)
+    count = int(keep.sum())
+    self.times[:count] = self.times[:self.size][keep]
+    self.values[:count] = self.values[:self.size][keep]
+    self.size = count
+
+
+class TimeSeriesStore:
+  def __init__(self, lookback_sec=default_lookback_sec):
+    self.series = {}
+    self.lookback_sec = lookback_sec
+    self.lock = threading.Lock()
+
+  def add(self, labels, value, timestamp=None):
+    key = tuple(sorted(labels.items()))
+    with self.lock:
+      buffer = self.series.get(key)
+      if buffer is None:
+        buffer = self.series[key] = SampleBuffer()
+      buffer.append(time.time() if timestamp is None else timestamp, value)
+
+  def select(self, matchers):
+    with self.lock:
+      return [(dict(key), *buffer.snapshot()) for key, buffer in self.series.items()
+              if labels_match(dict(key), matchers)]
+
+  def delete(self, matchers, start=-math.inf, end=math.inf):
+    with self.lock:
+      for key in [key for key in self.series if labels_match(dict(key), matchers)]:
+        buffer = self.series[key]
+        buffer.delete(start, end)
+        if buffer.size == 0:
+          del self.series[key]
+
+  def query(self, query, times):
+    return evaluate(Parser(query).parse(), self, np.asarray(times, dtype=np.float64))
+
+
+def without_name(labels):
+  return {key: value for key, value in labels.items() if key != '__name__'}
+
+
+def instant_values(times, values, grid, lookback):
+  # Prometheus semantics: the value at t is the newest sample in (t - lookback, t]; NaN marks a stale series.
+  index = np.searchsorted(times, grid, side='right') - 1
+  valid = (index >= 0) & (times[np.maximum(index, 0)] > grid - lookback)
+  return np.where(valid, values[np.maximum(index, 0)], np.nan)
+
+
+def counter_adjusted(values):
+  resets = np.zeros(len(values))
+  resets[1:] = np.where(np.diff(values) < 0, values[:-1], 0)
+  return values + np.cumsum(resets)
+
+
+def range_values(function, times, values, grid, window):
+  present = ~np.isnan(values)
+  times, values = times[present], values[present]
+  low = np.searchsorted(times, grid - window, side='right')
+  high = np.searchsorted(times, grid, side='right')
+  count = high - low
+  last = np.maximum(high - 1, 0)
+  first = np.minimum(low, max(len(times) - 1, 0))
+  with np.errstate(divide='ignore', invalid='ignore'):
+    if len(times) == 0:
+      return np.full(len(grid), np.nan)
+    if function == 'count_over_time':
+      return np.where(count > 0, count, np.nan).astype(np.float64)
+    if function == 'last_over_time':
+      return np.where(count > 0, values[last], np.nan)
+    if function in ('sum_over_time', 'avg_over_time'):
+      sums = np.concatenate(([0], np.cumsum(values)))
+      total = sums[high] - sums[low]
+      return np.where(count > 0, total if function == 'sum_over_time' else total / count, np.nan)
+    if function in ('min_over_time', 'max_over_time'):
+      reduce = np.min if function == 'min_over_time' else np.max
+      return np.array([reduce(values[lo:hi]) if hi > lo else np.nan for lo, hi in zip(low, high)])
+    adjusted = counter_adjusted(values)
+    increase = adjusted[last] - adjusted[first]
+    rate = increase / (times[last] - times[first])
+    if function == 'increase':
+      rate = rate * window
+    return np.where(count >= 2, rate, np.nan)
+
+
+def aggregate(op, vector, grouping, labels):
+  groups = {}
+  for series_labels, values in vector:
+    if grouping is None:
+      key = ()
+    elif grouping == 'by':
+      key = tuple((label, series_labels[label]) for label in sorted(labels) if label in series_labels)
+    else:
+      excluded = set(labels) | {'__name__'}
+      key = tuple(sorted((label, value) for label, value in series_labels.items() if label not in excluded))
+    groups.setdefault(key, []).append(values)
+  result = []
+  for key, members in groups.items():
+    stacked = np.vstack(members)
+    present = (~np.isnan(stacked)).sum(axis=0)
+    with warnings.catch_warnings():
+      warnings.simplefilter('ignore', RuntimeWarning)
+      if op == 'count':
+        values = present.astype(np.float64)
+      else:
+        values = {'sum': np.nansum, 'min': np.nanmin, 'max': np.nanmax, 'avg': np.nanmean}[op](stacked, axis=0)
+    result.append((dict(key), np.where(present > 0, values, np.nan)))
+  return result
+
+
+def arithmetic(op, left, right):
+  with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+    if op == '+':
+      return left + right
+    if op == '-':
+      return left - right
+    if op == '*':
+      return left * right
+    if op == '/':
+      return left / right
+    if op == '%':
+      return np.fmod(left, right)
+    return left ** right
+
+
+def match_key(labels, matching):
+  if matching is not None and matching[0] == 'on':
+    return tuple((label, labels.get(label, '')) for label in sorted(matching[1]))
+  ignored = set(matching[1]) if matching is not None else set()
+  return tuple(sorted((label, value) for label, value in without_name(labels).items() if label not in ignored))
+
+
+def binary(op, left, right, matching):
+  left_vector, right_vector = isinstance(left, list), isinstance(right, list)
+  if not left_vector and not right_vector:
+    return arithmetic(op, left, right)
+  if not right_vector:
+    return [(without_name(labels), arithmetic(op, values, right)) for labels, values in left]
+  if not left_vector:
+    return [(without_name(labels), arithmetic(op, left, values)) for labels, values in right]
+
+  group = matching[2] if matching is not None else None
+  many, one = (right, left) if group == 'group_right' else (left, right)
+  one_side = {}
+  for labels, values in one:
+    key = match_key(labels, matching)
+    if key in one_side:
+      raise PromQLError('Found duplicate series for the match group on the right-hand side of the operation')
+    one_side[key] = (labels, values)
+  result = []
+  seen = set()
+  for labels, values in many:
+    key = match_key(labels, matching)
+    if key not in one_side:
+      continue
+    if group is None:
+      if key in seen:
+        raise PromQLError('Found duplicate series for the match group on the left-hand side of the operation')
+      seen.add(key)
+    other = one_side[key][1]
+    if group == 'group_right':
+      result.append((without_name(labels), arithmetic(op, other, values)))
+    elif group == 'group_left':
+      result.append((without_name(labels), arithmetic(op, values, other)))
+    else:
+      result.append((dict(key) if matching is not None and matching[0] == 'on' else without_name(labels),
+                     arithmetic(op, values, other)))
+  return result
+
+
+def evaluate(expr, store, grid):
+  kind = expr[0]
+  if kind == 'number':
+    return np.full(len(grid), expr[1])
+  if kind == 'negate':
+    value = evaluate(expr[1], store, grid)
+    return [(without_name(labels), -values) for labels, values in value] if isinstance(value, list) else -value
+  if kind == 'selector':
+    _, name, matchers, window, offset = expr
+    if window is not None:
+      raise PromQLError('Range vectors are only supported as function arguments')
+    return [(labels, instant_values(times, values, grid - offset, store.lookback_sec))
+            for labels, times, values in store.select(compile_matchers(matchers))]
+  if kind == 'aggregate':
+    _, op, grouping, labels, inner = expr
+    value = evaluate(inner, store, grid)
+    if not isinstance(value, list):
+      raise PromQLError(f'{op}() expects an instant vector')
+    return aggregate(op, value, grouping, labels)
+  if kind == 'binary':
+    _, op, left, right, matching = expr
+    return binary(op, evaluate(left, store, grid), evaluate(right, store, grid), matching)
+  return call(expr[1], expr[2], store, grid)
+
+
+def call(name, args, store, grid):
+  if name in range_functions:
+    if len(args) != 1 or args[0][0] != 'selector' or args[0][3] is None:
+      raise PromQLError(f'{name}() expects a range vector')
+    _, _, matchers, window, offset = args[0]
+    return [(without_name(labels), range_values(name, times, values, grid - offset, window))
+            for labels, times, values in store.select(compile_matchers(matchers))]
+  if name == 'time':
+    return grid.copy()
+  values = [evaluate(arg, store, grid) for arg in args]
+  if name == 'vector':
+    return [({}, values[0])]
+  if name == 'scalar':
+    return values[0][0][1] if len(values[0]) == 1 else np.full(len(grid), np.nan)
+  unary = {'abs': np.abs, 'ceil': np.ceil, 'floor': np.floor, 'round': np.round}
+  if name in unary:
+    return [(without_name(labels), unary[name](series)) for labels, series in values[0]]
+  if name in ('clamp_min', 'clamp_max'):
+    bound = values[1]
+    clamp = np.maximum if name == 'clamp_min' else np.minimum
+    return [(without_name(labels), clamp(series, bound)) for labels, series in values[0]]
+  raise PromQLError(f'Unsupported function: {name}')
+
+
+def format_value(value):
+  if math.isnan(value):
+    return 'NaN'
+  if math.isinf(value):
+    return '+Inf' if value > 0 else '-Inf'
+  return str(int(value)) if value == int(value) and abs(value) < 1e15 else repr(float(value))
+
+
+def format_time(timestamp):
+  return int(timestamp) if timestamp == int(timestamp) else round(float(timestamp), 3)
+
+
+def instant_result(value, timestamp):
+  if not isinstance(value, list):
+    return {'resultType': 'scalar', 'result': [format_time(timestamp), format_value(value[0])]}
+  return {'resultType': 'vector', 'result': [
+    {'metric': labels, 'value': [format_time(timestamp), format_value(values[0])]}
+    for labels, values in value if not np.isnan(values[0])]}
+
+
+def range_result(value, grid):
+  if not isinstance(value, list):
+    value = [({}, value)]
+  result = []
+  for labels, values in value:
+    present = np.nonzero(~np.isnan(values))[0]
+    if len(present) > 0:
+      result.append({'metric': labels,
+                     'values': [[format_time(grid[index]), format_value(values[index])] for index in present]})
+  return {'resultType': 'matrix', 'result': result}
+
+
+label_pattern = re.compile(r'\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"((?:[^"\\]|\\.)*)"\s*,?')
+
+
+def parse_exposition(text):
+  samples = []
+  for line in text.splitlines():
+    line = line.strip()
+    if not line or line.startswith('#'):
+      continue
+    labels = {}
+    brace = line.find('{')
+    space = line.find(' ')
+    if brace != -1 and (space == -1 or brace < space):
+      name = line[:brace]
+      close = line.rfind('}')
+      position = brace + 1
+      while position < close:
+        match = label_pattern.match(line, position, close)
+        if match is None:
+          break
+        labels[match.group(1)] = unquote(f'"{match.group(2)}"')
+        position = match.end()
+      rest = line[close + 1:].split()
+    else:
+      name, *rest = line.split()
+    value = float(rest[0].replace('Inf', 'inf'))
+    timestamp = int(rest[1]) / 1000 if len(rest) > 1 else None
+    samples.append(({'__name__': name, **labels}, value, timestamp))
+  return samples
+
+
+def parse_quantity(quantity, unit=1):
+  quantity = str(quantity)
+  suffixes = {'m': 0.001, 'k': 1e3, 'M': 1e6, 'G': 1e9, 'Ki': 1024, 'Mi': 1024 ** 2, 'Gi': 1024 ** 3}
+  for suffix in sorted(suffixes, key=len, reverse=True):
+    if quantity.endswith(suffix):
+      return float(quantity[:-len(suffix)]) * suffixes[suffix] / unit
+  return float(quantity) / unit
+
+
+def fake_api_deployments(api, namespace=None):
+  deployments = next(resource_type for resource_type in builtin_types if resource_type.plural == 'deployments')
+  return lambda: api.list(deployments, namespace)[0]
+
+
+def kube_state_collector(list_deployments):
+  # Emits the kube-state-metrics series the suite and the demo metric controllers query, for the Deployment
+  # documents returned by list_deployments; pods are named <deployment>-<index>, one per desired replica.
+  def collect():
+    samples = []
+    for deployment in list_deployments():
+      name = deployment['metadata']['name']
+      deployment_namespace = deployment['metadata']['namespace']
+      replicas = deployment['spec'].get('replicas', 1)
+      samples.append(({'__name__': 'kube_deployment_spec_replicas', 'deployment': name,
+                       'namespace': deployment_namespace}, replicas))
+      for container in deployment['spec']['template']['spec']['containers']:
+        resources = container.get('resources') or {}
+        for resource, unit, scale in (('cpu', 'core', 1), ('memory', 'byte', 1)):
+          quantity = (resources.get('limits') or {}).get(resource) or (resources.get('requests') or {}).get(resource)
+          if quantity is None:
+            continue
+          for index in range(replicas):
+            samples.append(({'__name__': 'kube_pod_container_resource_limits', 'namespace': deployment_namespace,
+                             'pod': f'{name}-{index}', 'container': container['name'], 'resource': resource,
+                             'unit': unit}, parse_quantity(quantity, scale)))
+    return samples
+
+  return collect
+
+
+class ScrapeTarget:
+  def __init__(self, url, job, labels=None):
+    self.url = url
+    self.job = job
+    self.labels = labels or {}
+    self.instance = urlparse(url).netloc
+
+  def __call__(self):
+    response = requests.get(self.url, timeout=scrape_timeout_sec)
+    response.raise_for_status()
+    return [(labels, value) if timestamp is None else (labels, value, timestamp)
+            for labels, value, timestamp in parse_exposition(response.text)]
+
+
+class FakePrometheus:
+  def __init__(self, host=default_host, port=0, targets=None, collectors=None,
+               scrape_interval_sec=default_scrape_interval_sec, lookback_sec=default_lookback_sec):
+    self.store = TimeSeriesStore(lookback_sec)
+    self.targets = list(targets or [])
+    self.collectors = list(collectors or [])
+    self.scrape_interval_sec = scrape_interval_sec
+    self.previous = {}
+    self.up = {}
+    self.stop_event = threading.Event()
+    self.httpd = ThreadingHTTPServer((host, port), self.handler_class())
+    self.httpd.daemon_threads = True
+    self.threads = []
+
+  @property
+  def host(self):
+    return self.httpd.server_address[0]
+
+  @property
+  def port(self):
+    return self.httpd.server_address[1]
+
+  @property
+  def url(self):
+    return f'http://{self.host}:{self.port}'
+
+  def start(self):
+    self.threads = [threading.Thread(target=self.httpd.serve_forever, daemon=True),
+                    threading.Thread(target=self.scrape_loop, daemon=True)]
+    for thread in self.threads:
+      thread.start()
+    return self
+
+  def stop(self):
+    self.stop_event.set()
+    self.httpd.shutdown()
+    self.httpd.server_close()
+
+  # Lets the stand-in replace the kubectl port-forward process the suite kills after a test.
+  kill = stop
+
+  def __enter__(self):
+    return self.start()
+
+  def __exit__(self, exc_type, exc_val, exc_tb):
+    self.stop()
+
+  def add_target(self, url, job, labels=None):
+    self.targets.append(ScrapeTarget(url, job, labels))
+
+  def scrape_loop(self):
+    while not self.stop_event.is_set():
+      started = time.monotonic()
+      self.scrape()
+      self.stop_event.wait(max(0, self.scrape_interval_sec - (time.monotonic() - started)))
+
+  def scrape(self):
+    now = time.time()
+    for index, source in enumerate(self.targets + self.collectors):
+      extra = {'job': source.job, 'instance': source.instance, **source.labels} \
+        if isinstance(source, ScrapeTarget) else {}
+      try:
+        samples = source()
+        up = 1
+      except Exception as e:
+        if self.up.get(index, 1):
+          print(f'Scraping {getattr(source, "url", source)} failed: {e}')
+        samples = []
+        up = 0
+      seen = set()
+      for sample in samples:
+        labels = {**sample[0], **extra}
+        self.store.add(labels, sample[1], sample[2] if len(sample) > 2 else now)
+        seen.add(tuple(sorted(labels.items())))
+      # Series that disappeared from a target get a staleness marker, like in Prometheus.
+      for key in self.previous.get(index, set()) - seen:
+        self.store.add(dict(key), np.nan, now)
+      self.previous[index] = seen
+      self.up[index] = up
+      if extra:
+        self.store.add({'__name__': 'up', **extra}, up, now)
+
+  def handler_class(self):
+    server = self
+
+    class Handler(PrometheusRequestHandler):
+      prometheus = server
+
+    return Handler
+
+
+class PrometheusRequestHandler(BaseHTTPRequestHandler):
+  prometheus = None
+  protocol_version = 'HTTP/1.1'
+  disable_nagle_algorithm = True
+
+  def log_message(self, format, *args):
+    pass
+
+  def do_GET(self):
+    self.dispatch()
+
+  def do_POST(self):
+    self.dispatch()
+
+  def do_PUT(self):
+    self.dispatch()
+
+  def params(self):
+    url = urlparse(self.path)
+    params = parse_qs(url.query)
+    length = int(self.headers.get('Content-Length') or 0)
+    if length > 0:
+      for key, values in parse_qs(self.rfile.read(length).decode()).items():
+        params.setdefault(key, []).extend(values)
+    return url.path, params
+
+  def dispatch(self):
+    path, params = self.params()
+    store = self.prometheus.store
+    try:
+      if path in ('/-/healthy', '/-/ready'):
+        return self.send_text(200, 'Prometheus stand-in is ready.\n')
+      if path == '/api/v1/query':
+        timestamp = parse_time(params['time'][-1]) if 'time' in params else time.time()
+        value = store.query(params['query'][-1], [timestamp])
+        return self.send_success(instant_result(value, timestamp))
+      if path == '/api/v1/query_range':
+        start, end = parse_time(params['start'][-1]), parse_time(params['end'][-1])
+        step = parse_step(params['step'][-1])
+        if step <= 0 or end < start:
+          raise PromQLError('The end timestamp must not be before the start time and the step must be positive')
+        if (end - start) / step + 1 > max_points_per_query:
+          raise PromQLError(f'Exceeded maximum resolution of {max_points_per_query} points per timeseries')
+        grid = start + np.arange(int((end - start) // step) + 1) * step
+        return self.send_success(range_result(store.query(params['query'][-1], grid), grid))
+      if path == '/api/v1/series':
+        result = []
+        for query in params.get('match[]', []):
+          expr = Parser(query).parse()
+          if expr[0] != 'selector':
+            raise PromQLError('match[] must be a series selector')
+          result += [labels for labels, _, _ in store.select(compile_matchers(expr[2]))]
+        return self.send_success(result)
+      if path == '/api/v1/admin/tsdb/delete_series':
+        start = parse_time(params['start'][-1]) if 'start' in params else -math.inf
+        end = parse_time(params['end'][-1]) if 'end' in params else math.inf
+        for query in params.get('match[]', []):
+          expr = Parser(query).parse()
+          if expr[0] != 'selector':
+            raise PromQLError('match[] must be a series selector')
+          store.delete(compile_matchers(expr[2]), start, end)
+        return self.send_body(204, b'', 'text/plain')
+      self.send_text(404, '404 page not found\n')
+    except (PromQLError, KeyError, ValueError) as e:
+      self.send_json(400, {'status': 'error', 'errorType': 'bad_data', 'error': str(e)})
+
+  def send_success(self, data):
+    self.send_json(200, {'status': 'success', 'data': data})
+
+  def send_json(self, code, obj):
+    self.send_body(code, json.dumps(obj).encode(), 'application/json')
+
+  def send_text(self, code, text):
+    self.send_body(code, text.encode(), 'text/plain')
+
+  def send_body(self, code, data, content_type):
+    self.send_response(code)
+    self.send_header('Content-Type', content_type)
+    self.send_header('Content-Length', str(len(data)))
+    self.end_headers()
+    self.wfile.write(data)
@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+from kubernetes_asyncio import client, config, watch
+from kubernetes_asyncio.client.rest import ApiException
+
+strategy_group = 'elasticity.polaris-slo-cloud.github.io'
+strategy_version = 'v1'
+strategy_plurals = [
+  'verticalelasticitystrategies',
+  'horizontalelasticitystrategies'
+]
+watch_timeout_seconds = 60
+retry_delay_seconds = 1
+# Like a plain watch, the informer reports the objects that exist when it starts as ADDED events.
+recorded_event_types = ('ADDED', 'MODIFIED')
+
+
+class EventBuffer:
+  def __init__(self, capacity=1024):
+    self.timestamps = np.empty(capacity, dtype=np.float64)
+    self.kinds = np.empty(capacity, dtype=np.int16)
+    self.names = np.empty(capacity, dtype=np.int32)
+    self.size = 0
+    self.name_ids = {}
+    self.name_list = []
+    self.lock = threading.Lock()
+
+  def append(self, timestamp, kind, name):
+    with self.lock:
+      if self.size == len(self.timestamps):
+        self.grow()
+      name_id = self.name_ids.get(name)
+      if name_id is None:
+        name_id = self.name_ids[name] = len(self.name_list)
+        self.name_list.append(name)
+      self.timestamps[self.size] = timestamp
+      self.kinds[self.size] = kind
+      self.names[self.size] = name_id
+      self.size += 1
+
+  def grow(self):
+    capacity = len(self.timestamps) * 2
+    self.timestamps = np.resize(self.timestamps, capacity)
+    self.kinds = np.resize(self.kinds, capacity)
+    self.names = np.resize(self.names, capacity)
+
+  def snapshot(self):
+    with self.lock:
+      return self.timestamps[:self.size].copy(), self.kinds[:self.size].copy(), self.names[:self.size].copy()
+
+
+def scaling_actions(events, plurals):
+  timestamps, kinds, _ = events.snapshot()
+  actions = {}
+  for kind, plural in enumerate(plurals):
+    kind_timestamps = timestamps[kinds == kind]
+    if len(kind_timestamps) > 0:
+      actions[plural] = kind_timestamps.tolist()
+  return actions
+
+
+class AsyncStrategyInformer:
+  # Watches all strategy plurals as tasks on the caller's event loop, over the connection pool of one ApiClient. The
+  # API server has no watch across kinds, so each plural keeps its own watch request on that pool.
+  def __init__(self, api_client, namespace, plurals=None, group=strategy_group, version=strategy_version,
+               capacity=1024):
+    self.namespace = namespace
+    self.plurals = list(plurals or strategy_plurals)
+    self.group = group
+    self.version = version
+    self.events = EventBuffer(capacity)
+    self.custom_api = client.CustomObjectsApi(api_client)
+    self.tasks = []
+
+  def start(self):
+    self.tasks = [asyncio.create_task(self.run(kind, plural)) for kind, plural in enumerate(self.plurals)]
+    return self
+
+  async def stop(self):
+    for task in self.tasks:
+      task.cancel()
+    await asyncio.gather(*self.tasks, return_exceptions=True)
+
+  async def list_objects(self, plural):
+    listing = await self.custom_api.list_namespaced_custom_object(self.group, self.version, self.namespace, plural)
+    return listing['items'], listing['metadata']['resourceVersion']
+
+  async def run(self, kind, plural):
+    resource_version = None
+    listed = False
+    while True:
+      try:
+        if resource_version is None:
+          items, resource_version = await self.list_objects(plural)
+          # The first listing stands in for the ADDED events of a watch without a resourceVersion. Relists after
+          # 410 Gone only resume the watch, so objects are not counted twice.
+          if not listed:
+            listed_at = time.time()
+            for item in items:
+              self.events.append(listed_at, kind, item['metadata']['name'])
+            listed = True
+        async with watch.Watch() as watcher:
+          async for event in watcher.stream(self.custom_api.list_namespaced_custom_object, self.group, self.version,
+                                            self.namespace, plural, resource_version=resource_version,
+                                            timeout_seconds=watch_timeout_seconds):
+            if event['type'] == 'ERROR':
+              resource_version = None
+              break
+            metadata = event['object']['metadata']
+            resource_version = metadata['resourceVersion']
+            if event['type'] in recorded_event_types:
+              self.events.append(time.time(), kind, metadata['name'])
+      except ApiException as e:
+        if e.status == 410:
+          resource_version = None
+        else:
+          print(f'Error watching {plural}: {e.reason}')
+          await asyncio.sleep(retry_delay_seconds)
+      except asyncio.CancelledError:
+        raise
+      except Exception as e:
+        print(f'Error watching {plural}: {str(e)}')
+        await asyncio.sleep(retry_delay_seconds)
+
+  def scaling_actions(self):
+    return scaling_actions(self.events, self.plurals)
+
+
+class StrategyInformer:
+  # Blocking counterpart for the threaded runners in suite.py: runs an AsyncStrategyInformer on an event loop in one
+  # background thread, whatever the number of plurals.
+  def __init__(self, namespace, plurals=None, group=strategy_group, version=strategy_version, capacity=1024):
+    self.namespace = namespace
+    self.plurals = list(plurals or strategy_plurals)
+    self.group = group
+    self.version = version
+    self.capacity = capacity
+    self.loop = asyncio.new_event_loop()
+    self.thread = threading.Thread(target=self.loop.run_forever, name='strategy-informer', daemon=True)
+    self.api_client = None
+    self.informer = None
+
+  @property
+  def events(self):
+    return self.informer.events
+
+  def run(self, coroutine):
+    return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+  async def open(self):
+    configuration = client.Configuration()
+    await config.load_kube_config(client_configuration=configuration)
+    self.api_client = client.ApiClient(configuration)
+    self.informer = AsyncStrategyInformer(self.api_client, self.namespace, self.plurals, self.group, self.version,
+                                          self.capacity).start()
+
+  async def close(self):
+    try:
+      await self.informer.stop()
+    finally:
+      await self.api_client.close()
+
+  def start(self):
+    self.thread.start()
+    self.run(self.open())
+    return self
+
+  def stop(self):
+    try:
+      self.run(self.close())
+    finally:
+      self.loop.call_soon_threadsafe(self.loop.stop)
+      self.thread.join()
+      self.loop.close()
+
+  def scaling_actions(self):
+    return scaling_actions(self.events, self.plurals)
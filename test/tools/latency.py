@@ -0,0 +1,111 @@
+import csv
+import os
+
+import numpy as np
+
+decision_latency_metric = 'polaris_decision_latency_seconds'
+summary_fields = ['stage', 'count', 'p50_ms', 'p95_ms', 'p99_ms']
+# The stages in the order of a scaling decision, see DecisionStage in libs/slos.
+stages = ['metric_fetch', 'scale_client_read', 'strategy_selection', 'slo_evaluation', 'crd_write', 'decision',
+          'strategy_execution']
+load_to_strategy = 'load_to_strategy'
+
+
+class Histogram:
+  def __init__(self, bounds, cumulative):
+    order = np.argsort(bounds)
+    self.bounds = np.asarray(bounds, dtype=np.float64)[order]
+    self.cumulative = np.asarray(cumulative, dtype=np.float64)[order]
+
+  @property
+  def count(self):
+    return self.cumulative[-1] if len(self.cumulative) > 0 else 0.0
+
+  def quantile(self, q):
+    # Linear interpolation within the bucket, like histogram_quantile() in PromQL.
+    if self.count <= 0 or len(self.bounds) < 2:
+      return np.nan
+    rank = q * self.count
+    index = int(np.searchsorted(self.cumulative, rank))
+    if index >= len(self.bounds) - 1:
+      return self.bounds[-2]
+    lower = self.bounds[index - 1] if index > 0 else 0.0
+    below = self.cumulative[index - 1] if index > 0 else 0.0
+    in_bucket = self.cumulative[index] - below
+    if in_bucket <= 0:
+      return self.bounds[index]
+    return lower + (self.bounds[index] - lower) * (rank - below) / in_bucket
+
+  def cdf(self):
+    finite = np.isfinite(self.bounds)
+    return self.bounds[finite], self.cumulative[finite] / self.count if self.count > 0 else self.cumulative[finite]
+
+
+def latency_query(range_sec, target_namespace=None):
+  ns = '' if target_namespace is None else f'{{target_namespace="{target_namespace}"}}'
+  return f'sum by (stage, le) (increase({decision_latency_metric}_bucket{ns}[{max(1, int(np.ceil(range_sec)))}s]))'
+
+
+def histograms_from_vector(result):
+  buckets = {}
+  for sample in result:
+    labels = sample['metric']
+    value = float(sample['value'][1])
+    if 'stage' in labels and 'le' in labels and np.isfinite(value):
+      buckets.setdefault(labels['stage'], []).append((float(labels['le']), value))
+  histograms = {}
+  for stage in sorted(buckets, key=lambda name: stages.index(name) if name in stages else len(stages)):
+    bounds, cumulative = zip(*buckets[stage])
+    histogram = Histogram(bounds, cumulative)
+    if histogram.count > 0:
+      histograms[stage] = histogram
+  return histograms
+
+
+def load_change_times(data, start, step_sec):
+  return [start + index * step_sec for index, value in enumerate(data) if index == 0 or value != data[index - 1]]
+
+
+def strategy_lags(scaling_actions, data, start, step_sec):
+  # Seconds from the latest load change to each scaling action, i.e., the end-to-end reaction time of the controllers.
+  changes = np.array(load_change_times(data, start, step_sec), dtype=np.float64)
+  lags = []
+  for timestamps in scaling_actions.values():
+    for timestamp in timestamps:
+      index = np.searchsorted(changes, timestamp, side='right') - 1
+      if index >= 0:
+        lags.append(timestamp - changes[index])
+  return np.sort(np.array(lags, dtype=np.float64))
+
+
+def summary(histograms, lags=None):
+  rows = [{
+    'stage': stage,
+    'count': int(round(histogram.count)),
+    'p50_ms': histogram.quantile(0.5) * 1000,
+    'p95_ms': histogram.quantile(0.95) * 1000,
+    'p99_ms': histogram.quantile(0.99) * 1000
+  } for stage, histogram in histograms.items()]
+  if lags is not None and len(lags) > 0:
+    rows.append({
+      'stage': load_to_strategy,
+      'count': len(lags),
+      'p50_ms': np.percentile(lags, 50) * 1000,
+      'p95_ms': np.percentile(lags, 95) * 1000,
+      'p99_ms': np.percentile(lags, 99) * 1000
+    })
+  return rows
+
+
+def write_summary(path, histograms, lags=None):
+  rows = summary(histograms, lags)
+  if not rows:
+    return None
+  directory = os.path.dirname(path)
+  if directory:
+    os.makedirs(directory, exist_ok=True)
+  with open(path, 'w', newline='') as file:
+    writer = csv.DictWriter(file, fieldnames=summary_fields)
+    writer.writeheader()
+    writer.writerows(rows)
+  return path
@@ -0,0 +1,17 @@
+import sys
+
+import loadtest
+
+counts = [int(count) for count in (sys.argv[1] if len(sys.argv) > 1 else '10,50,100,250,500').split(',')]
+duration_sec = int(sys.argv[2]) if len(sys.argv) > 2 else loadtest.measure_sec
+
+results = loadtest.run_scaling(counts, duration_sec)
+loadtest.write_csv(results, f'{loadtest.result_root}/scale.csv')
+
+print(f'{"mappings":>8} {"ticks":>5} {"p50 ms":>8} {"p95 ms":>8} {"max ms":>8} {"duty":>5} {"req/s":>7} '
+      f'{"slo MiB":>8} {"strat MiB":>9}')
+for result in results:
+  print(f'{result["mappings"]:>8} {result["ticks"]:>5} {result["tick_p50_ms"]:>8.0f} {result["tick_p95_ms"]:>8.0f} '
+        f'{result["tick_max_ms"]:>8.0f} {result["loop_duty_cycle"]:>5.2f} {result["requests_per_sec"]:>7.1f} '
+        f'{result[f"{loadtest.slo_controller}_rss_peak_mib"]:>8.1f} '
+        f'{result[f"{loadtest.strategy_controller}_rss_peak_mib"]:>9.1f}')
@@ -0,0 +1,244 @@
+import copy
+import csv
+import os
+import subprocess
+import threading
+import time
+
+import numpy as np
+import yaml
+
+import profiles
+from fakeapi import FakeApiServer
+from fakeprom import FakePrometheus, fake_api_deployments, kube_state_collector
+
+namespace = 'polaris'
+slo_controller = 'average-cpu-utilization'
+strategy_controller = 'multi-elasticity-strategy-controller'
+cpu_load_controller = 'demo-cpu-load-metric-controller'
+cpu_usage_controller = 'demo-average-cpu-utilization-metric-controller'
+controllers = [slo_controller, strategy_controller, cpu_load_controller, cpu_usage_controller]
+metrics_ports = {cpu_load_controller: 3100, cpu_usage_controller: 3101}
+controller_commands = {name: ['node', f'./../../dist/apps/{name}/main.js'] for name in controllers}
+mapping_template_path = './../slo-mappings/base/best-fit.yaml'
+target_template_path = './../slo-mappings/base/resource-consumer.yaml'
+result_root = './result/load-test'
+
+slo_controller_interval_ms = 5000
+metric_controller_interval_ms = 3000
+cpu_test_data = [500]
+# A trace file of traces.py that the CPU load controller replays instead of cpu_test_data.
+cpu_trace_path = None
+# Without the stand-in, the controllers query the Prometheus at prometheus_host:prometheus_port.
+prometheus_stand_in = True
+prometheus_host = 'localhost'
+prometheus_port = 9090
+stand_in_scrape_interval_sec = 1
+warmup_sec = 20
+measure_sec = 60
+memory_sample_sec = 1
+stop_timeout_sec = 10
+# Requests of one control loop tick arrive in a burst; a pause longer than this fraction of the interval ends a tick.
+tick_gap_fraction = 0.5
+
+result_fields = ['mappings', 'ticks', 'tick_p50_ms', 'tick_p95_ms', 'tick_max_ms', 'loop_duty_cycle',
+                 'requests_per_sec'] + \
+                [f'{name}_{field}' for name in controllers
+                 for field in ('requests_per_sec', 'rss_peak_mib', 'rss_end_mib', 'cpu_sec')]
+
+
+def load_template(path):
+  with open(path) as file:
+    return next(document for document in yaml.safe_load_all(file) if document is not None)
+
+
+def synthetic_targets(count, template):
+  targets = []
+  for index in range(count):
+    target = copy.deepcopy(template)
+    target['metadata'] = {'namespace': namespace, 'name': f'load-target-{index:04d}'}
+    labels = {'component': target['metadata']['name']}
+    target['spec']['selector'] = {'matchLabels': labels}
+    target['spec']['template']['metadata'] = {'labels': labels}
+    targets.append(target)
+  return targets
+
+
+def synthetic_mappings(targets, template):
+  mappings = []
+  for index, target in enumerate(targets):
+    mapping = copy.deepcopy(template)
+    mapping['metadata'] = {'namespace': namespace, 'name': f'load-mapping-{index:04d}'}
+    mapping['spec']['targetRef']['name'] = target['metadata']['name']
+    mappings.append(mapping)
+  return mappings
+
+
+def populate(server, count):
+  targets = synthetic_targets(count, load_template(target_template_path))
+  for obj in [{'apiVersion': 'v1', 'kind': 'Namespace', 'metadata': {'name': namespace}}] + targets + \
+             synthetic_mappings(targets, load_template(mapping_template_path)):
+    server.create(obj)
+
+
+def read_memory_kib(pid):
+  with open(f'/proc/{pid}/status') as file:
+    for line in file:
+      if line.startswith('VmRSS:'):
+        return int(line.split()[1])
+  return 0
+
+
+def read_cpu_sec(pid):
+  with open(f'/proc/{pid}/stat') as file:
+    fields = file.read().rsplit(')', 1)[1].split()
+  # utime and stime are fields 14 and 15 of /proc/<pid>/stat, counted after the command name.
+  return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+
+class ControllerProcess:
+  def __init__(self, name, command, env, log_path):
+    self.name = name
+    self.samples = []
+    self.stop_event = threading.Event()
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    self.log = open(log_path, 'w')
+    self.process = subprocess.Popen(command, env={**os.environ, **env}, stdout=self.log, stderr=subprocess.STDOUT)
+    self.sampler = threading.Thread(target=self.sample, daemon=True)
+    self.sampler.start()
+
+  def sample(self):
+    while not self.stop_event.is_set() and self.process.poll() is None:
+      try:
+        self.samples.append((time.time(), read_memory_kib(self.process.pid), read_cpu_sec(self.process.pid)))
+      except OSError:
+        break
+      self.stop_event.wait(memory_sample_sec)
+
+  def usage(self, since):
+    samples = np.array([sample for sample in self.samples if sample[0] >= since]).reshape(-1, 3)
+    if len(samples) == 0:
+      return np.nan, np.nan, np.nan
+    return samples[:, 1].max() / 1024, samples[-1, 1] / 1024, samples[-1, 2] - samples[0, 2]
+
+  def stop(self):
+    self.stop_event.set()
+    self.process.terminate()
+    try:
+      self.process.wait(stop_timeout_sec)
+    except subprocess.TimeoutExpired:
+      self.process.kill()
+      self.process.wait()
+    self.sampler.join()
+    self.log.close()
+
+
+def tick_durations(timestamps, interval_sec):
+  timestamps = np.sort(np.asarray(timestamps, dtype=np.float64))
+  if len(timestamps) == 0:
+    return np.empty(0)
+  breaks = np.nonzero(np.diff(timestamps) > interval_sec * tick_gap_fraction)[0]
+  starts = np.concatenate(([0], breaks + 1))
+  ends = np.concatenate((breaks, [len(timestamps) - 1]))
+  return timestamps[ends] - timestamps[starts]
+
+
+def controller_env(name, server, prometheus, run_root, interval_ms):
+  env = {
+    'KUBECONFIG': server.kubeconfig(os.path.join(run_root, f'{name}.kubeconfig'), client_name=name),
+    'POLARIS_CONNECTION_CHECK_TIMEOUT_MS': '6000000',
+    'PROMETHEUS_HOST': prometheus.host if prometheus is not None else prometheus_host,
+    'PROMETHEUS_PORT': str(prometheus.port if prometheus is not None else prometheus_port)
+  }
+  if name == slo_controller:
+    env['SLO_CONTROL_LOOP_INTERVAL_MSEC'] = str(interval_ms)
+  if name in metrics_ports:
+    env.update({
+      'PROMETHEUS_METRICS_ENDPOINT_PORT': str(metrics_ports[name]),
+      'PROMETHEUS_METRICS_ENDPOINT_PATH': '/metrics',
+      'COMPOSED_METRIC_COMPUTATION_INTERVAL_MS': str(metric_controller_interval_ms)
+    })
+  if name == cpu_load_controller:
+    profile_path = os.path.join(run_root, 'cpu-load.profile')
+    os.makedirs(run_root, exist_ok=True)
+    profiles.write_profile(profile_path, cpu_test_data)
+    env['CPU_TEST_DATA_FILE'] = profile_path
+    if cpu_trace_path is not None:
+      env['CPU_TRACE_FILE'] = os.path.abspath(cpu_trace_path)
+  return env
+
+
+def start_prometheus(server, names):
+  prometheus = FakePrometheus(collectors=[kube_state_collector(fake_api_deployments(server))],
+                              scrape_interval_sec=stand_in_scrape_interval_sec)
+  for name in names:
+    if name in metrics_ports:
+      prometheus.add_target(f'http://localhost:{metrics_ports[name]}/metrics', name)
+  return prometheus.start()
+
+
+def run_load_test(count, duration_sec=measure_sec, warmup=warmup_sec, interval_ms=slo_controller_interval_ms,
+                  names=None):
+  names = list(names or controllers)
+  run_root = os.path.join(result_root, str(count))
+  with FakeApiServer() as server:
+    populate(server, count)
+    prometheus = start_prometheus(server, names) if prometheus_stand_in else None
+    processes = [ControllerProcess(name, controller_commands[name],
+                                   controller_env(name, server, prometheus, run_root, interval_ms),
+                                   os.path.join(run_root, f'{name}.log'))
+                 for name in names]
+    try:
+      time.sleep(warmup)
+      start = time.time()
+      time.sleep(duration_sec)
+      end = time.time()
+      for process in processes:
+        if process.process.poll() is not None:
+          print(f'{process.name} exited with {process.process.returncode}, see {run_root}/{process.name}.log')
+    finally:
+      for process in processes:
+        process.stop()
+      if prometheus is not None:
+        prometheus.stop()
+    requests = [entry for entry in server.requests(start) if entry[0] < end and entry[2] != 'watch']
+
+  interval_sec = interval_ms / 1000
+  ticks = tick_durations([entry[0] for entry in requests if entry[1] == slo_controller], interval_sec)
+  result = {
+    'mappings': count,
+    'ticks': len(ticks),
+    'tick_p50_ms': np.percentile(ticks, 50) * 1000 if len(ticks) > 0 else np.nan,
+    'tick_p95_ms': np.percentile(ticks, 95) * 1000 if len(ticks) > 0 else np.nan,
+    'tick_max_ms': ticks.max() * 1000 if len(ticks) > 0 else np.nan,
+    'loop_duty_cycle': ticks.sum() / (end - start),
+    'requests_per_sec': len(requests) / (end - start)
+  }
+  for process in processes:
+    rss_peak, rss_end, cpu = process.usage(start)
+    result.update({
+      f'{process.name}_requests_per_sec': sum(1 for entry in requests if entry[1] == process.name) / (end - start),
+      f'{process.name}_rss_peak_mib': rss_peak,
+      f'{process.name}_rss_end_mib': rss_end,
+      f'{process.name}_cpu_sec': cpu
+    })
+  return result
+
+
+def run_scaling(counts, duration_sec=measure_sec, warmup=warmup_sec, interval_ms=slo_controller_interval_ms,
+                names=None):
+  results = []
+  for count in counts:
+    print(f'Running load test with {count} mappings')
+    results.append(run_load_test(count, duration_sec, warmup, interval_ms, names))
+  return results
+
+
+def write_csv(results, path):
+  directory = os.path.dirname(path)
+  if directory:
+    os.makedirs(directory, exist_ok=True)
+  with open(path, 'w', newline='') as file:
+    writer = csv.DictWriter(file, fieldnames=result_fields, restval='')
+    writer.writeheader()
+    writer.writerows(results)
@@ -0,0 +1,370 @@
+import asyncio
+import atexit
+import contextvars
+import copy
+import os
+import re
+import threading
+import time
+
+import yaml
+from kubernetes_asyncio import client, config
+from kubernetes_asyncio.client.rest import ApiException
+from kubernetes_asyncio.dynamic import DynamicClient
+from kubernetes_asyncio.dynamic.exceptions import DynamicApiError, NotFoundError, api_exception
+
+import timing
+
+field_manager = 'polaris-test-suite'
+max_concurrent_requests = 16
+crd_established_timeout_sec = 60
+deletion_timeout_sec = 120
+poll_interval_sec = 0.5
+manifest_extensions = ('.yaml', '.yml', '.json')
+default_namespace = 'default'
+
+# Resources are applied in waves of this order and deleted in reverse; kinds not listed here (custom resources,
+# ServiceMonitors, ...) go last, after the CRDs and workloads they depend on.
+kind_order = [
+  'CustomResourceDefinition',
+  'Namespace',
+  'ServiceAccount',
+  'ClusterRole',
+  'ClusterRoleBinding',
+  'Role',
+  'RoleBinding',
+  'ConfigMap',
+  'Secret',
+  'Service',
+  'Deployment'
+]
+
+manifest_cache = {}
+manifest_cache_lock = threading.Lock()
+
+
+def manifest_files(path):
+  if not os.path.isdir(path):
+    return [path]
+  names = sorted(name for name in os.listdir(path) if name.endswith(manifest_extensions))
+  return [os.path.join(path, name) for name in names]
+
+
+def load_manifest_file(path):
+  mtime = os.path.getmtime(path)
+  with manifest_cache_lock:
+    cached = manifest_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+      return cached[1]
+  with open(path) as file:
+    documents = [document for document in yaml.safe_load_all(file) if document is not None]
+  with manifest_cache_lock:
+    manifest_cache[path] = (mtime, documents)
+  return documents
+
+
+def load_manifests(paths):
+  documents = []
+  for path in paths:
+    for file in manifest_files(os.path.abspath(path)):
+      documents.extend(copy.deepcopy(load_manifest_file(file)))
+  return documents
+
+
+def kind_rank(document):
+  kind = document.get('kind')
+  return kind_order.index(kind) if kind in kind_order else len(kind_order)
+
+
+def unique(documents):
+  by_key = {}
+  for document in documents:
+    metadata = document.get('metadata', {})
+    by_key[(document.get('apiVersion'), document.get('kind'), metadata.get('namespace'), metadata.get('name'))] = document
+  return list(by_key.values())
+
+
+def waves(documents):
+  documents = unique(documents)
+  ranks = sorted({kind_rank(document) for document in documents})
+  return [[document for document in documents if kind_rank(document) == rank] for rank in ranks]
+
+
+def set_container_env(document, values):
+  for container in document['spec']['template']['spec']['containers']:
+    env = [entry for entry in container.get('env', []) if entry['name'] not in values]
+    env.extend({'name': name, 'value': value} for name, value in values.items())
+    container['env'] = env
+
+
+def with_env(documents, env):
+  for document in documents:
+    name = document.get('metadata', {}).get('name')
+    if document.get('kind') == 'Deployment' and name in env:
+      set_container_env(document, env[name])
+  return documents
+
+
+def parse_duration_sec(text):
+  units = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}
+  return sum(int(amount) * units[unit] for amount, unit in re.findall(r'([0-9]+)(ms|[smh])', text))
+
+
+def with_time_scale(documents, time_scale):
+  # Compresses the durations in manifests that define the dynamics of a test, so that a test keeps its behavior in
+  # logical time when the controller intervals are divided by time_scale.
+  if time_scale == 1:
+    return documents
+  for document in documents:
+    if document.get('kind') == 'ServiceMonitor':
+      for endpoint in document['spec'].get('endpoints', []):
+        if 'interval' in endpoint:
+          endpoint['interval'] = f'{max(1, round(parse_duration_sec(endpoint["interval"]) * 1000 / time_scale))}ms'
+    elif document.get('kind') == 'CpuUtilizationSloMapping':
+      window = document['spec'].get('stabilizationWindow') or {}
+      for field in ('scaleUpSeconds', 'scaleDownSeconds'):
+        if field in window:
+          window[field] = round(window[field] / time_scale)
+  return documents
+
+
+def describe(document):
+  return f'{document.get("kind")}/{document.get("metadata", {}).get("name")}'
+
+
+class ManifestError(Exception):
+  # Raised once all requests of a step have finished, with one line per manifest that failed.
+  def __init__(self, action, failures):
+    self.failures = failures
+    super().__init__(f'Failed to {action} {len(failures)} manifest(s):\n  ' + '\n  '.join(failures))
+
+
+def raise_for_status(result):
+  # The async dynamic client returns failed requests as Status objects instead of raising them.
+  if getattr(result, 'kind', None) == 'Status' and result.status == 'Failure':
+    raise api_exception(ApiException(status=result.code, reason=result.message))
+  return result
+
+
+class AsyncManifestApplier:
+  def __init__(self, api_client, workers=max_concurrent_requests):
+    self.api_client = api_client
+    self.dynamic = None
+    self.limit = asyncio.Semaphore(workers)
+
+  async def open(self):
+    self.dynamic = await DynamicClient(self.api_client)
+    return self
+
+  async def resource(self, document):
+    return await self.dynamic.resources.get(api_version=document['apiVersion'], kind=document['kind'])
+
+  def target_namespace(self, resource, document, target_namespace):
+    if not resource.namespaced:
+      return None
+    metadata = document.setdefault('metadata', {})
+    if target_namespace is not None:
+      metadata['namespace'] = target_namespace
+    return metadata.setdefault('namespace', default_namespace)
+
+  async def resolve(self, documents, target_namespace, action):
+    resolved = []
+    failures = []
+    for document in documents:
+      try:
+        resource = await self.resource(document)
+      except Exception as e:
+        failures.append(f'Unknown resource {describe(document)}: {str(e)}')
+        continue
+      resolved.append((resource, document, self.target_namespace(resource, document, target_namespace)))
+    if failures:
+      raise ManifestError(action, failures)
+    return resolved
+
+  @timing.timed('apply manifests')
+  async def apply(self, paths, target_namespace=None, env=None, time_scale=1, documents=()):
+    # Extra documents join the kind-ordered waves of the manifests, e.g., ConfigMaps in a Namespace they create.
+    manifests = with_time_scale(with_env(load_manifests(paths), env or {}), time_scale)
+    await self.apply_documents(manifests + list(documents), target_namespace)
+
+  async def apply_documents(self, documents, target_namespace=None):
+    # A failed wave raises before the next one is applied, since later waves depend on it.
+    for wave in waves(documents):
+      resolved = await self.resolve(wave, target_namespace, 'apply')
+      failures = [failure for failure in await asyncio.gather(*[self.apply_document(*item) for item in resolved])
+                  if failure is not None]
+      if failures:
+        raise ManifestError('apply', failures)
+      crds = [document for _, document, _ in resolved if document['kind'] == 'CustomResourceDefinition']
+      if crds:
+        await self.wait_established(crds)
+
+  async def apply_document(self, resource, document, target_namespace):
+    try:
+      async with self.limit:
+        raise_for_status(await self.dynamic.server_side_apply(resource, body=document, namespace=target_namespace,
+                                                              field_manager=field_manager, force_conflicts=True))
+      return None
+    except DynamicApiError as e:
+      return f'{describe(document)}: {e.summary()}'
+
+  @timing.timed('delete manifests')
+  async def delete(self, paths, target_namespace=None, wait=True, propagation='Background'):
+    await self.delete_documents(load_manifests(paths), target_namespace, wait, propagation)
+
+  async def delete_documents(self, documents, target_namespace=None, wait=True, propagation='Background'):
+    # Deletion goes on through all waves and reports every failure at the end, so that one failure does not leave
+    # the rest of a test behind.
+    failures = []
+    for wave in reversed(waves(documents)):
+      try:
+        resolved = await self.resolve(wave, target_namespace, 'delete')
+        await self.delete_resolved(resolved, wait, propagation)
+      except ManifestError as e:
+        failures.extend(e.failures)
+    if failures:
+      raise ManifestError('delete', failures)
+
+  async def delete_resolved(self, resolved, wait=True, propagation='Background'):
+    results = await asyncio.gather(*[self.delete_document(*item, propagation) for item in resolved])
+    deleted = [item for item, (was_found, _) in zip(resolved, results) if was_found]
+    failures = [failure for _, failure in results if failure is not None]
+    if wait:
+      failures.extend(await self.wait_deleted(deleted))
+    if failures:
+      raise ManifestError('delete', failures)
+
+  @timing.timed('delete custom resources')
+  async def delete_custom_resources(self, crd_paths, target_namespace, wait=True, propagation='Background'):
+    resolved = []
+    for crd in load_manifests(crd_paths):
+      if crd.get('kind') != 'CustomResourceDefinition':
+        continue
+      version = next(version['name'] for version in crd['spec']['versions'] if version.get('storage', True))
+      resource = await self.dynamic.resources.get(api_version=f'{crd["spec"]["group"]}/{version}',
+                                                  kind=crd['spec']['names']['kind'])
+      listing = raise_for_status(await self.dynamic.get(resource, namespace=target_namespace))
+      for item in listing.to_dict()['items']:
+        resolved.append((resource, item, target_namespace))
+    await self.delete_resolved(resolved, wait, propagation)
+
+  async def delete_document(self, resource, document, target_namespace, propagation='Background'):
+    # Returns whether the object was found and the failure, if any.
+    try:
+      async with self.limit:
+        raise_for_status(await self.dynamic.delete(resource, name=document['metadata']['name'],
+                                                   namespace=target_namespace, body={'propagationPolicy': propagation}))
+      return True, None
+    except NotFoundError:
+      return False, None
+    except DynamicApiError as e:
+      return False, f'{describe(document)}: {e.summary()}'
+
+  async def exists(self, resource, document, target_namespace):
+    try:
+      async with self.limit:
+        raise_for_status(await self.dynamic.get(resource, name=document['metadata']['name'],
+                                                namespace=target_namespace))
+      return True
+    except NotFoundError:
+      return False
+
+  async def wait_deleted(self, items):
+    deadline = time.monotonic() + deletion_timeout_sec
+    while items and time.monotonic() < deadline:
+      remaining = await asyncio.gather(*[self.exists(*item) for item in items])
+      items = [item for item, exists in zip(items, remaining) if exists]
+      if items:
+        await asyncio.sleep(poll_interval_sec)
+    return [f'Timed out waiting for deletion of {describe(document)}' for _, document, _ in items]
+
+  async def is_established(self, crd_resource, name):
+    async with self.limit:
+      crd = raise_for_status(await self.dynamic.get(crd_resource, name=name))
+    conditions = crd.to_dict().get('status', {}).get('conditions') or []
+    return any(condition['type'] == 'Established' and condition['status'] == 'True' for condition in conditions)
+
+  async def wait_established(self, crds):
+    crd_resource = await self.resource(crds[0])
+    names = [crd['metadata']['name'] for crd in crds]
+    deadline = time.monotonic() + crd_established_timeout_sec
+    while names and time.monotonic() < deadline:
+      established = await asyncio.gather(*[self.is_established(crd_resource, name) for name in names])
+      names = [name for name, done in zip(names, established) if not done]
+      if names:
+        await asyncio.sleep(poll_interval_sec)
+    if names:
+      raise ManifestError('apply', [f'Timed out waiting for CustomResourceDefinition/{name} to be established'
+                                    for name in names])
+
+  async def list_items(self, api_version, kind, target_namespace=None):
+    resource = await self.dynamic.resources.get(api_version=api_version, kind=kind)
+    async with self.limit:
+      listing = raise_for_status(await self.dynamic.get(resource, namespace=target_namespace))
+    return listing.to_dict()['items']
+
+  async def set_env(self, deployment_name, values, target_namespace, restart=False):
+    resource = await self.dynamic.resources.get(api_version='apps/v1', kind='Deployment')
+    deployment = raise_for_status(await self.dynamic.get(resource, name=deployment_name,
+                                                         namespace=target_namespace)).to_dict()
+    # A value of None removes the variable.
+    env = [{'name': name, '$patch': 'delete'} if value is None else {'name': name, 'value': value}
+           for name, value in values.items()]
+    containers = [{'name': container['name'], 'env': env}
+                  for container in deployment['spec']['template']['spec']['containers']]
+    patch = {'spec': {'template': {'spec': {'containers': containers}}}}
+    if restart:
+      restarted_at = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+      patch['spec']['template']['metadata'] = {'annotations': {'kubectl.kubernetes.io/restartedAt': restarted_at}}
+    raise_for_status(await self.dynamic.patch(resource, body=patch, name=deployment_name, namespace=target_namespace,
+                                              content_type='application/strategic-merge-patch+json'))
+
+
+async def open_applier(workers=max_concurrent_requests):
+  configuration = client.Configuration()
+  await config.load_kube_config(client_configuration=configuration)
+  return await AsyncManifestApplier(client.ApiClient(configuration), workers).open()
+
+
+async def in_context(coroutine, context):
+  return await asyncio.get_running_loop().create_task(coroutine, context=context)
+
+
+class ManifestApplier:
+  # Blocking facade over an AsyncManifestApplier for the threaded runners in suite.py. All calls, from any thread,
+  # run on one event loop in a background thread, in the caller's context so that timing spans nest under the
+  # caller's spans.
+  def __init__(self, workers=max_concurrent_requests):
+    self.loop = asyncio.new_event_loop()
+    threading.Thread(target=self.loop.run_forever, name='manifest-applier', daemon=True).start()
+    self.applier = self.run(open_applier(workers))
+    atexit.register(self.close)
+
+  def run(self, coroutine):
+    return asyncio.run_coroutine_threadsafe(in_context(coroutine, contextvars.copy_context()), self.loop).result()
+
+  def close(self):
+    if self.loop.is_running():
+      self.run(self.applier.api_client.close())
+      self.loop.call_soon_threadsafe(self.loop.stop)
+
+  def apply(self, paths, target_namespace=None, env=None, time_scale=1, documents=()):
+    self.run(self.applier.apply(paths, target_namespace, env, time_scale, documents))
+
+  def apply_documents(self, documents, target_namespace=None):
+    self.run(self.applier.apply_documents(documents, target_namespace))
+
+  def delete(self, paths, target_namespace=None, wait=True, propagation='Background'):
+    self.run(self.applier.delete(paths, target_namespace, wait, propagation))
+
+  def delete_documents(self, documents, target_namespace=None, wait=True, propagation='Background'):
+    self.run(self.applier.delete_documents(documents, target_namespace, wait, propagation))
+
+  def delete_custom_resources(self, crd_paths, target_namespace, wait=True, propagation='Background'):
+    self.run(self.applier.delete_custom_resources(crd_paths, target_namespace, wait, propagation))
+
+  def list_items(self, api_version, kind, target_namespace=None):
+    return self.run(self.applier.list_items(api_version, kind, target_namespace))
+
+  def set_env(self, deployment_name, values, target_namespace, restart=False):
+    self.run(self.applier.set_env(deployment_name, values, target_namespace, restart))
@@ -0,0 +1,479 @@
+import asyncio
+import subprocess
+
+import aiohttp
+from kubernetes_asyncio import client, config
+
+import latency
+import profiles
+import suite
+import timing
+from fakeprom import FakePrometheus
+from informer import AsyncStrategyInformer
+from manifests import AsyncManifestApplier, poll_interval_sec
+from series import Series
+
+# Async counterpart of the session and parallel runners in suite.py. Settings like namespace, time_scale or
+# prometheus_port are read from suite at call time, so run scripts configure both runners the same way.
+ready_timeout_sec = 90
+request_timeout_sec = 30
+test_timeout_sec = None
+
+
+def is_rolled_out(deployment):
+  desired = deployment.spec.replicas if deployment.spec.replicas is not None else 1
+  status = deployment.status or client.V1DeploymentStatus()
+  return (status.observed_generation or 0) >= (deployment.metadata.generation or 0) and \
+    (status.updated_replicas or 0) == desired and (status.replicas or 0) == desired and \
+    (status.available_replicas or 0) == desired
+
+
+@timing.timed('readiness')
+async def wait_rolled_out(api_client, target_namespace, names=None, timeout_sec=ready_timeout_sec):
+  # Replaces `kubectl wait pods --all` and `kubectl rollout status`: a Deployment counts as ready once its current
+  # generation is available and no pods of older ReplicaSets are left.
+  apps_api = client.AppsV1Api(api_client)
+  pending = None
+
+  async def poll():
+    nonlocal pending
+    while True:
+      deployments = [deployment for deployment in (await apps_api.list_namespaced_deployment(target_namespace)).items
+                     if names is None or deployment.metadata.name in names]
+      pending = [deployment.metadata.name for deployment in deployments if not is_rolled_out(deployment)]
+      if not pending and (names is None or len(deployments) == len(names)):
+        return True
+      await asyncio.sleep(poll_interval_sec)
+
+  try:
+    return await asyncio.wait_for(poll(), timeout_sec)
+  except asyncio.TimeoutError:
+    print(f'Timed out waiting for {", ".join(pending or [])} in namespace {target_namespace}')
+    return False
+
+
+class PortForward:
+  def __init__(self, service, port, target_namespace):
+    self.command = ['kubectl', 'port-forward', service, f'{port}:{port}', '-n', target_namespace]
+    self.process = None
+
+  async def start(self):
+    self.process = await asyncio.create_subprocess_exec(*self.command, stdout=subprocess.DEVNULL,
+                                                        stderr=subprocess.DEVNULL)
+    return self
+
+  async def stop(self):
+    if self.process is not None and self.process.returncode is None:
+      self.process.kill()
+      await self.process.wait()
+
+
+@timing.timed('prometheus connection')
+async def connect_prometheus():
+  if suite.prometheus_stand_in:
+    return await asyncio.to_thread(suite.start_prometheus_stand_in)
+  return await PortForward('service/prometheus-kube-prometheus-prometheus', suite.prometheus_port, 'monitoring').start()
+
+
+@timing.timed('test data connection')
+async def connect_test_data():
+  return await PortForward('service/demo-cpu-load-metric-controller', suite.test_data_port, suite.namespace).start()
+
+
+async def disconnect(connection):
+  if isinstance(connection, FakePrometheus):
+    await asyncio.to_thread(connection.stop)
+  elif connection is not None:
+    await connection.stop()
+
+
+class PrometheusProbe:
+  def __init__(self, http, metric):
+    self.http = http
+    self.url = f'http://localhost:{suite.prometheus_port}/api/v1/query'
+    self.params = {
+      'query': metric
+    }
+
+  async def __call__(self):
+    async with self.http.get(self.url, params=self.params) as response:
+      response.raise_for_status()
+      result = await response.json()
+    return int(float(result['data']['result'][0]['value'][1]) * 1000)
+
+
+class TestDataProbe:
+  def __init__(self, http, test_namespace):
+    self.http = http
+    self.url = f'http://localhost:{suite.test_data_port}/test-data'
+    self.params = {
+      'namespace': test_namespace,
+      'since': -1,
+      'timeoutMs': suite.test_data_long_poll_ms
+    }
+    self.timeout = aiohttp.ClientTimeout(total=suite.test_data_long_poll_ms / 1000 + request_timeout_sec)
+
+  async def is_available(self):
+    params = {**self.params, 'timeoutMs': 0}
+    for _ in range(suite.test_data_connect_attempts):
+      try:
+        async with self.http.get(self.url, params=params) as response:
+          return response.status in (200, 204)
+      except aiohttp.ClientConnectionError:
+        await asyncio.sleep(suite.poll_interval_min_sec)
+    return False
+
+  async def __call__(self):
+    async with self.http.get(self.url, params=self.params, timeout=self.timeout) as response:
+      response.raise_for_status()
+      if response.status == 204:
+        raise IndexError('No test data has been emitted yet')
+      progress = await response.json()
+    self.params['since'] = progress['seq']
+    return progress['value']
+
+
+async def poll_until(probe, value, min_interval_sec):
+  max_interval_sec = suite.scaled_sec(suite.poll_interval_max_sec)
+  interval = min_interval_sec
+  current = None
+  error_counter = 0
+  while True:
+    try:
+      previous, current = current, await probe()
+      if current == value:
+        print(f'Desired CPU load {value} reached.')
+        return True
+      if current != previous:
+        print(f'Current CPU load: {current}')
+        interval = min_interval_sec
+      else:
+        interval = min(interval * 2, max_interval_sec)
+      error_counter = 0
+    except IndexError:
+      interval = max_interval_sec
+    except Exception as e:
+      error_counter += 1
+      print(f'Error count: {error_counter}')
+      print(e)
+      if error_counter >= suite.max_wait_errors:
+        print('Max error count reached. Exiting.')
+        return False
+      interval = max_interval_sec
+    if interval > 0:
+      await asyncio.sleep(interval)
+
+
+async def wait_until(probe, value, timeout_sec=None, min_interval_sec=None):
+  timeout_sec = suite.wait_timeout_sec if timeout_sec is None else timeout_sec
+  min_interval_sec = suite.poll_interval_min_sec if min_interval_sec is None else min_interval_sec
+  try:
+    return await asyncio.wait_for(poll_until(probe, value, suite.scaled_sec(min_interval_sec)),
+                                  None if timeout_sec is None else suite.scaled_sec(timeout_sec))
+  except asyncio.TimeoutError:
+    print(f'Deadline reached before CPU load {value}.')
+    return False
+
+
+def record_result(tested, data, start, end, scaling_actions, series, latencies):
+  # Runs in a worker thread, so that rendering and storing a result overlaps with the next test.
+  logical_end, logical_actions = suite.logical_time(end, start), suite.logical_scaling_actions(scaling_actions, start)
+  if suite.record_archives:
+    suite.record_test_result(tested, start, logical_end, logical_actions, *series)
+  lags = suite.get_strategy_lags(data, start, scaling_actions)
+  suite.record_decision_latencies(tested, latencies, lags)
+  suite.plot_test_figure(tested, *series, latencies, lags)
+  if suite.store_results:
+    suite.store_test_result(tested, data, start, logical_end, logical_actions, series)
+
+
+class Orchestrator:
+  def __init__(self, data):
+    self.data = data
+    self.api_client = None
+    self.applier = None
+    self.http = None
+    self.queries = asyncio.Semaphore(suite.max_queries_in_flight)
+    self.proxy = None
+    self.test_data_proxy = None
+    self.results = set()
+
+  async def __aenter__(self):
+    configuration = client.Configuration()
+    await config.load_kube_config(client_configuration=configuration)
+    self.api_client = client.ApiClient(configuration)
+    self.applier = await AsyncManifestApplier(self.api_client).open()
+    self.http = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=request_timeout_sec),
+                                      connector=aiohttp.TCPConnector(limit=suite.prometheus_max_connections))
+    return self
+
+  async def __aexit__(self, exc_type, exc_value, traceback):
+    try:
+      if self.results:
+        await asyncio.gather(*self.results)
+    finally:
+      await asyncio.gather(disconnect(self.proxy), disconnect(self.test_data_proxy), return_exceptions=True)
+      await self.http.close()
+      await self.api_client.close()
+
+  @timing.timed('setup')
+  async def start_polaris(self):
+    print("Starting Polaris session...")
+    # The Prometheus connection does not depend on Polaris, so it is set up while the controllers roll out.
+    _, self.proxy = await asyncio.gather(self.setup_polaris(), connect_prometheus())
+    await asyncio.gather(
+      self.applier.delete_custom_resources(suite.abs_path(suite.lib_crds), suite.namespace),
+      self.connect_test_data()
+    )
+
+  @timing.timed('teardown')
+  async def stop_polaris(self):
+    print("Tearing down Polaris session...")
+    await self.applier.delete(suite.abs_path(suite.lib_crds) + suite.abs_path(suite.apps))
+    await self.cleanup_prometheus()
+
+  async def setup_polaris(self):
+    if suite.cpu_trace_path is None:
+      await self.applier.delete_documents([suite.trace_document()], wait=False)
+    await self.applier.apply(suite.abs_path(suite.lib_crds) + suite.abs_path(suite.apps),
+                             env=suite.controller_env(self.data), time_scale=suite.time_scale,
+                             documents=suite.polaris_documents(self.data))
+    await wait_rolled_out(self.api_client, suite.namespace)
+
+  async def connect_test_data(self):
+    await disconnect(self.test_data_proxy)
+    self.test_data_proxy = await connect_test_data()
+
+  @timing.timed('reset test data')
+  async def reset_test_data(self, data):
+    url = f'http://localhost:{suite.test_data_port}/test-data/reset'
+    await self.applier.apply_documents([suite.test_data_document(data)])
+    profile = profiles.encode_profile(data)
+    for _ in range(suite.test_data_connect_attempts):
+      try:
+        async with self.http.post(url, data=profile, headers={'Content-Type': 'application/octet-stream'}) as response:
+          if response.status == 204:
+            return
+          print(f'Test data reset failed with status code: {response.status}')
+          break
+      except aiohttp.ClientConnectionError:
+        await asyncio.sleep(suite.poll_interval_min_sec)
+    print('Test data endpoint not available, restarting the metric controller instead...')
+    deployment = 'demo-cpu-load-metric-controller'
+    await self.applier.set_env(deployment, suite.test_data_env(data)[deployment], suite.namespace, restart=True)
+    await wait_rolled_out(self.api_client, suite.namespace, [deployment])
+    await self.connect_test_data()
+
+  async def query_range(self, promql_query, start, end, step):
+    url = f'http://localhost:{suite.prometheus_port}/api/v1/query_range'
+    params = {
+      'query': promql_query,
+      'start': start,
+      'end': end,
+      'step': step
+    }
+    async with self.queries:
+      with timing.span('query', query=promql_query, start=start, end=end):
+        async with self.http.get(url, params=params) as response:
+          response.raise_for_status()
+          return suite.extract_window_result(await response.json())
+
+  async def query_series(self, promql_query, start, end):
+    step = suite.scaled_sec(suite.query_step)
+    windows = await asyncio.gather(*[self.query_range(promql_query, window_start, window_end, step)
+                                     for window_start, window_end in suite.query_windows(start, end, step)])
+    return Series.concat([Series.from_samples(samples, start, suite.time_scale) for samples in windows])
+
+  @timing.timed('fetch series')
+  async def fetch_test_series(self, tested, start, end):
+    deployment = tested.deployment
+    ns = suite.namespace_matcher('namespace', tested.namespace)
+    limits = f'min(kube_pod_container_resource_limits{{pod=~"{deployment}.*"{ns}}})'
+    replicas = f'kube_deployment_spec_replicas{{deployment="{deployment}"{ns}}}'
+    return await asyncio.gather(
+      self.query_series(suite.composed_metric_selector(suite.cpu_usage_metric, tested.namespace), start, end),
+      self.query_series(f'{limits} * min({replicas})', start, end),
+      self.query_series(limits, start, end),
+      self.query_series(replicas, start, end)
+    )
+
+  async def fetch_decision_latencies(self, tested, start, end):
+    url = f'http://localhost:{suite.prometheus_port}/api/v1/query'
+    params = {'query': latency.latency_query(end - start, tested.namespace), 'time': end}
+    async with self.queries:
+      with timing.span('query', query=params['query'], time=end):
+        async with self.http.get(url, params=params) as response:
+          if response.status != 200:
+            print(f'Decision latency query failed with status code: {response.status}')
+            return {}
+          return latency.histograms_from_vector((await response.json())['data']['result'])
+
+  @timing.timed('cleanup')
+  async def cleanup_prometheus(self, target_namespace=None):
+    url = f'http://localhost:{suite.prometheus_port}/api/v1/admin/tsdb/delete_series'
+
+    async def delete_series(metric):
+      async with self.http.post(url, params={'match[]': metric}) as response:
+        if response.status != 204:
+          print(f"Prometheus cleanup failed with status code: {response.status}")
+
+    ns = '' if target_namespace is None else f'{{namespace="{target_namespace}"}}'
+    await asyncio.gather(
+      delete_series(suite.composed_metric_selector(suite.cpu_usage_metric, target_namespace)),
+      delete_series(suite.composed_metric_selector(suite.cpu_load_metric, target_namespace)),
+      delete_series(f'kube_deployment_spec_replicas{ns}'),
+      delete_series(f'kube_pod_container_resource_limits{ns}')
+    )
+
+  @timing.timed('wait for load')
+  async def wait_for_value(self, value, target_namespace=None):
+    if suite.watch_test_data:
+      probe = TestDataProbe(self.http, target_namespace or suite.namespace)
+      if await probe.is_available():
+        return await wait_until(probe, value, min_interval_sec=0)
+      print('Test data endpoint not available, polling Prometheus instead.')
+    metric = suite.composed_metric_selector(suite.cpu_load_metric, target_namespace)
+    return await wait_until(PrometheusProbe(self.http, metric), value)
+
+  @timing.timed('observe load')
+  async def observe_load(self, data, target_namespace=None):
+    informer = AsyncStrategyInformer(self.api_client, target_namespace or suite.namespace).start()
+    try:
+      await self.wait_for_value(data[-1], target_namespace)
+    finally:
+      await informer.stop()
+    return informer.scaling_actions()
+
+  @timing.timed('execute')
+  async def execute_test(self, tested, data):
+    print('Starting to track metrics...')
+    await self.wait_for_value(data[0], tested.namespace)
+    start = suite.unix_timestamp()
+    scaling_actions = await self.observe_load(data, tested.namespace)
+    end = suite.unix_timestamp()
+    series, latencies = await asyncio.gather(self.fetch_test_series(tested, start, end),
+                                             self.fetch_decision_latencies(tested, start, end))
+    task = asyncio.create_task(self.record_result(tested, data, start, end, scaling_actions, series, latencies))
+    self.results.add(task)
+    task.add_done_callback(self.results.discard)
+
+  @timing.timed('record results')
+  async def record_result(self, tested, *result):
+    try:
+      await asyncio.to_thread(record_result, tested, *result)
+    except Exception as e:
+      print(f'Exception on recording {tested.name}: {e}')
+
+  @timing.timed('clean test state')
+  async def clean_test_state(self, test, target_namespace=None):
+    try:
+      await asyncio.gather(
+        self.applier.delete(test.yamls, target_namespace, propagation='Foreground'),
+        self.applier.delete_custom_resources(suite.abs_path(suite.lib_crds), target_namespace or suite.namespace)
+      )
+    finally:
+      # Series are only deleted once nothing reports them anymore.
+      await self.cleanup_prometheus(target_namespace)
+
+  async def run(self, test, data=None):
+    with timing.span('test', name=test.name):
+      data = data or self.data
+      print(f'Starting test {test.name}...')
+      try:
+        await self.reset_test_data(data)
+        await self.applier.apply(test.yamls, time_scale=suite.time_scale)
+        await wait_rolled_out(self.api_client, suite.namespace)
+        await asyncio.wait_for(self.execute_test(test, data), test_timeout_sec)
+      finally:
+        print("Cleaning up test resources...")
+        await self.clean_test_state(test)
+
+  async def run_isolated(self, test, data):
+    with timing.span('test', name=test.name):
+      print(f'Starting test {test.name} in namespace {test.namespace}...')
+      try:
+        await self.applier.apply_documents([suite.namespace_manifest(test.namespace)])
+        await self.applier.apply(test.yamls, test.namespace, time_scale=suite.time_scale)
+        await wait_rolled_out(self.api_client, test.namespace)
+        await asyncio.wait_for(self.execute_test(test, data), test_timeout_sec)
+      finally:
+        print(f'Cleaning up namespace {test.namespace}...')
+        try:
+          await self.applier.delete(test.yamls, test.namespace)
+        finally:
+          await self.applier.delete_documents([suite.namespace_manifest(test.namespace)], wait=False)
+          await self.cleanup_prometheus(test.namespace)
+
+  async def cluster_cpu_millis(self):
+    nodes = (await client.CoreV1Api(self.api_client).list_node()).items
+    return sum(suite.parse_cpu_millis(node.status.allocatable['cpu']) for node in nodes)
+
+  async def parallel_capacity(self, tests):
+    available = await self.cluster_cpu_millis() - suite.polaris_reserved_cpu_millis
+    footprint = max(suite.test_cpu_millis(tested) for tested in tests)
+    return max(1, min(len(tests), available // footprint))
+
+
+async def run_session_async(slo_tests, data):
+  with suite.timing_session():
+    await run_session_tests(slo_tests, data)
+
+
+async def run_session_tests(slo_tests, data):
+  async with Orchestrator(data) as orchestrator:
+    try:
+      await orchestrator.start_polaris()
+      for slo_test in slo_tests:
+        try:
+          await orchestrator.run(slo_test, data)
+        except asyncio.TimeoutError:
+          print(f'Test {slo_test.name} timed out.')
+        except Exception as e:
+          print(f'Exception on test {slo_test.name}: {e}')
+    finally:
+      await orchestrator.stop_polaris()
+
+
+async def run_parallel_async(slo_tests, data, max_parallel=None):
+  with suite.timing_session():
+    await run_parallel_tests(slo_tests, data, max_parallel)
+
+
+async def run_parallel_tests(slo_tests, data, max_parallel=None):
+  for tested in slo_tests:
+    if tested.namespace is None:
+      tested.namespace = suite.isolated_namespace(tested)
+
+  async with Orchestrator(data) as orchestrator:
+    try:
+      await orchestrator.start_polaris()
+      limit = max_parallel or suite.max_parallel_tests or await orchestrator.parallel_capacity(slo_tests)
+      print(f'Running {len(slo_tests)} tests with up to {limit} in parallel...')
+      slots = asyncio.Semaphore(limit)
+
+      async def run_isolated(tested):
+        async with slots:
+          try:
+            await orchestrator.run_isolated(tested, data)
+          except asyncio.TimeoutError:
+            print(f'Test {tested.name} timed out.')
+          except Exception as e:
+            print(f'Exception on test {tested.name}: {e}')
+
+      await asyncio.gather(*[run_isolated(tested) for tested in slo_tests])
+    finally:
+      await orchestrator.stop_polaris()
+
+
+def run_session(slo_tests, data):
+  try:
+    asyncio.run(run_session_async(slo_tests, data))
+  except Exception as e:
+    print(f'Exception on test session: {e}')
+
+
+def run_parallel(slo_tests, data, max_parallel=None):
+  try:
+    asyncio.run(run_parallel_async(slo_tests, data, max_parallel))
+  except Exception as e:
+    print(f'Exception on parallel tests: {e}')
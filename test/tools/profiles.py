@@ -0,0 +1,116 @@
+import mmap
+import struct
+
+import numpy as np
+
+# Each value of a profile is a CPU load in millis that is held for one load step.
+load_step_sec = 45
+# One day of load steps, the default period of diurnal().
+day_steps = 24 * 3600 // load_step_sec
+
+profile_magic = b'PSLP'
+profile_version = 1
+preamble_format = '<4sHBxIi'
+value_widths = [1, 2, 4]
+
+linear = [499, 499, 600, 700, 800, 900, 1000, 1100, 1200, 1300, 1400, 1500, 1400, 1300, 1200, 1100, 1000, 900, 800,
+          700, 600, 501]
+
+linear_slow = [499, 499, 550, 605, 665, 722, 800, 880, 970, 1060, 1220, 1330, 1220, 1100, 1000, 900, 820, 760, 700,
+               650, 600, 550, 500, 498]
+
+sudden_load = [499, 499, 550, 450, 400, 800, 880, 700, 660, 1500, 1520, 1510, 500, 480, 520, 450, 400, 360, 300, 600,
+               550, 500, 470, 519]
+
+base_profiles = {
+  'linear': linear,
+  'linear_slow': linear_slow,
+  'sudden_load': sudden_load
+}
+
+
+def profile_name(data):
+  for name, profile in base_profiles.items():
+    if list(data) == profile:
+      return name
+  return None
+
+
+def ramp(start, end, steps):
+  return np.rint(np.linspace(start, end, steps)).astype(np.int64).tolist()
+
+
+def hold(levels, steps=1):
+  return np.repeat(np.asarray(levels, dtype=np.int64), steps).tolist()
+
+
+def bursts(base, peak, length, period, width=1, offset=0):
+  index = np.arange(length) - offset
+  return np.where((index >= 0) & (index % period < width), peak, base).astype(np.int64).tolist()
+
+
+def diurnal(low, high, length, period=day_steps, phase=0.0, noise=0.0, seed=None):
+  # A cosine between low and high that starts at low for phase 0, with optional Gaussian noise relative to the span.
+  curve = low + (high - low) * (1 - np.cos(2 * np.pi * (np.arange(length) / period + phase))) / 2
+  if noise > 0:
+    curve += np.random.default_rng(seed).normal(0, noise * (high - low), length)
+  return np.rint(np.clip(curve, 0, None)).astype(np.int64).tolist()
+
+
+def replay(timestamps, values, step_sec=load_step_sec, low=None, high=None):
+  # Resamples a recorded trace to one mean value per load step, carrying the last value over empty steps, and
+  # optionally rescales it to [low, high].
+  timestamps = np.asarray(timestamps, dtype=np.float64)
+  values = np.asarray(values, dtype=np.float64)
+  if len(values) == 0:
+    return []
+  bins = ((timestamps - timestamps.min()) // step_sec).astype(np.int64)
+  counts = np.bincount(bins)
+  sums = np.bincount(bins, weights=values)
+  filled = np.maximum.accumulate(np.where(counts > 0, np.arange(len(counts)), 0))
+  resampled = (sums / np.maximum(counts, 1))[filled]
+  if low is not None and high is not None:
+    span = resampled.max() - resampled.min()
+    resampled = low + (resampled - resampled.min()) / span * (high - low) if span > 0 else np.full(len(resampled), low)
+  return np.rint(resampled).astype(np.int64).tolist()
+
+
+def replay_csv(path, step_sec=load_step_sec, low=None, high=None, time_column=0, value_column=1, skip_header=1):
+  trace = np.loadtxt(path, delimiter=',', usecols=(time_column, value_column), skiprows=skip_header, ndmin=2)
+  return replay(trace[:, 0], trace[:, 1], step_sec, low, high)
+
+
+def compact_values(values):
+  # The offsets from the minimum in the narrowest unsigned integer that fits them.
+  values = np.rint(np.asarray(values, dtype=np.float64)).astype(np.int64)
+  base = int(values.min()) if len(values) > 0 else 0
+  offsets = values - base
+  width = next((width for width in value_widths if offsets.max(initial=0) < 1 << (8 * width)), None)
+  if width is None or not np.iinfo(np.int32).min <= base <= np.iinfo(np.int32).max:
+    raise ValueError('Profile values do not fit into a 32 bit range')
+  return base, width, offsets.astype(f'<u{width}')
+
+
+def encode_profile(profile):
+  # The compact offsets keep profiles with 10^5 values well below the 1 MiB ConfigMap limit.
+  base, width, offsets = compact_values(profile)
+  return struct.pack(preamble_format, profile_magic, profile_version, width, len(offsets), base) + offsets.tobytes()
+
+
+def decode_profile(buffer):
+  magic, version, width, count, base = struct.unpack_from(preamble_format, buffer)
+  if magic != profile_magic or version != profile_version or width not in value_widths:
+    raise ValueError(f'Not a version {profile_version} load profile')
+  offsets = np.frombuffer(buffer, np.dtype(f'<u{width}'), count, struct.calcsize(preamble_format))
+  return offsets.astype(np.int64) + base
+
+
+def write_profile(path, profile):
+  with open(path, 'wb') as file:
+    file.write(encode_profile(profile))
+
+
+def read_profile(path):
+  with open(path, 'rb') as file:
+    buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+  return decode_profile(buffer).tolist()
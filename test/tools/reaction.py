@@ -0,0 +1,120 @@
+import numpy as np
+
+import scoring
+import simulator
+
+stages = ['detection', 'decision', 'actuation', 'total']
+report_fields = ['strategy', 'stage', 'steps', 'count', 'p50_sec', 'p95_sec', 'max_sec']
+# The recorded series in which an action of a strategy becomes visible.
+actuation_series = {
+  'horizontalelasticitystrategies': 'pod_count',
+  'verticalelasticitystrategies': 'container_req'
+}
+default_actuation_series = 'cpu_req'
+
+
+def change_times(series):
+  valid = ~np.isnan(series.values)
+  times, values = series.times[valid], series.values[valid]
+  return times[1:][values[1:] != values[:-1]].astype(np.float64)
+
+
+def detection_times(cpu_usage, starts, ends, band=scoring.settling_band):
+  # The usage has picked up a load step once it leaves the band around its last value before the step. Every sample
+  # is compared with the level before its own step, so the first out-of-band sample per step is found in one pass.
+  detected = np.full(len(starts), np.nan)
+  valid = ~np.isnan(cpu_usage.values)
+  times, values = cpu_usage.times[valid].astype(np.float64), cpu_usage.values[valid]
+  if len(times) == 0 or len(starts) == 0:
+    return detected
+  before = np.searchsorted(times, starts, side='left') - 1
+  levels = np.where(before >= 0, values[np.maximum(before, 0)], np.nan)
+  steps = np.searchsorted(starts, times, side='right') - 1
+  in_step = (steps >= 0) & (times < ends[np.maximum(steps, 0)])
+  out_of_band = in_step & (np.abs(values - levels[np.maximum(steps, 0)]) > band)
+  detected_steps, first = np.unique(steps[out_of_band], return_index=True)
+  detected[detected_steps] = times[out_of_band][first]
+  return detected
+
+
+def load_steps(load_profile, duration, step_sec=simulator.load_step_sec):
+  # The initial load is reached before a test starts, so only the later changes are steps the system has to react to.
+  loads = np.asarray(load_profile, dtype=np.float64)
+  starts = (np.nonzero(loads[1:] != loads[:-1])[0] + 1) * float(step_sec)
+  starts = starts[starts < duration]
+  return starts, np.append(starts[1:], float(duration))
+
+
+def first_in_window(events, lower, upper):
+  # Interval join: the first event at or after each lower bound, if it lies before the matching upper bound.
+  # NaN lower bounds sort past the end of the events, so they stay unmatched.
+  padded = np.append(events, np.inf)
+  found = padded[np.searchsorted(events, lower, side='left')]
+  return np.where(found < upper, found, np.nan)
+
+
+def step_reactions(cpu_usage, series, scaling_actions, load_profile, duration, step_sec=simulator.load_step_sec,
+                   band=scoring.settling_band):
+  # Times are relative to the test start. The detection is the first sample after a load step at which the average
+  # CPU usage left the settling band around its level before the step, the decision is the first strategy CRD event
+  # after the detection and the actuation is the first change of the strategy's resource series after the decision,
+  # all within the same load step.
+  starts, ends = load_steps(load_profile, duration, step_sec)
+  detected = detection_times(cpu_usage, starts, ends, band)
+  reactions = {}
+  for plural in sorted(set(actuation_series) | set(scaling_actions)):
+    actions = np.sort(np.asarray(scaling_actions.get(plural, []), dtype=np.float64))
+    decided = first_in_window(actions, detected, ends)
+    actuated = first_in_window(change_times(series[actuation_series.get(plural, default_actuation_series)]), decided,
+                               ends)
+    reactions[plural] = {
+      'detection': detected - starts,
+      'decision': decided - detected,
+      'actuation': actuated - decided,
+      'total': actuated - starts
+    }
+  return starts, reactions
+
+
+def archive_reactions(recorded, step_sec=simulator.load_step_sec):
+  start = recorded.metadata['start']
+  actions = {plural: np.asarray(timestamps, dtype=np.float64) - start
+             for plural, timestamps in recorded.scaling_actions.items()}
+  return step_reactions(recorded.series['cpu_usage'], recorded.series, actions, recorded.metadata['load_profile'],
+                        recorded.metadata['end'] - start, step_sec)
+
+
+def merge_reactions(per_run):
+  merged = {}
+  for reactions in per_run:
+    for plural, latencies in reactions.items():
+      for stage, values in latencies.items():
+        merged.setdefault(plural, {}).setdefault(stage, []).append(values)
+  return {plural: {stage: np.concatenate(parts) for stage, parts in latencies.items()}
+          for plural, latencies in merged.items()}
+
+
+def distribution(plural, stage, values):
+  reacted = values[~np.isnan(values)]
+  return {
+    'strategy': plural,
+    'stage': stage,
+    'steps': len(values),
+    'count': len(reacted),
+    'p50_sec': np.percentile(reacted, 50) if len(reacted) > 0 else np.nan,
+    'p95_sec': np.percentile(reacted, 95) if len(reacted) > 0 else np.nan,
+    'max_sec': reacted.max() if len(reacted) > 0 else np.nan
+  }
+
+
+def report(reactions):
+  return [distribution(plural, stage, reactions[plural][stage]) for plural in sorted(reactions) for stage in stages]
+
+
+def analyze_archives(archives, step_sec=simulator.load_step_sec):
+  return merge_reactions([archive_reactions(recorded, step_sec)[1] for recorded in archives])
+
+
+def analyze_store(result_store, step_sec=simulator.load_step_sec, **filters):
+  runs = result_store.find(**filters)
+  return runs, analyze_archives([result_store.load(run) for run in runs], step_sec)
@@ -0,0 +1,21 @@
+import sys
+import time
+
+import profiles
+import render
+
+# Re-renders the test figures of the archives that runs record with record_archives = True in suite.py, and the
+# cpu-load.png of each load profile. The committed figures in test/results predate the archives, so only their
+# cpu-load.png can be regenerated.
+archive_root = sys.argv[1] if len(sys.argv) > 1 else './result'
+output_root = sys.argv[2] if len(sys.argv) > 2 else archive_root
+
+result_profiles = {**profiles.base_profiles, 'priority': profiles.linear}
+
+start = time.time()
+archive_jobs = render.archive_jobs(archive_root, output_root)
+if not archive_jobs:
+  print(f'No test archives found in {archive_root}, rendering the load figures only')
+jobs = archive_jobs + render.load_jobs(result_profiles, output_root)
+rendered = render.render_all(jobs)
+print(f'Rendered {len(rendered)} of {len(jobs)} figures in {time.time() - start:.1f} s')
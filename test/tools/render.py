@@ -0,0 +1,150 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import archive
+from series import as_series
+
+figure_size = (8, 6)
+latency_panel_width = 4
+figure_dpi = 200
+target_cpu_usage = 50
+load_step_sec = 45
+max_workers = None
+
+
+def new_figure(nrows=1):
+  fig = Figure(figsize=figure_size)
+  FigureCanvasAgg(fig)
+  axs = fig.subplots(nrows=nrows, ncols=1, sharex=True)
+  return fig, np.atleast_1d(axs)
+
+
+def new_test_figure(with_latencies):
+  if not with_latencies:
+    fig, axs = new_figure(nrows=4)
+    return fig, axs, None
+  # The four time series stay stacked on the left, the latency distributions get a panel of their own on the right.
+  fig = Figure(figsize=(figure_size[0] + latency_panel_width, figure_size[1]))
+  FigureCanvasAgg(fig)
+  grid = fig.add_gridspec(4, 2, width_ratios=(figure_size[0], latency_panel_width))
+  axs = [fig.add_subplot(grid[0, 0])]
+  axs += [fig.add_subplot(grid[row, 0], sharex=axs[0]) for row in range(1, 4)]
+  for ax in axs[:-1]:
+    ax.tick_params(labelbottom=False)
+  return fig, np.array(axs), fig.add_subplot(grid[:, 1])
+
+
+def save_figure(fig, path):
+  directory = os.path.dirname(path)
+  if directory:
+    os.makedirs(directory, exist_ok=True)
+  fig.tight_layout()
+  fig.savefig(path, dpi=figure_dpi)
+
+
+def plot_samples(axs, samples, label, title, y_label):
+  series = as_series(samples)
+  if label is not None:
+    axs.plot(series.times, series.values, label=label)
+  else:
+    axs.plot(series.times, series.values)
+  axs.tick_params(axis='x', labelsize=8)
+  axs.tick_params(axis='y', labelsize=8)
+  axs.set_title(title, fontsize=10)
+  axs.set_ylabel(y_label, fontsize=8)
+
+
+def plot_latencies(ax, latencies, lags):
+  for stage, histogram in (latencies or {}).items():
+    bounds, fractions = histogram.cdf()
+    ax.plot(bounds * 1000, fractions, marker='.', markersize=3,
+            label=f'{stage.replace("_", " ")} (p95 {histogram.quantile(0.95) * 1000:.0f} ms)')
+  if lags is not None and len(lags) > 0:
+    ax.step(np.sort(lags) * 1000, np.arange(1, len(lags) + 1) / len(lags), where='post', linestyle='dashed',
+            color='black', label=f'load to strategy (p50 {np.percentile(lags, 50):.0f} s)')
+  ax.set_xscale('log')
+  ax.set_ylim(0, 1.05)
+  ax.tick_params(axis='x', labelsize=8)
+  ax.tick_params(axis='y', labelsize=8)
+  ax.set_title('Decision Latency', fontsize=10)
+  ax.set_xlabel('Latency (ms)', fontsize=8)
+  ax.set_ylabel('Fraction of Decisions', fontsize=8)
+  ax.legend(fontsize=5)
+  ax.grid(linewidth=0.2, which='both')
+
+
+def render_test_figure(path, title, cpu_usage, cpu_req, container_req, pod_count, target=target_cpu_usage,
+                       latencies=None, lags=None):
+  fig, axs, latency_ax = new_test_figure(bool(latencies) or (lags is not None and len(lags) > 0))
+  plot_samples(axs[0], cpu_usage, 'Actual', 'Average CPU Usage Across All Replicas', 'Percent')
+  plot_samples(axs[0], as_series(cpu_usage).constant(target), 'Target', 'Average CPU Usage Across All Replicas',
+               'Percent')
+
+  plot_samples(axs[1], cpu_req, None, 'Workload CPU Request', 'CPU Cores')
+  plot_samples(axs[2], container_req, None, 'Pod CPU Request', "CPU Cores")
+  plot_samples(axs[3], pod_count, None, 'Workload Size', 'Instances')
+  axs[0].legend(fontsize=5, ncols=2)
+  axs[3].set_xlabel('Time (sec)', fontsize=8, loc='center')
+  if title is not None:
+    fig.suptitle(title)
+
+  for ax in axs:
+    ax.grid(linewidth=0.2)
+  if latency_ax is not None:
+    plot_latencies(latency_ax, latencies, lags)
+  save_figure(fig, path)
+
+
+def render_load_figure(path, data, step_sec=load_step_sec):
+  fig, axs = new_figure()
+  axs[0].tick_params(axis='x', labelsize=8)
+  axs[0].tick_params(axis='y', labelsize=8)
+  axs[0].set_ylabel('CPU Load (milli)', fontsize=8)
+  axs[0].set_xlabel('Time (sec)', fontsize=8, loc='center')
+  axs[0].grid(linewidth=0.2)
+  axs[0].step([index * step_sec for index in range(len(data))], data)
+  save_figure(fig, path)
+
+
+def render_archive(archive_path, path):
+  recorded = archive.read_archive(archive_path)
+  render_test_figure(path, recorded.metadata.get('title'), *[recorded.series[name] for name in archive.series_names])
+  return path
+
+
+def render_load(data, path):
+  render_load_figure(path, data)
+  return path
+
+
+def archive_jobs(archive_root, output_root):
+  jobs = []
+  for directory, _, files in os.walk(archive_root):
+    for file in sorted(files):
+      if file.endswith('.archive'):
+        relative = os.path.relpath(os.path.join(directory, file), archive_root)
+        output = os.path.join(output_root, os.path.splitext(relative)[0])
+        if not output.endswith('.png'):
+          output += '.png'
+        jobs.append((render_archive, os.path.join(directory, file), output))
+  return jobs
+
+
+def load_jobs(profiles, output_root, file_name='cpu-load.png'):
+  return [(render_load, data, os.path.join(output_root, name, file_name)) for name, data in profiles.items()]
+
+
+def render_all(jobs, workers=max_workers):
+  with ProcessPoolExecutor(max_workers=workers) as executor:
+    futures = [(job[1:], executor.submit(*job)) for job in jobs]
+    rendered = []
+    for args, future in futures:
+      try:
+        rendered.append(future.result())
+      except Exception as e:
+        print(f'Rendering {args[-1]} failed: {e}')
+    return rendered
@@ -0,0 +1,27 @@
+import sys
+
+import orchestrator
+import suite as test
+import traces
+
+if len(sys.argv) < 2:
+  print('Usage: python run-trace.py <file.trace> [duration_min]')
+  exit(1)
+
+test.cpu_trace_path = sys.argv[1]
+trace = traces.read_trace(test.cpu_trace_path)
+duration_sec = float(sys.argv[2]) * 60 if len(sys.argv) > 2 else len(trace) * trace.step_sec
+# The load values that the controller emits at every load step, which the tests wait for and record.
+data = trace.profile(test.load_step_ms / 1000, max(2, int(duration_sec * 1000 // test.load_step_ms)))
+
+workload_yaml = './../slo-mappings/base/resource-consumer.yaml'
+mapping_base_path = './../slo-mappings/base'
+
+orchestrator.run_parallel([
+  test.SloTest('Best Fit Decision', 'resource-consumer', [workload_yaml, f'{mapping_base_path}/best-fit.yaml'],
+               'trace-best-fit'),
+  test.SloTest('Horizontal Scaling', 'resource-consumer', [workload_yaml, f'{mapping_base_path}/horizontal.yaml'],
+               'trace-horizontal'),
+  test.SloTest('Vertical Scaling', 'resource-consumer', [workload_yaml, f'{mapping_base_path}/vertical.yaml'],
+               'trace-vertical')
+], data)
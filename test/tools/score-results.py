@@ -0,0 +1,16 @@
+import sys
+
+import scoring
+import suite as test
+from store import ResultStore
+
+ranking_metric = 'absolute_error_integral'
+
+filters = dict(argument.split('=', 1) for argument in sys.argv[1:])
+runs, scores = scoring.score_store(ResultStore(test.result_store_path), **filters)
+
+print('run  mapping      profile      ' + '  '.join(scoring.metric_names))
+for index in scoring.rank(scores, ranking_metric):
+  run = runs[index]
+  values = '  '.join(f'{scores[metric][index]:.1f}' for metric in scoring.metric_names)
+  print(f'{run["id"]:<4} {run["mapping"] or "-":<12} {run["profile"] or "-":<12} {values}')
@@ -0,0 +1,125 @@
+import numpy as np
+
+import simulator
+
+target_cpu_usage = 50
+sample_step_sec = 5
+settling_band = 10
+
+metric_names = [
+  'time_above_target_sec',
+  'time_below_target_sec',
+  'absolute_error_integral',
+  'overprovisioned_core_sec',
+  'mean_settling_sec',
+  'max_settling_sec',
+  'unsettled_steps',
+  'scaling_actions_per_min',
+  'horizontal_actions_per_min',
+  'vertical_actions_per_min'
+]
+
+
+def matrix_width(series_list, step):
+  return max([0] + [int(np.round(series.times.max() / step)) + 1 for series in series_list if len(series) > 0])
+
+
+def series_matrix(series_list, step, width):
+  indexes = [np.round(series.times / step).astype(np.int64) for series in series_list]
+  matrix = np.full((len(series_list), width), np.nan)
+  lengths = np.array([len(index) for index in indexes])
+  rows = np.repeat(np.arange(len(series_list)), lengths)
+  columns = np.concatenate(indexes) if indexes else np.empty(0, dtype=np.int64)
+  values = np.concatenate([series.values for series in series_list]) if series_list else np.empty(0)
+  valid = (columns >= 0) & (columns < width)
+  matrix[rows[valid], columns[valid]] = values[valid]
+  return matrix
+
+
+def load_segment_starts(load_profiles, times):
+  loads, lengths = simulator.load_matrix(load_profiles)
+  changes = np.zeros(loads.shape, dtype=bool)
+  changes[:, 1:] = loads[:, 1:] != loads[:, :-1]
+  step_index = np.maximum.accumulate(np.where(changes, np.arange(loads.shape[1]), 0), axis=1)
+  load_index = np.minimum(times[np.newaxis, :] // simulator.load_step_sec, (lengths - 1)[:, np.newaxis])
+  return np.take_along_axis(step_index, load_index, axis=1) * simulator.load_step_sec
+
+
+def settling_times(usage, times, segment_starts, target, band, step):
+  out_of_band = np.abs(usage - target) > band
+  # Within a segment, the running maximum of "end of the last out-of-band sample" is the time the usage settled.
+  marker = np.where(out_of_band, times + step, segment_starts)
+  settled_at = np.maximum.accumulate(marker, axis=1)
+
+  observed = ~np.isnan(usage)
+  last_observed = np.zeros(usage.shape, dtype=bool)
+  last_observed[:, :-1] = segment_starts[:, 1:] != segment_starts[:, :-1]
+  last_observed[:, -1] = True
+  segment_end = last_observed & observed & (segment_starts > 0)
+
+  rows = np.nonzero(segment_end)[0]
+  settling = (settled_at - segment_starts)[segment_end]
+  unsettled = out_of_band[segment_end]
+  count = len(usage)
+  steps = np.bincount(rows, minlength=count)
+  mean = np.bincount(rows, weights=settling, minlength=count) / np.maximum(steps, 1)
+  maximum = np.zeros(count)
+  np.maximum.at(maximum, rows, settling)
+  return np.where(steps > 0, mean, np.nan), np.where(steps > 0, maximum, np.nan), np.bincount(rows, unsettled, count).astype(np.int64)
+
+
+def actions_per_minute(scaling_actions, durations, plural=None):
+  counts = np.array([sum(len(timestamps) for name, timestamps in actions.items() if plural is None or name == plural)
+                     for actions in scaling_actions], dtype=np.float64)
+  return counts / (np.asarray(durations, dtype=np.float64) / 60)
+
+
+def score_runs(cpu_usage, cpu_req, scaling_actions, durations, load_profiles, target=target_cpu_usage,
+               step=sample_step_sec, band=settling_band):
+  width = max(matrix_width(cpu_usage, step), matrix_width(cpu_req, step))
+  usage = series_matrix(cpu_usage, step, width)
+  request = series_matrix(cpu_req, step, width)
+  times = np.arange(width) * step
+  error = usage - target
+
+  used_cores = usage / 100 * request
+  needed_cores = used_cores / (target / 100)
+  overprovisioned = np.clip(request - needed_cores, 0, None)
+
+  segment_starts = load_segment_starts(load_profiles, times)
+  mean_settling, max_settling, unsettled = settling_times(usage, times, segment_starts, target, band, step)
+
+  return {
+    'time_above_target_sec': (error > 0).sum(axis=1) * step,
+    'time_below_target_sec': (error < 0).sum(axis=1) * step,
+    'absolute_error_integral': np.nansum(np.abs(error), axis=1) * step,
+    'overprovisioned_core_sec': np.nansum(overprovisioned, axis=1) * step,
+    'mean_settling_sec': mean_settling,
+    'max_settling_sec': max_settling,
+    'unsettled_steps': unsettled,
+    'scaling_actions_per_min': actions_per_minute(scaling_actions, durations),
+    'horizontal_actions_per_min': actions_per_minute(scaling_actions, durations, 'horizontalelasticitystrategies'),
+    'vertical_actions_per_min': actions_per_minute(scaling_actions, durations, 'verticalelasticitystrategies')
+  }
+
+
+def score_archives(archives, target=target_cpu_usage, step=sample_step_sec, band=settling_band):
+  return score_runs(
+    [recorded.series['cpu_usage'] for recorded in archives],
+    [recorded.series['cpu_req'] for recorded in archives],
+    [recorded.scaling_actions for recorded in archives],
+    [recorded.metadata['end'] - recorded.metadata['start'] for recorded in archives],
+    [recorded.metadata['load_profile'] for recorded in archives],
+    target, step, band
+  )
+
+
+def score_store(result_store, target=target_cpu_usage, step=sample_step_sec, band=settling_band, **filters):
+  runs = result_store.find(**filters)
+  return runs, score_archives([result_store.load(run) for run in runs], target, step, band)
+
+
+def rank(scores, metric, descending=False):
+  values = scores[metric]
+  order = np.argsort(-values if descending else values, kind='stable')
+  return order[~np.isnan(values[order])]
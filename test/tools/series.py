@@ -0,0 +1,44 @@
+import numpy as np
+
+
+class Series:
+  def __init__(self, times, values):
+    self.times = np.asarray(times, dtype=np.int64)
+    self.values = np.asarray(values, dtype=np.float64)
+
+  def __len__(self):
+    return len(self.times)
+
+  @classmethod
+  def empty(cls):
+    return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+
+  @classmethod
+  def from_samples(cls, samples, start=0, time_scale=1):
+    count = len(samples)
+    times = np.fromiter((sample[0] for sample in samples), np.float64, count)
+    if start != 0 or time_scale != 1:
+      times = np.round((times - start) * time_scale)
+    values = np.fromiter((sample[1] for sample in samples), np.float64, count)
+    return cls(times.astype(np.int64), values)
+
+  @classmethod
+  def concat(cls, parts):
+    parts = [part for part in parts if len(part) > 0]
+    if not parts:
+      return cls.empty()
+    if len(parts) == 1:
+      return parts[0]
+    return cls(np.concatenate([part.times for part in parts]), np.concatenate([part.values for part in parts]))
+
+  def correct_time(self, start):
+    return Series(self.times - start, self.values)
+
+  def constant(self, value):
+    return Series(self.times, np.full(len(self.times), value, dtype=np.float64))
+
+
+def as_series(samples):
+  if isinstance(samples, Series):
+    return samples
+  return Series.from_samples(samples)
@@ -0,0 +1,29 @@
+import os
+
+import profiles
+import simulator
+import suite as test
+
+workload_yaml = './../slo-mappings/base/resource-consumer.yaml'
+mapping_base_path = './../slo-mappings/base'
+
+mappings = {
+  'best-fit': 'Best Fit Decision',
+  'horizontal': 'Horizontal Scaling',
+  'vertical': 'Vertical Scaling',
+  'random': 'Random Decision',
+  'round': 'Round Robin Decision',
+  'priority': 'Priority Decision',
+  'threshold': 'Threshold Decision'
+}
+
+names = list(profiles.base_profiles)
+for export_file, title in mappings.items():
+  model = simulator.MappingModel.from_yaml(f'{mapping_base_path}/{export_file}.yaml', workload_yaml)
+  result = simulator.simulate(model, [profiles.base_profiles[name] for name in names])
+  print(f'{title}: {result.api_calls_per_decision().mean():.2f} API server reads and '
+        f'{(result.metric_queries / result.decisions).mean():.2f} CPU load queries per decision')
+  for index, name in enumerate(names):
+    os.makedirs(f'./result/simulated/{name}', exist_ok=True)
+    tested = test.SloTest(title, 'resource-consumer', [], f'simulated/{name}/{export_file}', f'{title} (simulated)')
+    test.plot_test_figure(tested, *result.series(index))
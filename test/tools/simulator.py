@@ -0,0 +1,291 @@
+import numpy as np
+import yaml
+
+from series import Series
+
+horizontal_strategy = 'HorizontalElasticityStrategy'
+vertical_strategy = 'VerticalElasticityStrategy'
+strategy_kinds = [horizontal_strategy, vertical_strategy]
+
+load_step_sec = 45
+slo_interval_sec = 20
+sample_step_sec = 5
+compliance_tolerance = 0
+
+HORIZONTAL = 0
+VERTICAL = 1
+
+PRIMARY = 0
+SECONDARY = 1
+NO_STRATEGY = -1
+
+
+class StrategyConfig:
+  def __init__(self, min_replicas=1, max_replicas=np.inf, min_milli_cpu=0, max_milli_cpu=np.inf):
+    self.min_replicas = np.asarray(min_replicas, dtype=np.float64)
+    self.max_replicas = np.asarray(max_replicas, dtype=np.float64)
+    self.min_milli_cpu = np.asarray(min_milli_cpu, dtype=np.float64)
+    self.max_milli_cpu = np.asarray(max_milli_cpu, dtype=np.float64)
+
+  @classmethod
+  def from_spec(cls, spec):
+    spec = spec or {}
+    return cls(spec.get('minReplicas', 1), spec.get('maxReplicas', np.inf),
+               spec.get('minResources', {}).get('milliCpu', 0), spec.get('maxResources', {}).get('milliCpu', np.inf))
+
+
+class MappingModel:
+  def __init__(self, decision_logic=None, primary=horizontal_strategy, secondary=None, target_utilization=50,
+               config=None, logic_config=None, threshold=50, primary_days=(), secondary_days=(), day=0,
+               initial_replicas=1, initial_milli_cpu=1000):
+    self.decision_logic = decision_logic
+    self.primary = strategy_kinds.index(primary)
+    self.secondary = self.primary if secondary is None else strategy_kinds.index(secondary)
+    self.target_utilization = np.asarray(target_utilization, dtype=np.float64)
+    self.config = config or StrategyConfig()
+    self.logic_config = logic_config or self.config
+    self.threshold = np.asarray(threshold, dtype=np.float64)
+    self.primary_days = primary_days
+    self.secondary_days = secondary_days
+    self.day = day
+    self.initial_replicas = initial_replicas
+    self.initial_milli_cpu = initial_milli_cpu
+
+  @classmethod
+  def from_yaml(cls, mapping_path, workload_path=None, day=0):
+    with open(mapping_path) as file:
+      spec = yaml.safe_load(file)['spec']
+    logic = spec.get('elasticityDecisionLogic') or {}
+    secondary = spec.get('secondaryElasticityStrategy')
+    config = StrategyConfig.from_spec(spec.get('staticElasticityStrategyConfig'))
+    logic_config = StrategyConfig.from_spec(logic) if 'maxReplicas' in logic or 'maxResources' in logic else None
+    initial_replicas, initial_milli_cpu = 1, 1000
+    if workload_path is not None:
+      initial_replicas, initial_milli_cpu = read_workload(workload_path)
+    return cls(logic.get('kind'), spec['elasticityStrategy']['kind'], secondary['kind'] if secondary else None,
+               spec['sloConfig']['targetUtilizationPercentage'], config, logic_config, logic.get('threshold', 50),
+               logic.get('elasticityStrategyDay') or (), logic.get('secondaryElasticityStrategyDays') or (), day,
+               initial_replicas, initial_milli_cpu)
+
+
+def read_workload(workload_path):
+  with open(workload_path) as file:
+    spec = yaml.safe_load(file)['spec']
+  cpu = str(spec['template']['spec']['containers'][0]['resources']['limits']['cpu'])
+  milli_cpu = int(cpu[:-1]) if cpu.endswith('m') else int(float(cpu) * 1000)
+  return spec.get('replicas', 1), milli_cpu
+
+
+class SimulationResult:
+  def __init__(self, times, durations, cpu_usage, cpu_req, container_req, pod_count, scaling_actions, decisions,
+               api_calls, metric_queries):
+    self.times = times
+    self.durations = durations
+    self.cpu_usage = cpu_usage
+    self.cpu_req = cpu_req
+    self.container_req = container_req
+    self.pod_count = pod_count
+    self.scaling_actions = scaling_actions
+    self.decisions = decisions
+    self.api_calls = api_calls
+    self.metric_queries = metric_queries
+
+  def __len__(self):
+    return len(self.durations)
+
+  def api_calls_per_decision(self):
+    return self.api_calls / np.maximum(self.decisions, 1)
+
+  def series(self, index):
+    count = np.searchsorted(self.times, self.durations[index], side='right')
+    times = self.times[:count]
+    return [Series(times, values[index, :count])
+            for values in (self.cpu_usage, self.cpu_req, self.container_req, self.pod_count)]
+
+
+def load_matrix(profiles, lengths=None):
+  if isinstance(profiles, np.ndarray) and profiles.ndim == 2:
+    if lengths is None:
+      lengths = np.full(len(profiles), profiles.shape[1])
+    return profiles.astype(np.float64, copy=False), np.asarray(lengths)
+  lengths = np.array([len(profile) for profile in profiles])
+  loads = np.empty((len(profiles), lengths.max()), dtype=np.float64)
+  for row, profile in enumerate(profiles):
+    loads[row, :len(profile)] = profile
+    loads[row, len(profile):] = profile[-1]
+  return loads, lengths
+
+
+def utilization(load, replicas, milli_cpu):
+  return np.ceil(np.clip(load / (replicas * milli_cpu) * 100, 0, 100))
+
+
+def compliance_of(usage, target):
+  return np.ceil(usage / target * 100)
+
+
+def is_available(kind, scale_up, replicas, milli_cpu, config):
+  if kind == HORIZONTAL:
+    return np.where(scale_up, replicas < config.max_replicas, replicas > config.min_replicas)
+  return np.where(scale_up, milli_cpu < config.max_milli_cpu, milli_cpu > config.min_milli_cpu)
+
+
+def scaled_replicas(replicas, compliance, config):
+  return np.clip(np.ceil(replicas * compliance / 100), config.min_replicas, config.max_replicas)
+
+
+def scaled_milli_cpu(milli_cpu, compliance, config):
+  return np.clip(np.ceil(milli_cpu * compliance / 100), config.min_milli_cpu, config.max_milli_cpu)
+
+
+def future_compliance(model, kind, compliance, load, replicas, milli_cpu):
+  config = model.config
+  if kind == HORIZONTAL:
+    replicas = scaled_replicas(replicas, compliance, config)
+  else:
+    milli_cpu = np.clip(milli_cpu * compliance / 100, config.min_milli_cpu, config.max_milli_cpu)
+  return compliance_of(utilization(load, replicas, milli_cpu), model.target_utilization)
+
+
+def select_best_fit(model, compliance, load, replicas, milli_cpu):
+  scale_up = compliance > 100
+  kinds = (model.primary, model.secondary)
+  primary_available, secondary_available = (is_available(kind, scale_up, replicas, milli_cpu, model.config)
+                                            for kind in kinds)
+  first_available = np.where(primary_available, PRIMARY, np.where(secondary_available, SECONDARY, NO_STRATEGY))
+  single = ~(primary_available & secondary_available) & (first_available != NO_STRATEGY)
+  primary_diff, secondary_diff = (np.abs(future_compliance(model, kind, compliance, load, replicas, milli_cpu) - 100)
+                                  for kind in kinds)
+  best = np.where(secondary_diff < primary_diff, SECONDARY, PRIMARY)
+  return np.where(single, first_available, best)
+
+
+def select_priority(model, compliance, replicas, milli_cpu):
+  scale_up = compliance >= 100
+  config = model.logic_config
+  primary_available = is_available(model.primary, scale_up, replicas, milli_cpu, config)
+  secondary_available = is_available(model.secondary, scale_up, replicas, milli_cpu, config)
+  up_choice = np.where(primary_available, PRIMARY, np.where(secondary_available, SECONDARY, PRIMARY))
+  down_choice = np.where(secondary_available, SECONDARY, np.where(primary_available, PRIMARY, SECONDARY))
+  return np.where(scale_up, up_choice, down_choice)
+
+
+def select_threshold(model, compliance, replicas, milli_cpu):
+  scale_up = compliance >= 100
+  primary_available = is_available(model.primary, scale_up, replicas, milli_cpu, model.config)
+  secondary_available = is_available(model.secondary, scale_up, replicas, milli_cpu, model.config)
+  primary_first = np.where(primary_available, PRIMARY, np.where(secondary_available, SECONDARY, NO_STRATEGY))
+  secondary_first = np.where(secondary_available, SECONDARY, np.where(primary_available, PRIMARY, NO_STRATEGY))
+  return np.where(np.abs(compliance - 100) > model.threshold, primary_first, secondary_first)
+
+
+def decision_reads(model, compliance, replicas, milli_cpu):
+  # API server reads and CPU load queries of one decision, with the target reads shared through ScaleClient's
+  # per-decision snapshot: checking the availability of a strategy kind reads either the Scale or the pod template once.
+  logic = model.decision_logic
+  count = len(compliance)
+  distinct_kinds = 1 if model.primary == model.secondary else 2
+  if logic == 'BestFitElasticityDecisionLogic':
+    # Unless exactly one strategy is available, BestFit goes on to the future compliance of both strategies, which
+    # reads the Scale and the pod template and queries the CPU load once. This includes the case where neither is
+    # available, since findIndex() then returns -1 and no single strategy is returned.
+    scale_up = compliance > 100
+    primary_available = is_available(model.primary, scale_up, replicas, milli_cpu, model.config)
+    secondary_available = is_available(model.secondary, scale_up, replicas, milli_cpu, model.config)
+    future = primary_available == secondary_available
+    return np.where(future, 2, distinct_kinds), future.astype(np.int64)
+  if logic == 'PriorityDecisionLogic':
+    return np.full(count, distinct_kinds), np.zeros(count, dtype=np.int64)
+  if logic == 'ThresholdBasedDecisionLogic':
+    scale_up = compliance >= 100
+    first = np.where(np.abs(compliance - 100) > model.threshold, model.primary, model.secondary)
+    first_available = np.where(first == model.primary,
+                               is_available(model.primary, scale_up, replicas, milli_cpu, model.config),
+                               is_available(model.secondary, scale_up, replicas, milli_cpu, model.config))
+    return np.where(first_available | (distinct_kinds == 1), 1, 2), np.zeros(count, dtype=np.int64)
+  return np.zeros(count, dtype=np.int64), np.zeros(count, dtype=np.int64)
+
+
+def select_strategy(model, tick, compliance, load, replicas, milli_cpu, rng):
+  logic = model.decision_logic
+  if logic == 'BestFitElasticityDecisionLogic':
+    return select_best_fit(model, compliance, load, replicas, milli_cpu), compliance
+  if logic == 'PriorityDecisionLogic':
+    return select_priority(model, compliance, replicas, milli_cpu), compliance
+  if logic == 'RandomDecisionLogic':
+    return rng.integers(0, 2, len(compliance)), compliance
+  if logic == 'RoundRobinDecisionLogic':
+    return np.full(len(compliance), tick % 2), compliance
+  if logic == 'ThresholdBasedDecisionLogic':
+    return select_threshold(model, compliance, replicas, milli_cpu), compliance
+  if logic == 'TimeAwareDecisionLogic':
+    primary_enabled = model.day in model.primary_days
+    secondary_enabled = model.day in model.secondary_days
+    if primary_enabled and secondary_enabled:
+      return np.full(len(compliance), tick % 2), compliance
+    if primary_enabled or secondary_enabled:
+      return np.full(len(compliance), PRIMARY if primary_enabled else SECONDARY), compliance
+    return np.full(len(compliance), NO_STRATEGY), np.full_like(compliance, 100)
+  return np.full(len(compliance), PRIMARY), compliance
+
+
+def simulate(model, profiles, seed=None, lengths=None):
+  rng = np.random.default_rng(seed)
+  loads, lengths = load_matrix(profiles, lengths)
+  count = len(loads)
+  rows = np.arange(count)
+  durations = (lengths - 1) * load_step_sec
+  ticks = int(durations.max() // slo_interval_sec)
+  kinds = np.array([model.primary, model.secondary])
+
+  replicas = np.broadcast_to(np.asarray(model.initial_replicas, dtype=np.float64), (count,)).copy()
+  milli_cpu = np.broadcast_to(np.asarray(model.initial_milli_cpu, dtype=np.float64), (count,)).copy()
+  replicas_history = np.empty((count, ticks + 1))
+  milli_cpu_history = np.empty((count, ticks + 1))
+  replicas_history[:, 0] = replicas
+  milli_cpu_history[:, 0] = milli_cpu
+  scaling_actions = np.zeros((count, len(strategy_kinds)), dtype=np.int64)
+  decisions = np.zeros(count, dtype=np.int64)
+  api_calls = np.zeros(count, dtype=np.int64)
+  metric_queries = np.zeros(count, dtype=np.int64)
+
+  for tick in range(1, ticks + 1):
+    time = tick * slo_interval_sec
+    load = loads[rows, np.minimum(time // load_step_sec, lengths - 1)]
+    compliance = compliance_of(utilization(load, replicas, milli_cpu), model.target_utilization)
+    running = time <= durations
+    reads, queries = decision_reads(model, compliance, replicas, milli_cpu)
+    decisions += running
+    api_calls += np.where(running, reads, 0)
+    metric_queries += np.where(running, queries, 0)
+    choice, compliance = select_strategy(model, tick - 1, compliance, load, replicas, milli_cpu, rng)
+    kind = kinds[np.where(choice == NO_STRATEGY, PRIMARY, choice)]
+    active = (np.abs(compliance - 100) > compliance_tolerance) & running
+
+    new_replicas = np.where(active & (kind == HORIZONTAL), scaled_replicas(replicas, compliance, model.config), replicas)
+    new_milli_cpu = np.where(active & (kind == VERTICAL), scaled_milli_cpu(milli_cpu, compliance, model.config), milli_cpu)
+    scaling_actions[:, HORIZONTAL] += new_replicas != replicas
+    scaling_actions[:, VERTICAL] += new_milli_cpu != milli_cpu
+    replicas, milli_cpu = new_replicas, new_milli_cpu
+    replicas_history[:, tick] = replicas
+    milli_cpu_history[:, tick] = milli_cpu
+
+  times = np.arange(0, durations.max() + 1, sample_step_sec, dtype=np.int64)
+  state_index = np.minimum(times // slo_interval_sec, ticks)
+  load_index = np.minimum(times[np.newaxis, :] // load_step_sec, (lengths - 1)[:, np.newaxis])
+  sample_load = np.take_along_axis(loads, load_index, axis=1)
+  sample_replicas = replicas_history[:, state_index]
+  sample_milli_cpu = milli_cpu_history[:, state_index]
+
+  return SimulationResult(
+    times,
+    durations,
+    utilization(sample_load, sample_replicas, sample_milli_cpu),
+    sample_replicas * sample_milli_cpu / 1000,
+    sample_milli_cpu / 1000,
+    sample_replicas,
+    scaling_actions,
+    decisions,
+    api_calls,
+    metric_queries
+  )
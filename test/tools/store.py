@@ -0,0 +1,120 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import yaml
+
+import archive
+
+default_store_path = './result/store'
+
+schema = '''
+CREATE TABLE IF NOT EXISTS runs (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  created_at REAL NOT NULL,
+  name TEXT NOT NULL,
+  title TEXT,
+  export_file TEXT NOT NULL,
+  deployment TEXT NOT NULL,
+  namespace TEXT,
+  mapping TEXT,
+  decision_logic TEXT,
+  profile TEXT,
+  load_profile TEXT NOT NULL,
+  yamls TEXT NOT NULL,
+  start INTEGER NOT NULL,
+  end INTEGER NOT NULL,
+  archive TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_mapping_profile ON runs (mapping, profile);
+CREATE INDEX IF NOT EXISTS runs_decision_logic ON runs (decision_logic);
+CREATE TABLE IF NOT EXISTS scaling_actions (
+  run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+  strategy TEXT NOT NULL,
+  timestamp INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scaling_actions_run ON scaling_actions (run_id);
+'''
+
+run_columns = ['id', 'created_at', 'name', 'title', 'export_file', 'deployment', 'namespace', 'mapping',
+               'decision_logic', 'profile', 'load_profile', 'yamls', 'start', 'end', 'archive']
+json_columns = {'load_profile', 'yamls'}
+
+
+def mapping_of(yamls):
+  for path in yamls:
+    try:
+      with open(path) as file:
+        documents = [document for document in yaml.safe_load_all(file) if document is not None]
+    except OSError:
+      continue
+    for document in documents:
+      if document.get('kind') == 'CpuUtilizationSloMapping':
+        spec = document.get('spec', {})
+        logic = (spec.get('elasticityDecisionLogic') or {}).get('kind')
+        return os.path.splitext(os.path.basename(path))[0], logic
+  return None, None
+
+
+class ResultStore:
+  def __init__(self, path=default_store_path):
+    self.path = path
+    self.lock = threading.Lock()
+    os.makedirs(os.path.join(path, 'runs'), exist_ok=True)
+    with self.connect() as connection:
+      connection.executescript(schema)
+
+  def connect(self):
+    connection = sqlite3.connect(os.path.join(self.path, 'index.sqlite'))
+    connection.execute('PRAGMA foreign_keys = ON')
+    return connection
+
+  def add(self, tested, data, start, end, scaling_actions, series, profile=None):
+    mapping, decision_logic = mapping_of(tested.yamls)
+    with self.lock, self.connect() as connection:
+      cursor = connection.execute(
+        'INSERT INTO runs (created_at, name, title, export_file, deployment, namespace, mapping, decision_logic, '
+        'profile, load_profile, yamls, start, end, archive) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (time.time(), tested.name, tested.title, tested.export_file, tested.deployment, tested.namespace, mapping,
+         decision_logic, profile, json.dumps(list(data)), json.dumps(tested.yamls), start, end, ''))
+      run_id = cursor.lastrowid
+      archive_file = os.path.join('runs', f'{run_id}.archive')
+      metadata = {**vars(tested), 'start': start, 'end': end, 'profile': profile, 'load_profile': list(data)}
+      archive.write_archive(os.path.join(self.path, archive_file), metadata, series, scaling_actions)
+      connection.execute('UPDATE runs SET archive = ? WHERE id = ?', (archive_file, run_id))
+      connection.executemany('INSERT INTO scaling_actions (run_id, strategy, timestamp) VALUES (?, ?, ?)',
+                             [(run_id, strategy, int(timestamp)) for strategy, timestamps in scaling_actions.items()
+                              for timestamp in timestamps])
+    return run_id
+
+  def find(self, **filters):
+    unknown = set(filters) - set(run_columns)
+    if unknown:
+      raise ValueError(f'Unknown run columns: {", ".join(sorted(unknown))}')
+    where = ' AND '.join(f'"{column}" = ?' for column in filters)
+    query = f'SELECT {", ".join(run_columns)} FROM runs'
+    if where:
+      query += f' WHERE {where}'
+    with self.connect() as connection:
+      rows = connection.execute(query + ' ORDER BY id', list(filters.values())).fetchall()
+    return [self.to_run(row) for row in rows]
+
+  def to_run(self, row):
+    run = dict(zip(run_columns, row))
+    for column in json_columns:
+      run[column] = json.loads(run[column])
+    return run
+
+  def scaling_actions(self, run_id):
+    with self.connect() as connection:
+      rows = connection.execute('SELECT strategy, timestamp FROM scaling_actions WHERE run_id = ? ORDER BY timestamp',
+                                (run_id,)).fetchall()
+    actions = {}
+    for strategy, timestamp in rows:
+      actions.setdefault(strategy, []).append(timestamp)
+    return actions
+
+  def load(self, run):
+    return archive.read_archive(os.path.join(self.path, run['archive']))
@@ -1,19 +1,69 @@
-import datetime
+import base64
+import contextlib
 import json
 import os
+import re
 import subprocess
-import sys
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-import matplotlib.pyplot as plt
 import requests
-from kubernetes import client, config, watch
+import yaml
+from requests.adapters import HTTPAdapter
+
+import archive
+import latency
+import profiles
+import render
+import timing
+from fakeprom import FakePrometheus, kube_state_collector
+from informer import StrategyInformer, strategy_plurals
+from manifests import ManifestApplier
+from series import Series, as_series
+from store import ResultStore
 
 namespace = 'polaris'
-slo_controller_interval_ms = 5000
+# Durations below are logical. With a time_scale > 1, the controller intervals, query step, polling and the stand-in
+# scrape interval are divided by time_scale, while the recorded series and scaling actions stay in logical time.
+time_scale = 1
+load_step_ms = 45000
+slo_controller_interval_ms = 20000
 metric_controller_interval_ms = 3000
 prometheus_port = 9090
+# Replace the port-forwarded cluster Prometheus with the in-process stand-in of fakeprom.py. It scrapes the
+# /metrics endpoints in stand_in_scrape_targets and derives the kube-state-metrics series from the cluster's
+# Deployments, so the metric controllers must run locally with PROMETHEUS_HOST/PORT pointing at it.
+prometheus_stand_in = False
+stand_in_scrape_targets = {
+  'demo-cpu-load-metric-controller': 'http://localhost:3000/metrics',
+  'demo-average-cpu-utilization-metric-controller': 'http://localhost:3002/metrics',
+  'average-cpu-utilization': 'http://localhost:3004/metrics',
+  'multi-elasticity-strategy-controller': 'http://localhost:3005/metrics'
+}
+stand_in_scrape_interval_sec = 1
+stand_in_lookback_sec = 300
+prometheus_max_connections = 16
+query_step = 5
+max_points_per_query = 11000
+max_queries_in_flight = 4
+test_data_port = 3001
+test_data_long_poll_ms = 10000
+test_data_connect_attempts = 10
+watch_test_data = True
+poll_interval_min_sec = 0.2
+poll_interval_max_sec = 2
+wait_timeout_sec = None
+max_wait_errors = 50
+max_parallel_tests = None
+record_archives = False
+store_results = True
+result_store_path = './result/store'
+record_timing = True
+timing_root = './result/timing'
+polaris_reserved_cpu_millis = 1000
+default_test_cpu_millis = 1000
 cluster_ip = '192.168.49.2'
 
 lib_crds = [
@@ -29,39 +79,159 @@ apps = [
 cpu_usage_metric = 'polaris_composed_metrics_polaris_slo_cloud_github_io_v1_average_cpu_utilization'
 cpu_load_metric = 'polaris_composed_metrics_polaris_slo_cloud_github_io_v1_cpu_load'
 target_cpu_usage = 50
+# The load profile is written to this ConfigMap, which is mounted into the demo-cpu-load-metric-controller.
+test_data_config_map = 'demo-cpu-load-profile'
+test_data_config_map_key = 'profile'
+# Replay a recorded trace (see traces.py and convert-trace.py) by time instead of the load profile. It is written to a
+# ConfigMap as well, which limits it to 1 MiB, e.g., 5 * 10^5 values of 2 bytes, or 87 days at a 15 second step.
+cpu_trace_path = None
+trace_config_map = 'demo-cpu-load-trace'
+trace_config_map_key = 'trace'
+config_map_max_bytes = 1024 * 1024
+# Profiles are also set as the CPU_TEST_DATA JSON array for images that predate the profile ConfigMap, but only up to
+# this size, well below the 128 KiB limit of a single environment string (MAX_ARG_STRLEN).
+test_data_env_max_bytes = 32 * 1024
+
+
+def test_data_document(data, target_namespace=None):
+  return {
+    'apiVersion': 'v1',
+    'kind': 'ConfigMap',
+    'metadata': {'name': test_data_config_map, 'namespace': target_namespace or namespace},
+    'binaryData': {test_data_config_map_key: base64.b64encode(profiles.encode_profile(data)).decode()}
+  }
+
+
+def trace_document(path=None, target_namespace=None):
+  document = {
+    'apiVersion': 'v1',
+    'kind': 'ConfigMap',
+    'metadata': {'name': trace_config_map, 'namespace': target_namespace or namespace}
+  }
+  if path is not None:
+    if os.path.getsize(path) > config_map_max_bytes:
+      raise ValueError(f'{path} exceeds the ConfigMap size limit, convert the trace with a larger step')
+    with open(path, 'rb') as file:
+      document['binaryData'] = {trace_config_map_key: base64.b64encode(file.read()).decode()}
+  return document
+
+
+@timing.timed('set trace')
+def set_trace(path=None, target_namespace=None):
+  # Without a path, the trace ConfigMap of an earlier session is removed, so that the profile is replayed.
+  if path is None:
+    get_manifest_applier().delete_documents([trace_document(None, target_namespace)], wait=False)
+  else:
+    get_manifest_applier().apply_documents([trace_document(path, target_namespace)])
+
+
+@timing.timed('set test data')
+def set_test_data(data, target_namespace=None):
+  get_manifest_applier().apply_documents([test_data_document(data, target_namespace)])
+
+
+def scaled_sec(seconds):
+  return seconds / time_scale
 
 
-def set_test_data(data):
+def scaled_ms(milliseconds):
+  return max(1, round(milliseconds / time_scale))
+
+
+def interval_env():
+  return {
+    'average-cpu-utilization': {'SLO_CONTROL_LOOP_INTERVAL_MSEC': str(scaled_ms(slo_controller_interval_ms))},
+    'demo-cpu-load-metric-controller': {
+      'COMPOSED_METRIC_COMPUTATION_INTERVAL_MS': str(scaled_ms(load_step_ms)),
+      'CPU_TRACE_TIME_SCALE': str(time_scale)
+    },
+    'demo-average-cpu-utilization-metric-controller': {
+      'COMPOSED_METRIC_COMPUTATION_INTERVAL_MS': str(scaled_ms(metric_controller_interval_ms))
+    }
+  }
+
+
+def test_data_env(data):
+  # Images built before the profile ConfigMap existed only read CPU_TEST_DATA, newer ones prefer the mounted profile.
+  # Larger profiles are only served by the ConfigMap and the test data endpoint, None removes the variable.
   json_list = json.dumps(data)
-  set_deployment_env_var('demo-cpu-load-metric-controller', 'CPU_TEST_DATA', json_list)
+  value = json_list if len(json_list.encode()) <= test_data_env_max_bytes else None
+  return {'demo-cpu-load-metric-controller': {'CPU_TEST_DATA': value}}
+
+
+def controller_env(data=None):
+  env = interval_env()
+  if data is not None:
+    for deployment, values in test_data_env(data).items():
+      values = {name: value for name, value in values.items() if value is not None}
+      env[deployment] = {**env.get(deployment, {}), **values}
+  return env
+
 
+def logical_time(timestamp, start):
+  return start + int((timestamp - start) * time_scale)
 
-def set_deployment_env_var(deployment_name, name, value):
-  subprocess.call(['kubectl', 'set', 'env', f'deployment/{deployment_name}', f'{name}={value}', '-n', f'{namespace}'])
 
+def logical_scaling_actions(scaling_actions, start):
+  return {plural: [logical_time(timestamp, start) for timestamp in timestamps]
+          for plural, timestamps in scaling_actions.items()}
 
-def create_from_paths(paths):
-  for path in paths:
-    subprocess.call(['kubectl', 'apply', '-f', path])
 
+def set_deployment_env_var(deployment_name, name, value, target_namespace=None):
+  get_manifest_applier().set_env(deployment_name, {name: value}, target_namespace or namespace)
 
-def delete_from_paths(paths):
-  for path in paths:
-    subprocess.call(['kubectl', 'delete', '-f', path])
+
+def get_manifest_applier():
+  global manifest_applier
+  with manifest_applier_lock:
+    if manifest_applier is None:
+      manifest_applier = ManifestApplier()
+    return manifest_applier
+
+
+def create_from_paths(paths, target_namespace=None, env=None, documents=()):
+  get_manifest_applier().apply(paths, target_namespace, env, time_scale, documents)
+
+
+def delete_from_paths(paths, target_namespace=None, propagation='Background'):
+  get_manifest_applier().delete(paths, target_namespace, propagation=propagation)
+
+
+def namespace_manifest(name):
+  return {'apiVersion': 'v1', 'kind': 'Namespace', 'metadata': {'name': name}}
+
+
+def create_namespace(name):
+  get_manifest_applier().apply_documents([namespace_manifest(name)])
+
+
+def delete_namespace(name):
+  get_manifest_applier().delete_documents([namespace_manifest(name)], wait=False)
 
 
 def abs_path(file_list):
   return [f'{os.path.dirname(os.path.abspath(__file__))}/../manifests/{path}' for path in file_list]
 
 
-def setup_polaris():
-  create_from_paths(abs_path(lib_crds))
-  create_from_paths(abs_path(apps))
+def polaris_documents(data=None):
+  # The profile and trace ConfigMaps live in the polaris Namespace, which only the app manifests create, so they are
+  # applied in the same waves.
+  documents = [] if data is None else [test_data_document(data)]
+  if cpu_trace_path is not None:
+    documents.append(trace_document(cpu_trace_path))
+  return documents
+
+
+@timing.timed('setup')
+def setup_polaris(data=None):
+  if cpu_trace_path is None:
+    set_trace(None)
+  create_from_paths(abs_path(lib_crds) + abs_path(apps), env=controller_env(data), documents=polaris_documents(data))
 
 
+@timing.timed('teardown')
 def tear_down_polaris():
-  delete_from_paths(abs_path(apps))
-  delete_from_paths(abs_path(lib_crds))
+  delete_from_paths(abs_path(lib_crds) + abs_path(apps))
 
 
 def apply_yaml(yaml_file):
@@ -72,256 +242,376 @@ def delete_yaml(yaml_file):
   delete_from_paths([yaml_file])
 
 
-def wait_all_ready():
-  subprocess.call(['kubectl', 'wait', 'pods', '-n', 'polaris', '--all', '--for=condition=Ready', '--timeout=90s'])
+@timing.timed('readiness')
+def wait_all_ready(target_namespace=None):
+  target_namespace = target_namespace or namespace
+  subprocess.call(['kubectl', 'wait', 'pods', '-n', target_namespace, '--all', '--for=condition=Ready', '--timeout=90s'])
+
+
+@timing.timed('test data connection')
+def setup_test_data_connection():
+  service = 'service/demo-cpu-load-metric-controller'
+  port = test_data_port
+  command = ['kubectl', 'port-forward', service, f'{port}:{port}', '-n', namespace]
+  return subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 
 def unix_timestamp():
   return int(time.time_ns() / 1000 / 1000 / 1000)
 
 
+@timing.timed('prometheus connection')
 def setup_prometheus_connection():
+  if prometheus_stand_in:
+    return start_prometheus_stand_in()
   service = 'service/prometheus-kube-prometheus-prometheus'
   port = prometheus_port
   command = ['kubectl', 'port-forward', service, f'{port}:{port}', '-n', 'monitoring']
   return subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 
-def query_prometheus(promql_query, start, end):
+def start_prometheus_stand_in():
+  prometheus = FakePrometheus(port=prometheus_port, collectors=[kube_state_collector(list_cluster_deployments)],
+                              scrape_interval_sec=scaled_sec(stand_in_scrape_interval_sec),
+                              lookback_sec=scaled_sec(stand_in_lookback_sec))
+  for job, url in stand_in_scrape_targets.items():
+    prometheus.add_target(url, job)
+  return prometheus.start()
+
+
+def list_cluster_deployments():
+  return get_manifest_applier().list_items('apps/v1', 'Deployment')
+
+
+http_session = None
+http_session_lock = threading.Lock()
+manifest_applier = None
+manifest_applier_lock = threading.Lock()
+result_store = None
+result_store_lock = threading.Lock()
+
+
+def get_http_session():
+  global http_session
+  with http_session_lock:
+    if http_session is None:
+      adapter = HTTPAdapter(pool_connections=1, pool_maxsize=prometheus_max_connections)
+      http_session = requests.Session()
+      http_session.mount('http://', adapter)
+    return http_session
+
+
+def fetch_concurrently(*fetchers):
+  # The first failed fetch is raised to the caller, the fetches that have not started yet are cancelled.
+  with ThreadPoolExecutor(max_workers=min(len(fetchers), prometheus_max_connections)) as executor:
+    futures = [executor.submit(timing.in_context(fetcher)) for fetcher in fetchers]
+    try:
+      return [future.result() for future in futures]
+    except Exception:
+      executor.shutdown(cancel_futures=True)
+      raise
+
+
+def query_prometheus(promql_query, start, end, step=query_step):
   url = f'http://localhost:{prometheus_port}/api/v1/query_range'
   params = {
     'query': promql_query,
     'start': start,
     'end': end,
-    'step': 5
+    'step': step
   }
 
-  response = requests.get(url, params=params)
-  print(response.url)
-  if response.status_code == 200:
-    data = response.json()
-    print(response.url)
-    print(data)
-    return data
-  else:
-    print(f"Request failed with status code: {response.status_code}")
-    exit(1)
+  with timing.span('query', query=promql_query, start=start, end=end):
+    response = get_http_session().get(url, params=params)
+  response.raise_for_status()
+  return response.json()
+
+
+def query_windows(start, end, step=query_step):
+  span = step * (max_points_per_query - 1)
+  window_start = start
+  while window_start <= end:
+    window_end = min(window_start + span, end)
+    yield window_start, window_end
+    window_start = window_end + step
+
 
+def stream_prometheus_windows(promql_query, start, end, step=query_step):
+  pending = deque()
+  with ThreadPoolExecutor(max_workers=max_queries_in_flight) as executor:
+    for window_start, window_end in query_windows(start, end, step):
+      query = timing.in_context(query_prometheus)
+      pending.append(executor.submit(query, promql_query, window_start, window_end, step))
+      if len(pending) >= max_queries_in_flight:
+        yield extract_window_result(pending.popleft().result())
+    while pending:
+      yield extract_window_result(pending.popleft().result())
 
-def extract_query_result(result):
-  return result['data']['result'][0]['values'];
 
+def query_series(promql_query, start, end, step=None):
+  windows = stream_prometheus_windows(promql_query, start, end, step or scaled_sec(query_step))
+  return Series.concat([Series.from_samples(samples, start, time_scale) for samples in windows])
 
-def correct_time(value, start):
-  return int(value) - start;
 
+def extract_window_result(result):
+  series = result['data']['result']
+  return series[0]['values'] if series else []
 
-def get_cpu_usage(start, end):
-  metric = cpu_usage_metric
-  query = query_prometheus(metric, start, end)
-  result = extract_query_result(query)
-  return [[correct_time(sublist[0], start), float(sublist[1])] for sublist in result]
 
+def namespace_matcher(label, target_namespace):
+  return '' if target_namespace is None else f',{label}="{target_namespace}"'
 
-def get_replica_count(deployment_name, start, end):
-  metric = f'kube_deployment_spec_replicas{{deployment="{deployment_name}"}}'
-  query = query_prometheus(metric, start, end)
-  result = extract_query_result(query)
-  return [[correct_time(sublist[0], start), int(sublist[1])] for sublist in result]
 
+def composed_metric_selector(metric, target_namespace):
+  return metric if target_namespace is None else f'{metric}{{target_namespace="{target_namespace}"}}'
 
-def get_cpu_resource_req(deployment_name, start, end):
-  metric = f'min(kube_pod_container_resource_limits{{pod=~"{deployment_name}.*"}}) * min(kube_deployment_spec_replicas{{deployment="{deployment_name}"}})'
-  query = query_prometheus(metric, start, end)
-  result = extract_query_result(query)
-  return [[correct_time(sublist[0], start), float(sublist[1])] for sublist in result]
+
+def get_cpu_usage(start, end, target_namespace=None):
+  metric = composed_metric_selector(cpu_usage_metric, target_namespace)
+  return query_series(metric, start, end)
+
+
+def get_decision_latencies(start, end, target_namespace=None):
+  # The controllers run in real time, so the histogram increase is taken over the unscaled test duration.
+  url = f'http://localhost:{prometheus_port}/api/v1/query'
+  params = {'query': latency.latency_query(end - start, target_namespace), 'time': end}
+  with timing.span('query', query=params['query'], time=end):
+    response = get_http_session().get(url, params=params)
+  if response.status_code != 200:
+    print(f'Decision latency query failed with status code: {response.status_code}')
+    return {}
+  return latency.histograms_from_vector(response.json()['data']['result'])
 
 
-def get_container_resource_req(deployment_name, start, end):
-  metric = f'min(kube_pod_container_resource_limits{{pod=~"{deployment_name}.*"}})'
-  query = query_prometheus(metric, start, end)
-  result = extract_query_result(query)
-  return [[correct_time(sublist[0], start), float(sublist[1])] for sublist in result]
+def get_strategy_lags(data, start, scaling_actions):
+  return latency.strategy_lags(logical_scaling_actions(scaling_actions, start), data, start, load_step_ms / 1000)
+
+
+def get_replica_count(deployment_name, start, end, target_namespace=None):
+  ns = namespace_matcher('namespace', target_namespace)
+  metric = f'kube_deployment_spec_replicas{{deployment="{deployment_name}"{ns}}}'
+  return query_series(metric, start, end)
+
+
+def get_cpu_resource_req(deployment_name, start, end, target_namespace=None):
+  ns = namespace_matcher('namespace', target_namespace)
+  metric = f'min(kube_pod_container_resource_limits{{pod=~"{deployment_name}.*"{ns}}}) * min(kube_deployment_spec_replicas{{deployment="{deployment_name}"{ns}}})'
+  return query_series(metric, start, end)
+
+
+def get_container_resource_req(deployment_name, start, end, target_namespace=None):
+  ns = namespace_matcher('namespace', target_namespace)
+  metric = f'min(kube_pod_container_resource_limits{{pod=~"{deployment_name}.*"{ns}}})'
+  return query_series(metric, start, end)
 
 
 class SloTest:
-  def __init__(self, name, deployment, yamls, export_file, title=None):
+  def __init__(self, name, deployment, yamls, export_file, title=None, namespace=None):
     self.name = name
     self.deployment = deployment
     self.yamls = yamls
     self.export_file = export_file
     self.title = title
+    self.namespace = namespace
 
 
-def watch_kubernetes(counter_callback, stop_event, plural):
-  print('watch_kubernetes_object_updates')
-  config.load_kube_config()
-  api_client = client.ApiClient()
-  custom_api = client.CustomObjectsApi()
-  watcher = watch.Watch()
-  print('got watcher')
-
+@timing.timed('observe load')
+def observe_load(data, target_namespace=None):
+  informer = StrategyInformer(target_namespace or namespace, strategy_plurals).start()
   try:
-    for event in watcher.stream(custom_api.list_namespaced_custom_object, 'elasticity.polaris-slo-cloud.github.io',
-                                'v1', 'polaris', plural):
-      print("Event: %s %s" % (event['type'], event['object']))
-      if stop_event.is_set():
-        break
-      counter_callback(plural)
-  except Exception as e:
-    print(f"Error watching Kubernetes object updates: {str(e)}")
-    sys.exit(1)
+    wait_for_value(data[-1], target_namespace=target_namespace)
   finally:
-    watcher.stop()
+    informer.stop()
 
+  return informer.scaling_actions()
 
-def observe_load(data):
-  try:
-    global scaling_actions
-    scaling_actions = {}
-    lock = threading.Lock()
-    stop_event_watch = threading.Event()
-    stop_event_load = threading.Event()
-
-    def update_counter(plural):
-      with lock:
-        if plural not in scaling_actions:
-          scaling_actions[plural] = []
-        scaling_actions[plural].append(unix_timestamp())
-
-    v_watcher = threading.Thread(target=watch_kubernetes,
-                                 args=(update_counter, stop_event_watch, 'verticalelasticitystrategies'), daemon=True)
-    h_watcher = threading.Thread(target=watch_kubernetes,
-                                 args=(update_counter, stop_event_watch, 'horizontalelasticitystrategies'), daemon=True)
-    v_watcher.start()
-    h_watcher.start()
-    wait_for_value(data[-1])
-  finally:
-    stop_event_watch.set()
-    stop_event_load.set()
-
-  return scaling_actions
 
+class PrometheusProbe:
+  def __init__(self, metric):
+    self.url = f'http://localhost:{prometheus_port}/api/v1/query'
+    self.params = {
+      'query': metric
+    }
 
-def get_cpu_load_instant():
-  metric = cpu_load_metric
-  url = f'http://localhost:{prometheus_port}/api/v1/query'
-  time = datetime.datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-  params = {
-    'query': metric,
-    'time': time
-  }
+  def __call__(self):
+    response = get_http_session().get(self.url, params=self.params)
+    response.raise_for_status()
+    return int(float(response.json()['data']['result'][0]['value'][1]) * 1000)
 
-  response = requests.get(url, params=params)
-  if response.status_code == 200:
-    data = response.json()
-    return data['data']['result'][0]['value'][1]
-  else:
-    print(f"Request failed with status code: {response.status_code}")
-    exit(1)
 
+class TestDataProbe:
+  def __init__(self, test_namespace):
+    self.url = f'http://localhost:{test_data_port}/test-data'
+    self.params = {
+      'namespace': test_namespace,
+      'since': -1,
+      'timeoutMs': test_data_long_poll_ms
+    }
 
-def wait_for_value(value):
-  cpu_usage = None
+  def is_available(self):
+    params = {**self.params, 'timeoutMs': 0}
+    for _ in range(test_data_connect_attempts):
+      try:
+        response = get_http_session().get(self.url, params=params)
+        return response.status_code in (200, 204)
+      except requests.ConnectionError:
+        time.sleep(poll_interval_min_sec)
+    return False
+
+  def __call__(self):
+    response = get_http_session().get(self.url, params=self.params)
+    response.raise_for_status()
+    if response.status_code == 204:
+      raise IndexError('No test data has been emitted yet')
+    progress = response.json()
+    self.params['since'] = progress['seq']
+    return progress['value']
+
+
+def wait_until(probe, value, timeout_sec=None, min_interval_sec=None):
+  # The module settings are read at call time, so that run scripts can change them.
+  timeout_sec = wait_timeout_sec if timeout_sec is None else timeout_sec
+  min_interval_sec = poll_interval_min_sec if min_interval_sec is None else min_interval_sec
+  deadline = None if timeout_sec is None else time.monotonic() + scaled_sec(timeout_sec)
+  min_interval_sec = scaled_sec(min_interval_sec)
+  max_interval_sec = scaled_sec(poll_interval_max_sec)
+  interval = min_interval_sec
+  current = None
   error_counter = 0
-  max_error = 50
-  while cpu_usage != value:
+  while deadline is None or time.monotonic() < deadline:
     try:
-      cpu_usage = int(float(get_cpu_load_instant()) * 1000)
-      print(f'Current CPU usage: {cpu_usage}')
-      if cpu_usage == value:
-        print('Desired CPU usage reached.')
-        return
+      previous, current = current, probe()
+      if current == value:
+        print(f'Desired CPU load {value} reached.')
+        return True
+      if current != previous:
+        print(f'Current CPU load: {current}')
+        interval = min_interval_sec
+      else:
+        interval = min(interval * 2, max_interval_sec)
       error_counter = 0
     except IndexError:
-      print('Waiting for metric to be available...')
+      interval = max_interval_sec
     except Exception as e:
+      error_counter += 1
       print(f'Error count: {error_counter}')
       print(e)
-      error_counter += 1
-    finally:
-      if error_counter >= max_error:
+      if error_counter >= max_wait_errors:
         print('Max error count reached. Exiting.')
-        return
-      time.sleep(5)
-
-
+        return False
+      interval = max_interval_sec
+    if interval > 0:
+      remaining = None if deadline is None else deadline - time.monotonic()
+      time.sleep(interval if remaining is None else max(0, min(interval, remaining)))
+  print(f'Deadline reached before CPU load {value}.')
+  return False
+
+
+@timing.timed('wait for load')
+def wait_for_value(value, timeout_sec=None, target_namespace=None):
+  if watch_test_data:
+    probe = TestDataProbe(target_namespace or namespace)
+    if probe.is_available():
+      return wait_until(probe, value, timeout_sec, min_interval_sec=0)
+    print('Test data endpoint not available, polling Prometheus instead.')
+  metric = composed_metric_selector(cpu_load_metric, target_namespace)
+  return wait_until(PrometheusProbe(metric), value, timeout_sec)
+
+
+@timing.timed('execute')
 def execute_test(tested, data):
   print('Starting to track metrics...')
-  wait_for_value(data[0])
+  wait_for_value(data[0], target_namespace=tested.namespace)
   start = unix_timestamp()
 
-  scaling_actions = observe_load(data)
+  scaling_actions = observe_load(data, tested.namespace)
 
   end = unix_timestamp()
-  plot_test_result(tested, start, end, scaling_actions)
+  series = plot_test_result(tested, data, start, end, scaling_actions)
+  end, scaling_actions = logical_time(end, start), logical_scaling_actions(scaling_actions, start)
+  if store_results:
+    store_test_result(tested, data, start, end, scaling_actions, series)
 
 
-def plot_test_result(tested, start, end, scaling_actions):
+@timing.timed('results')
+def plot_test_result(tested, data, start, end, scaling_actions):
   deployment = tested.deployment
   label = tested.name
-  fig, axs = plt.subplots(nrows=4, ncols=1, sharex=True)
-  cpu_usage = get_cpu_usage(start, end)
-  # plot_scaling_actions(axs[1], scaling_actions, start)
-  plot_samples(axs[0], cpu_usage, 'Actual', 'Average CPU Usage Across All Replicas', 'Percent')
-  plot_samples(axs[0], [[int(sublist[0]), float(target_cpu_usage)] for sublist in cpu_usage], 'Target',
-               'Average CPU Usage Across All Replicas', 'Percent')
-
-  cpu_req = get_cpu_resource_req(deployment, start, end)
-  container_req = get_container_resource_req(deployment, start, end)
-  pod_count = get_replica_count(deployment, start, end)
-
-  plot_samples(axs[1], cpu_req, None, 'Workload CPU Request', 'CPU Cores')
-  plot_samples(axs[2], container_req, None, 'Pod CPU Request', "CPU Cores")
-  plot_samples(axs[3], pod_count, None, 'Workload Size', 'Instances')
-  axs[0].legend(fontsize=5, ncols=2)
-  axs[3].set_xlabel('Time (sec)', fontsize=8, loc='center')
-  if tested.title is not None:
-    fig.suptitle(tested.title)
-
-  for ax in axs:
-    ax.grid(linewidth=0.2)
-  plt.tight_layout()
-  plt.gcf().set_size_inches(8, 6)
-  plt.savefig(f'./result/{tested.export_file}', dpi=200)
-
-
-def plot_scaling_actions(plt, scaling_actions, start):
-  print(scaling_actions)
-  y_min, y_max = plt.get_ylim()
-  if 'verticalelasticitystrategies' in scaling_actions:
-    plt.vlines(x=[correct_time(value, start) for value in scaling_actions['verticalelasticitystrategies']], ymin=y_min,
-               ymax=y_max,
-               colors='dimgray', linestyles='dotted', label='Vertical Scaling')
-  if 'horizontalelasticitystrategies' in scaling_actions:
-    plt.vlines(x=[correct_time(value, start) for value in scaling_actions['horizontalelasticitystrategies']],
-               ymin=y_min, ymax=y_max,
-               colors='limegreen', linestyles='dashed', label='Horizontal Scaling')
-
-
-def plot_samples(axs, samples, label, title, y_label):
-  time = [sample[0] for sample in samples]
-  value = extract_values(samples)
-  if label is not None:
-    axs.plot(time, value, label=label)
-  else:
-    axs.plot(time, value)
-  axs.tick_params(axis='x', labelsize=8)
-  axs.tick_params(axis='y', labelsize=8)
-  axs.set_title(title, fontsize=10)
-  axs.set_ylabel(y_label, fontsize=8)
+  with timing.span('fetch series'):
+    cpu_usage, cpu_req, container_req, pod_count, latencies = fetch_concurrently(
+      lambda: get_cpu_usage(start, end, tested.namespace),
+      lambda: get_cpu_resource_req(deployment, start, end, tested.namespace),
+      lambda: get_container_resource_req(deployment, start, end, tested.namespace),
+      lambda: get_replica_count(deployment, start, end, tested.namespace),
+      lambda: get_decision_latencies(start, end, tested.namespace)
+    )
+  if record_archives:
+    record_test_result(tested, start, logical_time(end, start), logical_scaling_actions(scaling_actions, start),
+                       cpu_usage, cpu_req, container_req, pod_count)
+  lags = get_strategy_lags(data, start, scaling_actions)
+  record_decision_latencies(tested, latencies, lags)
+  plot_test_figure(tested, cpu_usage, cpu_req, container_req, pod_count, latencies, lags)
+  return cpu_usage, cpu_req, container_req, pod_count
+
+
+def get_result_store():
+  global result_store
+  with result_store_lock:
+    if result_store is None:
+      result_store = ResultStore(result_store_path)
+    return result_store
+
+
+@timing.timed('store')
+def store_test_result(tested, data, start, end, scaling_actions, series):
+  run_id = get_result_store().add(tested, data, start, end, scaling_actions,
+                                  dict(zip(archive.series_names, series)), profiles.profile_name(data))
+  print(f'Stored results of {tested.name} as run {run_id}.')
+
+
+def archive_path(tested):
+  return f'./result/{tested.export_file}.archive'
+
+
+@timing.timed('archive')
+def record_test_result(tested, start, end, scaling_actions, cpu_usage, cpu_req, container_req, pod_count):
+  metadata = {**vars(tested), 'start': start, 'end': end, 'time_scale': time_scale}
+  series = dict(zip(archive.series_names, (cpu_usage, cpu_req, container_req, pod_count)))
+  archive.write_archive(archive_path(tested), metadata, series, scaling_actions)
+
+
+def record_decision_latencies(tested, latencies, lags):
+  path = latency.write_summary(f'./result/{tested.export_file}.latency.csv', latencies, lags)
+  if path is not None:
+    print(f'Decision latencies of {tested.name} written to {path}.')
+
+
+def replay_test_result(path, export_file=None):
+  recorded = archive.read_archive(path)
+  metadata = recorded.metadata
+  tested = SloTest(metadata['name'], metadata['deployment'], metadata['yamls'], export_file or metadata['export_file'],
+                   metadata['title'], metadata['namespace'])
+  plot_test_figure(tested, *[recorded.series[name] for name in archive.series_names])
+  return recorded
+
+
+@timing.timed('render')
+def plot_test_figure(tested, cpu_usage, cpu_req, container_req, pod_count, latencies=None, lags=None):
+  render.render_test_figure(f'./result/{tested.export_file}', tested.title, cpu_usage, cpu_req, container_req,
+                            pod_count, target_cpu_usage, latencies, lags)
 
 
 def extract_values(samples):
-  return [float(sublist[1]) for sublist in samples]
+  return as_series(samples).values
 
 
-def cleanup_prometheus():
+@timing.timed('cleanup')
+def cleanup_prometheus(target_namespace=None):
   metrics = [
-    cpu_usage_metric,
-    cpu_load_metric,
-    'kube_deployment_spec_replicas',
-    'kube_pod_container_resource_limits',
+    composed_metric_selector(cpu_usage_metric, target_namespace),
+    composed_metric_selector(cpu_load_metric, target_namespace),
+    'kube_deployment_spec_replicas' if target_namespace is None else f'kube_deployment_spec_replicas{{namespace="{target_namespace}"}}',
+    'kube_pod_container_resource_limits' if target_namespace is None else f'kube_pod_container_resource_limits{{namespace="{target_namespace}"}}',
   ]
 
   for metric in metrics:
@@ -330,37 +620,255 @@ def cleanup_prometheus():
       'match[]': metric
     }
 
-    response = requests.post(url, params=params)
+    response = get_http_session().post(url, params=params)
     if response.status_code != 204:
       print(f"Prometheus cleanup failed with status code: {response.status_code}")
 
 
+@contextlib.contextmanager
+def timing_session():
+  timing.recorder.reset()
+  try:
+    yield
+  finally:
+    if record_timing:
+      timing.export(timing_root)
+
+
 def run_test(test, data):
-  print("Starting test setup...")
+  with timing.span('test', name=test.name):
+    print("Starting test setup...")
+    proxy = None
+    test_data_proxy = None
+
+    try:
+      setup_polaris(data)
+      create_from_paths(test.yamls)
+      wait_all_ready()
+      print("Setting up Prometheus connection...")
+      proxy = setup_prometheus_connection()
+      if watch_test_data:
+        test_data_proxy = setup_test_data_connection()
+      print("Executing test...")
+      execute_test(test, data)
+    finally:
+      print("Cleaning up...")
+      try:
+        delete_from_paths(test.yamls)
+      finally:
+        try:
+          tear_down_polaris()
+          cleanup_prometheus()
+        finally:
+          if proxy is not None:
+            proxy.kill()
+          if test_data_proxy is not None:
+            test_data_proxy.kill()
+
+
+def run(slo_test, data):
+  try:
+    with timing_session():
+      run_test(slo_test, data)
+  except Exception as e:
+    print(f'Exception on test: {e}')
+
+
+def isolated_namespace(tested):
+  name = re.sub('[^a-z0-9-]+', '-', f'{namespace}-{tested.export_file}'.lower())
+  return name[:63].strip('-')
+
+
+def parse_cpu_millis(quantity):
+  quantity = str(quantity)
+  if quantity.endswith('m'):
+    return int(quantity[:-1])
+  return int(float(quantity) * 1000)
+
+
+def cluster_cpu_millis():
+  output = subprocess.run(['kubectl', 'get', 'nodes', '-o', 'json'], capture_output=True, text=True, check=True).stdout
+  return sum(parse_cpu_millis(node['status']['allocatable']['cpu']) for node in json.loads(output)['items'])
+
+
+def test_cpu_millis(tested):
+  for path in tested.yamls:
+    with open(path) as file:
+      for document in yaml.safe_load_all(file):
+        if document is not None and document.get('kind') == 'CpuUtilizationSloMapping':
+          strategy_config = document['spec'].get('staticElasticityStrategyConfig', {})
+          max_cpu_millis = strategy_config.get('maxResources', {}).get('milliCpu', default_test_cpu_millis)
+          return strategy_config.get('maxReplicas', 1) * max_cpu_millis
+  return default_test_cpu_millis
+
+
+def parallel_capacity(tests):
+  available = cluster_cpu_millis() - polaris_reserved_cpu_millis
+  footprint = max(test_cpu_millis(tested) for tested in tests)
+  return max(1, min(len(tests), available // footprint))
+
+
+def run_isolated_test(test, data):
+  with timing.span('test', name=test.name):
+    print(f'Starting test {test.name} in namespace {test.namespace}...')
+    try:
+      create_namespace(test.namespace)
+      create_from_paths(test.yamls, test.namespace)
+      wait_all_ready(test.namespace)
+      execute_test(test, data)
+    finally:
+      print(f'Cleaning up namespace {test.namespace}...')
+      try:
+        delete_from_paths(test.yamls, test.namespace)
+      finally:
+        delete_namespace(test.namespace)
+        cleanup_prometheus(test.namespace)
+
+
+def run_parallel_tests(tests, data, max_parallel=None):
+  print("Starting shared Polaris setup...")
   proxy = None
+  test_data_proxy = None
+  for tested in tests:
+    if tested.namespace is None:
+      tested.namespace = isolated_namespace(tested)
 
   try:
-    setup_polaris()
-    create_from_paths(test.yamls)
-    set_test_data(data)
+    setup_polaris(data)
     wait_all_ready()
     print("Setting up Prometheus connection...")
     proxy = setup_prometheus_connection()
-    print("Executing test...")
-    execute_test(test, data)
+    if watch_test_data:
+      test_data_proxy = setup_test_data_connection()
+    limit = max_parallel or max_parallel_tests or parallel_capacity(tests)
+    print(f'Running {len(tests)} tests with up to {limit} in parallel...')
+    with ThreadPoolExecutor(max_workers=limit) as executor:
+      futures = [(tested, executor.submit(run_isolated_test, tested, data)) for tested in tests]
+      for tested, future in futures:
+        try:
+          future.result()
+        except Exception as e:
+          print(f'Exception on test {tested.name}: {e}')
   finally:
-    print("Cleaning up...")
-    delete_from_paths(test.yamls)
-    tear_down_polaris()
-    cleanup_prometheus()
-    if proxy is not None:
-      proxy.kill()
+    print("Tearing down shared Polaris setup...")
+    try:
+      tear_down_polaris()
+    finally:
+      if proxy is not None:
+        proxy.kill()
+      if test_data_proxy is not None:
+        test_data_proxy.kill()
 
 
-def run(slo_test, data):
+def run_parallel(slo_tests, data, max_parallel=None):
   try:
-    run_test(slo_test, data)
-  except KeyboardInterrupt:
-    exit(1)
+    with timing_session():
+      run_parallel_tests(slo_tests, data, max_parallel)
   except Exception as e:
-    print(f'Exception on test: {e}')
+    print(f'Exception on parallel tests: {e}')
+
+
+@timing.timed('reset test data')
+def reset_test_data(data):
+  url = f'http://localhost:{test_data_port}/test-data/reset'
+  for _ in range(test_data_connect_attempts):
+    try:
+      response = get_http_session().post(url, data=profiles.encode_profile(data),
+                                         headers={'Content-Type': 'application/octet-stream'})
+      if response.status_code != 204:
+        print(f'Test data reset failed with status code: {response.status_code}')
+      return response.status_code == 204
+    except requests.ConnectionError:
+      time.sleep(poll_interval_min_sec)
+  return False
+
+
+@timing.timed('restart metric controller')
+def restart_with_test_data(data):
+  deployment = 'demo-cpu-load-metric-controller'
+  set_test_data(data)
+  get_manifest_applier().set_env(deployment, test_data_env(data)[deployment], namespace, restart=True)
+  subprocess.call(['kubectl', 'rollout', 'status', f'deployment/{deployment}', '-n', namespace, '--timeout=90s'])
+
+
+@timing.timed('clean test state')
+def clean_test_state(test, target_namespace=None):
+  try:
+    delete_from_paths(test.yamls, target_namespace, propagation='Foreground')
+    get_manifest_applier().delete_custom_resources(abs_path(lib_crds), target_namespace or namespace)
+  finally:
+    cleanup_prometheus(target_namespace)
+
+
+class PolarisSession:
+  def __init__(self, data):
+    self.data = data
+    self.proxy = None
+    self.test_data_proxy = None
+    self.dirty = None
+
+  def __enter__(self):
+    print("Starting Polaris session...")
+    setup_polaris(self.data)
+    wait_all_ready()
+    get_manifest_applier().delete_custom_resources(abs_path(lib_crds), namespace)
+    print("Setting up Prometheus connection...")
+    self.proxy = setup_prometheus_connection()
+    self.connect_test_data()
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    print("Tearing down Polaris session...")
+    try:
+      tear_down_polaris()
+      cleanup_prometheus()
+    finally:
+      for proxy in (self.proxy, self.test_data_proxy):
+        if proxy is not None:
+          proxy.kill()
+
+  def connect_test_data(self):
+    if self.test_data_proxy is not None:
+      self.test_data_proxy.kill()
+    self.test_data_proxy = setup_test_data_connection()
+
+  def reset_test_data(self, data):
+    # The ConfigMap keeps the profile across controller restarts. The controller ignores the file update that follows,
+    # because it has the same content as the pushed profile.
+    set_test_data(data)
+    if reset_test_data(data):
+      return
+    print('Test data endpoint not available, restarting the metric controller instead...')
+    restart_with_test_data(data)
+    self.connect_test_data()
+
+  def run(self, test, data=None):
+    data = data or self.data
+    if self.dirty is not None:
+      clean_test_state(self.dirty)
+      self.dirty = None
+
+    with timing.span('test', name=test.name):
+      print(f'Starting test {test.name}...')
+      try:
+        self.reset_test_data(data)
+        create_from_paths(test.yamls)
+        wait_all_ready()
+        execute_test(test, data)
+      finally:
+        print("Cleaning up test resources...")
+        self.dirty = test
+        clean_test_state(test)
+        self.dirty = None
+
+
+def run_session(slo_tests, data):
+  try:
+    with timing_session(), PolarisSession(data) as session:
+      for slo_test in slo_tests:
+        try:
+          session.run(slo_test, data)
+        except Exception as e:
+          print(f'Exception on test {slo_test.name}: {e}')
+  except Exception as e:
+    print(f'Exception on test session: {e}')
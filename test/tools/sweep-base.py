@@ -0,0 +1,25 @@
+import profiles
+import simulator
+import sweep
+
+workload_yaml = './../slo-mappings/base/resource-consumer.yaml'
+mapping_base_path = './../slo-mappings/base'
+
+mappings = ['best-fit', 'priority', 'threshold']
+
+params = sweep.grid(
+  min_replicas=[1, 2, 3],
+  max_replicas=[2, 3, 4, 6, 8, 10],
+  min_milli_cpu=[100, 200, 300, 400, 500],
+  max_milli_cpu=[500, 750, 1000, 1250, 1500],
+  threshold=[10, 30, 50, 70, 90],
+  target_utilization=[40, 50, 60, 70, 80, 90]
+)
+
+for mapping in mappings:
+  model = simulator.MappingModel.from_yaml(f'{mapping_base_path}/{mapping}.yaml', workload_yaml)
+  result = sweep.sweep(model, profiles.base_profiles, params, seed=0)
+  result.to_csv(f'./result/sweep/{mapping}.csv')
+  print(f'{mapping}: evaluated {len(result)} configurations')
+  for config in result.best('violation_sec', 3):
+    print(f'  {config}')
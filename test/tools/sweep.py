@@ -0,0 +1,153 @@
+import copy
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import simulator
+
+integer_parameters = {'min_replicas', 'max_replicas', 'min_milli_cpu', 'max_milli_cpu'}
+configs_per_chunk = 2000
+max_workers = None
+
+metric_names = ['violation_sec', 'overprovisioned_core_sec', 'horizontal_actions', 'vertical_actions',
+                'api_calls_per_decision']
+
+
+def param_value(name, value):
+  # Integer parameters are kept as rounded floats for the simulation, but reported as ints.
+  return int(value) if name in integer_parameters else value.item()
+
+
+class SweepResult:
+  def __init__(self, params, profile_names, metrics):
+    self.params = params
+    self.profile_names = profile_names
+    self.metrics = metrics
+
+  def __len__(self):
+    return len(next(iter(self.params.values())))
+
+  def totals(self):
+    return {name: values.sum(axis=1) for name, values in self.metrics.items()}
+
+  def best(self, metric='violation_sec', count=10):
+    order = np.argsort(self.totals()[metric], kind='stable')[:count]
+    return [{name: param_value(name, values[index]) for name, values in self.params.items()} for index in order]
+
+  def to_csv(self, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    names = list(self.params)
+    with open(path, 'w', newline='') as file:
+      writer = csv.writer(file)
+      writer.writerow(names + ['profile'] + metric_names)
+      for index in range(len(self)):
+        config = [param_value(name, self.params[name][index]) for name in names]
+        for column, profile in enumerate(self.profile_names):
+          writer.writerow(config + [profile] + [self.metrics[metric][index, column] for metric in metric_names])
+
+
+def grid(**values):
+  names = list(values)
+  mesh = np.meshgrid(*[np.asarray(values[name], dtype=np.float64) for name in names], indexing='ij')
+  return {name: axis.ravel() for name, axis in zip(names, mesh)}
+
+
+def random_sample(count, seed=None, **ranges):
+  rng = np.random.default_rng(seed)
+  return {name: rng.uniform(low, high, count) for name, (low, high) in ranges.items()}
+
+
+def latin_hypercube(count, seed=None, **ranges):
+  rng = np.random.default_rng(seed)
+  params = {}
+  for name, (low, high) in ranges.items():
+    strata = (rng.permutation(count) + rng.uniform(0, 1, count)) / count
+    params[name] = low + strata * (high - low)
+  return params
+
+
+def valid_params(params):
+  params = {name: np.round(values) if name in integer_parameters else values for name, values in params.items()}
+  count = len(next(iter(params.values())))
+  valid = np.ones(count, dtype=bool)
+  for low, high in (('min_replicas', 'max_replicas'), ('min_milli_cpu', 'max_milli_cpu')):
+    if low in params and high in params:
+      valid &= params[low] <= params[high]
+  return {name: values[valid] for name, values in params.items()}
+
+
+def configured_model(base_model, params, repeats):
+  model = copy.copy(base_model)
+  config = copy.copy(base_model.config)
+  for name, values in params.items():
+    values = np.repeat(values, repeats)
+    if name in ('threshold', 'target_utilization'):
+      setattr(model, name, values)
+    else:
+      setattr(config, name, values)
+  model.config = config
+  model.logic_config = config
+  return model
+
+
+def violation_seconds(result, slo_target):
+  in_range = result.times[np.newaxis, :] <= result.durations[:, np.newaxis]
+  violated = (result.cpu_usage > slo_target[:, np.newaxis]) & in_range
+  return violated.sum(axis=1) * simulator.sample_step_sec
+
+
+def overprovisioned_core_seconds(result, loads, lengths, slo_target):
+  in_range = result.times[np.newaxis, :] <= result.durations[:, np.newaxis]
+  load_index = np.minimum(result.times[np.newaxis, :] // simulator.load_step_sec, (lengths - 1)[:, np.newaxis])
+  load = np.take_along_axis(loads, load_index, axis=1)
+  needed = load / slo_target[:, np.newaxis] * 100 / 1000
+  surplus = np.clip(result.cpu_req - needed, 0, None) * in_range
+  return surplus.sum(axis=1) * simulator.sample_step_sec
+
+
+def evaluate_chunk(base_model, params, loads, lengths, seed):
+  configs = len(next(iter(params.values())))
+  profile_count = len(loads)
+  model = configured_model(base_model, params, profile_count)
+  rows_loads = np.tile(loads, (configs, 1))
+  rows_lengths = np.tile(lengths, configs)
+  result = simulator.simulate(model, rows_loads, seed, rows_lengths)
+  # The swept target_utilization only tunes the decision logic, every configuration is scored against the SLO target
+  # of the mapping, so that raising the target does not count as fewer violations.
+  slo_target = np.broadcast_to(base_model.target_utilization, (len(rows_loads),))
+
+  metrics = {
+    'violation_sec': violation_seconds(result, slo_target),
+    'overprovisioned_core_sec': overprovisioned_core_seconds(result, rows_loads, rows_lengths, slo_target),
+    'horizontal_actions': result.scaling_actions[:, simulator.HORIZONTAL],
+    'vertical_actions': result.scaling_actions[:, simulator.VERTICAL],
+    'api_calls_per_decision': result.api_calls_per_decision()
+  }
+  return {name: values.reshape(configs, profile_count) for name, values in metrics.items()}
+
+
+def chunked(params, size):
+  count = len(next(iter(params.values())))
+  for start in range(0, count, size):
+    yield {name: values[start:start + size] for name, values in params.items()}
+
+
+def sweep(base_model, profiles, params, seed=None, workers=max_workers, chunk_size=configs_per_chunk):
+  profile_names = list(profiles)
+  loads, lengths = simulator.load_matrix([profiles[name] for name in profile_names])
+  params = valid_params(params)
+  chunks = list(chunked(params, chunk_size))
+  seeds = itertools.count(seed) if seed is not None else itertools.repeat(None)
+
+  with ProcessPoolExecutor(max_workers=workers) as executor:
+    futures = [executor.submit(evaluate_chunk, base_model, chunk, loads, lengths, next(seeds)) for chunk in chunks]
+    parts = [future.result() for future in futures]
+
+  if parts:
+    metrics = {name: np.concatenate([part[name] for part in parts]) for name in metric_names}
+  else:
+    metrics = {name: np.empty((0, len(profile_names))) for name in metric_names}
+  return SweepResult(params, profile_names, metrics)
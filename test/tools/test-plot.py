@@ -1,1174 +1,9 @@
-import load_tester as test
+import os
+import sys
 
+import suite as test
 
-def mock_observe_load():
-  return {
-    'verticalelasticitystrategies': [1687017468, 1687017708, 1687017828, 1687017888, 1687017948, 1687018008, 1687018309,
-                                     1687018369, 1687018549, 1687018669],
-    'horizontalelasticitystrategies': [1687017528, 1687017588, 1687017648, 1687017768, 1687018068, 1687018128,
-                                       1687018189, 1687018249, 1687018429, 1687018489, 1687018609, 1687018729]
-  }
+archive_file = sys.argv[1] if len(sys.argv) > 1 else './fixtures/plot_test.archive'
 
-
-def mock_get_cpu_usage(start, end):
-  query = {'status': 'success', 'data': {'resultType': 'matrix', 'result': [{'metric': {
-    '__name__': 'polaris_composed_metrics_polaris_slo_cloud_github_io_v1_average_cpu_utilization',
-    'container': 'metrics-controller', 'endpoint': 'metrics', 'instance': '10.244.1.6:3000',
-    'job': 'average-cpu-utilization-metric-controller', 'metric_prop_key': 'averageCpuUtilization',
-    'namespace': 'polaris', 'pod': 'average-cpu-utilization-metric-controller-7fb69b97db-r98b4',
-    'service': 'average-cpu-utilization-metric-controller', 'target_gvk': 'apps/v1/Deployment',
-    'target_name': 'resource-consumer', 'target_namespace': 'polaris'}, 'values': [[1687017415, '53'],
-                                                                                   [1687017420, '50'],
-                                                                                   [1687017425, '52'],
-                                                                                   [1687017430, '65'],
-                                                                                   [1687017435, '69'],
-                                                                                   [1687017440, '73'],
-                                                                                   [1687017445, '78'],
-                                                                                   [1687017450, '73'],
-                                                                                   [1687017455, '75'],
-                                                                                   [1687017460, '90'],
-                                                                                   [1687017465, '94'],
-                                                                                   [1687017470, '96'],
-                                                                                   [1687017475, '91'],
-                                                                                   [1687017480, '89'],
-                                                                                   [1687017485, '71'],
-                                                                                   [1687017490, '67'],
-                                                                                   [1687017495, '64'],
-                                                                                   [1687017500, '60'],
-                                                                                   [1687017505, '56'],
-                                                                                   [1687017510, '53'],
-                                                                                   [1687017515, '50'],
-                                                                                   [1687017520, '50'],
-                                                                                   [1687017525, '50'],
-                                                                                   [1687017530, '53'],
-                                                                                   [1687017535, '51'],
-                                                                                   [1687017540, '32'],
-                                                                                   [1687017545, '25'],
-                                                                                   [1687017550, '45'],
-                                                                                   [1687017555, '49'],
-                                                                                   [1687017560, '53'],
-                                                                                   [1687017565, '57'],
-                                                                                   [1687017570, '60'],
-                                                                                   [1687017575, '57'],
-                                                                                   [1687017580, '69'],
-                                                                                   [1687017585, '67'],
-                                                                                   [1687017590, '69'],
-                                                                                   [1687017595, '71'],
-                                                                                   [1687017600, '66'],
-                                                                                   [1687017605, '66'],
-                                                                                   [1687017610, '49'],
-                                                                                   [1687017615, '49'],
-                                                                                   [1687017620, '49'],
-                                                                                   [1687017625, '49'],
-                                                                                   [1687017630, '45'],
-                                                                                   [1687017635, '40'],
-                                                                                   [1687017640, '66'],
-                                                                                   [1687017645, '68'],
-                                                                                   [1687017650, '70'],
-                                                                                   [1687017655, '68'],
-                                                                                   [1687017660, '66'],
-                                                                                   [1687017665, '58'],
-                                                                                   [1687017670, '53'],
-                                                                                   [1687017675, '54'],
-                                                                                   [1687017680, '55'],
-                                                                                   [1687017685, '57'],
-                                                                                   [1687017690, '53'],
-                                                                                   [1687017695, '51'],
-                                                                                   [1687017700, '64'],
-                                                                                   [1687017705, '66'],
-                                                                                   [1687017710, '67'],
-                                                                                   [1687017715, '63'],
-                                                                                   [1687017720, '63'],
-                                                                                   [1687017725, '59'],
-                                                                                   [1687017730, '57'],
-                                                                                   [1687017735, '57'],
-                                                                                   [1687017740, '57'],
-                                                                                   [1687017745, '54'],
-                                                                                   [1687017750, '48'],
-                                                                                   [1687017755, '47'],
-                                                                                   [1687017760, '54'],
-                                                                                   [1687017765, '50'],
-                                                                                   [1687017770, '48'],
-                                                                                   [1687017775, '46'],
-                                                                                   [1687017780, '44'],
-                                                                                   [1687017785, '37'],
-                                                                                   [1687017790, '75'],
-                                                                                   [1687017795, '77'],
-                                                                                   [1687017800, '78'],
-                                                                                   [1687017805, '66'],
-                                                                                   [1687017810, '58'],
-                                                                                   [1687017815, '56'],
-                                                                                   [1687017820, '68'],
-                                                                                   [1687017825, '72'],
-                                                                                   [1687017830, '74'],
-                                                                                   [1687017835, '72'],
-                                                                                   [1687017840, '74'],
-                                                                                   [1687017845, '74'],
-                                                                                   [1687017850, '74'],
-                                                                                   [1687017855, '74'],
-                                                                                   [1687017860, '74'],
-                                                                                   [1687017865, '71'],
-                                                                                   [1687017870, '68'],
-                                                                                   [1687017875, '61'],
-                                                                                   [1687017880, '67'],
-                                                                                   [1687017885, '64'],
-                                                                                   [1687017890, '60'],
-                                                                                   [1687017895, '54'],
-                                                                                   [1687017900, '53'],
-                                                                                   [1687017905, '40'],
-                                                                                   [1687017910, '45'],
-                                                                                   [1687017915, '43'],
-                                                                                   [1687017920, '43'],
-                                                                                   [1687017925, '28'],
-                                                                                   [1687017930, '26'],
-                                                                                   [1687017935, '23'],
-                                                                                   [1687017940, '34'],
-                                                                                   [1687017945, '34'],
-                                                                                   [1687017950, '35'],
-                                                                                   [1687017955, '36'],
-                                                                                   [1687017960, '35'],
-                                                                                   [1687017965, '36'],
-                                                                                   [1687017970, '52'],
-                                                                                   [1687017975, '54'],
-                                                                                   [1687017980, '53'],
-                                                                                   [1687017985, '52'],
-                                                                                   [1687017990, '47'],
-                                                                                   [1687017995, '39'],
-                                                                                   [1687018000, '40'],
-                                                                                   [1687018005, '40'],
-                                                                                   [1687018010, '40'],
-                                                                                   [1687018015, '41'],
-                                                                                   [1687018020, '42'],
-                                                                                   [1687018025, '42'],
-                                                                                   [1687018030, '59'],
-                                                                                   [1687018035, '60'],
-                                                                                   [1687018040, '61'],
-                                                                                   [1687018045, '61'],
-                                                                                   [1687018050, '51'],
-                                                                                   [1687018055, '40'],
-                                                                                   [1687018060, '44'],
-                                                                                   [1687018065, '45'],
-                                                                                   [1687018070, '46'],
-                                                                                   [1687018075, '47'],
-                                                                                   [1687018080, '48'],
-                                                                                   [1687018085, '47'],
-                                                                                   [1687018090, '82'],
-                                                                                   [1687018095, '85'],
-                                                                                   [1687018100, '84'],
-                                                                                   [1687018105, '76'],
-                                                                                   [1687018110, '75'],
-                                                                                   [1687018115, '64'],
-                                                                                   [1687018120, '69'],
-                                                                                   [1687018125, '71'],
-                                                                                   [1687018130, '74'],
-                                                                                   [1687018135, '73'],
-                                                                                   [1687018140, '74'],
-                                                                                   [1687018145, '71'],
-                                                                                   [1687018150, '57'],
-                                                                                   [1687018155, '59'],
-                                                                                   [1687018160, '60'],
-                                                                                   [1687018165, '58'],
-                                                                                   [1687018170, '56'],
-                                                                                   [1687018175, '55'],
-                                                                                   [1687018180, '67'],
-                                                                                   [1687018185, '67'],
-                                                                                   [1687018190, '68'],
-                                                                                   [1687018195, '67'],
-                                                                                   [1687018200, '63'],
-                                                                                   [1687018205, '60'],
-                                                                                   [1687018210, '78'],
-                                                                                   [1687018215, '79'],
-                                                                                   [1687018220, '75'],
-                                                                                   [1687018225, '69'],
-                                                                                   [1687018230, '65'],
-                                                                                   [1687018235, '65'],
-                                                                                   [1687018240, '86'],
-                                                                                   [1687018245, '87'],
-                                                                                   [1687018250, '89'],
-                                                                                   [1687018255, '85'],
-                                                                                   [1687018260, '81'],
-                                                                                   [1687018265, '76'],
-                                                                                   [1687018270, '92'],
-                                                                                   [1687018275, '92'],
-                                                                                   [1687018280, '91'],
-                                                                                   [1687018285, '92'],
-                                                                                   [1687018290, '83'],
-                                                                                   [1687018295, '79'],
-                                                                                   [1687018300, '91'],
-                                                                                   [1687018305, '91'],
-                                                                                   [1687018310, '91'],
-                                                                                   [1687018315, '88'],
-                                                                                   [1687018320, '82'],
-                                                                                   [1687018325, '76'],
-                                                                                   [1687018330, '68'],
-                                                                                   [1687018335, '65'],
-                                                                                   [1687018340, '62'],
-                                                                                   [1687018345, '59'],
-                                                                                   [1687018350, '54'],
-                                                                                   [1687018355, '50'],
-                                                                                   [1687018360, '52'],
-                                                                                   [1687018365, '49'],
-                                                                                   [1687018370, '47'],
-                                                                                   [1687018375, '44'],
-                                                                                   [1687018380, '23'],
-                                                                                   [1687018385, '16'],
-                                                                                   [1687018390, '51'],
-                                                                                   [1687018395, '54'],
-                                                                                   [1687018400, '56'],
-                                                                                   [1687018405, '56'],
-                                                                                   [1687018410, '55'],
-                                                                                   [1687018415, '54'],
-                                                                                   [1687018420, '62'],
-                                                                                   [1687018425, '65'],
-                                                                                   [1687018430, '69'],
-                                                                                   [1687018435, '72'],
-                                                                                   [1687018440, '71'],
-                                                                                   [1687018445, '67'],
-                                                                                   [1687018450, '81'],
-                                                                                   [1687018455, '82'],
-                                                                                   [1687018460, '81'],
-                                                                                   [1687018465, '74'],
-                                                                                   [1687018470, '68'],
-                                                                                   [1687018475, '62'],
-                                                                                   [1687018480, '78'],
-                                                                                   [1687018485, '78'],
-                                                                                   [1687018490, '77'],
-                                                                                   [1687018495, '74'],
-                                                                                   [1687018500, '66'],
-                                                                                   [1687018505, '61'],
-                                                                                   [1687018510, '76'],
-                                                                                   [1687018515, '76'],
-                                                                                   [1687018520, '75'],
-                                                                                   [1687018525, '73'],
-                                                                                   [1687018530, '70'],
-                                                                                   [1687018535, '66'],
-                                                                                   [1687018540, '73'],
-                                                                                   [1687018545, '73'],
-                                                                                   [1687018550, '71'],
-                                                                                   [1687018555, '69'],
-                                                                                   [1687018560, '66'],
-                                                                                   [1687018565, '64'],
-                                                                                   [1687018570, '64'],
-                                                                                   [1687018575, '62'],
-                                                                                   [1687018580, '57'],
-                                                                                   [1687018585, '51'],
-                                                                                   [1687018590, '46'],
-                                                                                   [1687018595, '44'],
-                                                                                   [1687018600, '41'],
-                                                                                   [1687018605, '40'],
-                                                                                   [1687018610, '38'],
-                                                                                   [1687018615, '32'],
-                                                                                   [1687018620, '26'],
-                                                                                   [1687018625, '15'],
-                                                                                   [1687018630, '41'],
-                                                                                   [1687018635, '41'],
-                                                                                   [1687018640, '43'],
-                                                                                   [1687018645, '44'],
-                                                                                   [1687018650, '37'],
-                                                                                   [1687018655, '32'],
-                                                                                   [1687018660, '52'],
-                                                                                   [1687018665, '55'],
-                                                                                   [1687018670, '57'],
-                                                                                   [1687018675, '60'],
-                                                                                   [1687018680, '59'],
-                                                                                   [1687018685, '57'],
-                                                                                   [1687018690, '48'],
-                                                                                   [1687018695, '47'],
-                                                                                   [1687018700, '46'],
-                                                                                   [1687018705, '43'],
-                                                                                   [1687018710, '41'],
-                                                                                   [1687018715, '41'],
-                                                                                   [1687018720, '48'],
-                                                                                   [1687018725, '45'],
-                                                                                   [1687018730, '39'],
-                                                                                   [1687018735, '31']]}]}}
-  result = test.extract_query_result(query)
-  return [[test.correct_time(sublist[0], start), float(sublist[1])] for sublist in result]
-
-
-def mock_get_cpu_resource_req(deployment, start, end):
-  query = {'status': 'success', 'data': {'resultType': 'matrix', 'result': [{'metric': {},
-                                                                             'values': [[1687017345, '0.1'],
-                                                                                        [1687017350, '0.1'],
-                                                                                        [1687017355, '0.1'],
-                                                                                        [1687017360, '0.1'],
-                                                                                        [1687017365, '0.1'],
-                                                                                        [1687017370, '0.1'],
-                                                                                        [1687017375, '0.1'],
-                                                                                        [1687017380, '0.1'],
-                                                                                        [1687017385, '0.1'],
-                                                                                        [1687017390, '0.1'],
-                                                                                        [1687017395, '0.1'],
-                                                                                        [1687017400, '0.1'],
-                                                                                        [1687017405, '0.1'],
-                                                                                        [1687017410, '0.1'],
-                                                                                        [1687017415, '0.1'],
-                                                                                        [1687017420, '0.1'],
-                                                                                        [1687017425, '0.1'],
-                                                                                        [1687017430, '0.1'],
-                                                                                        [1687017435, '0.1'],
-                                                                                        [1687017440, '0.1'],
-                                                                                        [1687017445, '0.1'],
-                                                                                        [1687017450, '0.1'],
-                                                                                        [1687017455, '0.1'],
-                                                                                        [1687017460, '0.1'],
-                                                                                        [1687017465, '0.1'],
-                                                                                        [1687017470, '0.1'],
-                                                                                        [1687017475, '0.1'],
-                                                                                        [1687017480, '0.1'],
-                                                                                        [1687017485, '0.1'],
-                                                                                        [1687017490, '0.1'],
-                                                                                        [1687017495, '0.11'],
-                                                                                        [1687017500, '0.11'],
-                                                                                        [1687017505, '0.11'],
-                                                                                        [1687017510, '0.11'],
-                                                                                        [1687017515, '0.11'],
-                                                                                        [1687017520, '0.11'],
-                                                                                        [1687017525, '0.11'],
-                                                                                        [1687017530, '0.11'],
-                                                                                        [1687017535, '0.11'],
-                                                                                        [1687017540, '0.11'],
-                                                                                        [1687017545, '0.11'],
-                                                                                        [1687017550, '0.11'],
-                                                                                        [1687017555, '0.11'],
-                                                                                        [1687017560, '0.11'],
-                                                                                        [1687017565, '0.11'],
-                                                                                        [1687017570, '0.11'],
-                                                                                        [1687017575, '0.11'],
-                                                                                        [1687017580, '0.11'],
-                                                                                        [1687017585, '0.11'],
-                                                                                        [1687017590, '0.11'],
-                                                                                        [1687017595, '0.11'],
-                                                                                        [1687017600, '0.11'],
-                                                                                        [1687017605, '0.11'],
-                                                                                        [1687017610, '0.11'],
-                                                                                        [1687017615, '0.22'],
-                                                                                        [1687017620, '0.22'],
-                                                                                        [1687017625, '0.22'],
-                                                                                        [1687017630, '0.22'],
-                                                                                        [1687017635, '0.22'],
-                                                                                        [1687017640, '0.22'],
-                                                                                        [1687017645, '0.22'],
-                                                                                        [1687017650, '0.22'],
-                                                                                        [1687017655, '0.22'],
-                                                                                        [1687017660, '0.22'],
-                                                                                        [1687017665, '0.22'],
-                                                                                        [1687017670, '0.22'],
-                                                                                        [1687017675, '0.33'],
-                                                                                        [1687017680, '0.33'],
-                                                                                        [1687017685, '0.33'],
-                                                                                        [1687017690, '0.33'],
-                                                                                        [1687017695, '0.33'],
-                                                                                        [1687017700, '0.33'],
-                                                                                        [1687017705, '0.33'],
-                                                                                        [1687017710, '0.33'],
-                                                                                        [1687017715, '0.33'],
-                                                                                        [1687017720, '0.33'],
-                                                                                        [1687017725, '0.33'],
-                                                                                        [1687017730, '0.33'],
-                                                                                        [1687017735, '0.363'],
-                                                                                        [1687017740, '0.363'],
-                                                                                        [1687017745, '0.363'],
-                                                                                        [1687017750, '0.363'],
-                                                                                        [1687017755, '0.363'],
-                                                                                        [1687017760, '0.363'],
-                                                                                        [1687017765, '0.363'],
-                                                                                        [1687017770, '0.363'],
-                                                                                        [1687017775, '0.363'],
-                                                                                        [1687017780, '0.363'],
-                                                                                        [1687017785, '0.363'],
-                                                                                        [1687017790, '0.363'],
-                                                                                        [1687017795, '0.363'],
-                                                                                        [1687017800, '0.363'],
-                                                                                        [1687017805, '0.363'],
-                                                                                        [1687017810, '0.363'],
-                                                                                        [1687017815, '0.363'],
-                                                                                        [1687017820, '0.363'],
-                                                                                        [1687017825, '0.363'],
-                                                                                        [1687017830, '0.363'],
-                                                                                        [1687017835, '0.363'],
-                                                                                        [1687017840, '0.363'],
-                                                                                        [1687017845, '0.363'],
-                                                                                        [1687017850, '0.363'],
-                                                                                        [1687017855, '0.402'],
-                                                                                        [1687017860, '0.402'],
-                                                                                        [1687017865, '0.402'],
-                                                                                        [1687017870, '0.402'],
-                                                                                        [1687017875, '0.402'],
-                                                                                        [1687017880, '0.402'],
-                                                                                        [1687017885, '0.402'],
-                                                                                        [1687017890, '0.402'],
-                                                                                        [1687017895, '0.402'],
-                                                                                        [1687017900, '0.402'],
-                                                                                        [1687017905, '0.402'],
-                                                                                        [1687017910, '0.402'],
-                                                                                        [1687017915,
-                                                                                         '0.44399999999999995'],
-                                                                                        [1687017920,
-                                                                                         '0.44399999999999995'],
-                                                                                        [1687017925,
-                                                                                         '0.44399999999999995'],
-                                                                                        [1687017930,
-                                                                                         '0.44399999999999995'],
-                                                                                        [1687017935,
-                                                                                         '0.44399999999999995'],
-                                                                                        [1687017940,
-                                                                                         '0.44399999999999995'],
-                                                                                        [1687017945,
-                                                                                         '0.44399999999999995'],
-                                                                                        [1687017950,
-                                                                                         '0.44399999999999995'],
-                                                                                        [1687017955,
-                                                                                         '0.44399999999999995'],
-                                                                                        [1687017960,
-                                                                                         '0.44399999999999995'],
-                                                                                        [1687017965,
-                                                                                         '0.44399999999999995'],
-                                                                                        [1687017970,
-                                                                                         '0.44399999999999995'],
-                                                                                        [1687017975, '0.402'],
-                                                                                        [1687017980, '0.402'],
-                                                                                        [1687017985, '0.402'],
-                                                                                        [1687017990, '0.402'],
-                                                                                        [1687017995, '0.402'],
-                                                                                        [1687018000, '0.402'],
-                                                                                        [1687018005, '0.402'],
-                                                                                        [1687018010, '0.402'],
-                                                                                        [1687018015, '0.402'],
-                                                                                        [1687018020, '0.402'],
-                                                                                        [1687018025, '0.402'],
-                                                                                        [1687018030, '0.402'],
-                                                                                        [1687018035, '0.363'],
-                                                                                        [1687018040, '0.363'],
-                                                                                        [1687018045, '0.363'],
-                                                                                        [1687018050, '0.363'],
-                                                                                        [1687018055, '0.363'],
-                                                                                        [1687018060, '0.363'],
-                                                                                        [1687018065, '0.363'],
-                                                                                        [1687018070, '0.363'],
-                                                                                        [1687018075, '0.363'],
-                                                                                        [1687018080, '0.363'],
-                                                                                        [1687018085, '0.363'],
-                                                                                        [1687018090, '0.363'],
-                                                                                        [1687018095, '0.363'],
-                                                                                        [1687018100, '0.363'],
-                                                                                        [1687018105, '0.363'],
-                                                                                        [1687018110, '0.363'],
-                                                                                        [1687018115, '0.363'],
-                                                                                        [1687018120, '0.363'],
-                                                                                        [1687018125, '0.363'],
-                                                                                        [1687018130, '0.363'],
-                                                                                        [1687018135, '0.363'],
-                                                                                        [1687018140, '0.363'],
-                                                                                        [1687018145, '0.363'],
-                                                                                        [1687018150, '0.363'],
-                                                                                        [1687018155, '0.605'],
-                                                                                        [1687018160, '0.605'],
-                                                                                        [1687018165, '0.605'],
-                                                                                        [1687018170, '0.605'],
-                                                                                        [1687018175, '0.605'],
-                                                                                        [1687018180, '0.605'],
-                                                                                        [1687018185, '0.605'],
-                                                                                        [1687018190, '0.605'],
-                                                                                        [1687018195, '0.605'],
-                                                                                        [1687018200, '0.605'],
-                                                                                        [1687018205, '0.605'],
-                                                                                        [1687018210, '0.605'],
-                                                                                        [1687018215, '0.605'],
-                                                                                        [1687018220, '0.605'],
-                                                                                        [1687018225, '0.605'],
-                                                                                        [1687018230, '0.605'],
-                                                                                        [1687018235, '0.605'],
-                                                                                        [1687018240, '0.605'],
-                                                                                        [1687018245, '0.605'],
-                                                                                        [1687018250, '0.605'],
-                                                                                        [1687018255, '0.605'],
-                                                                                        [1687018260, '0.605'],
-                                                                                        [1687018265, '0.605'],
-                                                                                        [1687018270, '0.605'],
-                                                                                        [1687018275, '0.605'],
-                                                                                        [1687018280, '0.605'],
-                                                                                        [1687018285, '0.605'],
-                                                                                        [1687018290, '0.605'],
-                                                                                        [1687018295, '0.605'],
-                                                                                        [1687018300, '0.605'],
-                                                                                        [1687018305, '0.605'],
-                                                                                        [1687018310, '0.605'],
-                                                                                        [1687018315, '0.605'],
-                                                                                        [1687018320, '0.605'],
-                                                                                        [1687018325, '0.605'],
-                                                                                        [1687018330, '0.605'],
-                                                                                        [1687018335, '0.67'],
-                                                                                        [1687018340, '0.67'],
-                                                                                        [1687018345, '0.67'],
-                                                                                        [1687018350, '0.67'],
-                                                                                        [1687018355, '0.67'],
-                                                                                        [1687018360, '0.67'],
-                                                                                        [1687018365, '0.67'],
-                                                                                        [1687018370, '0.67'],
-                                                                                        [1687018375, '0.67'],
-                                                                                        [1687018380, '0.67'],
-                                                                                        [1687018385, '0.67'],
-                                                                                        [1687018390, '0.67'],
-                                                                                        [1687018395, '0.67'],
-                                                                                        [1687018400, '0.67'],
-                                                                                        [1687018405, '0.67'],
-                                                                                        [1687018410, '0.67'],
-                                                                                        [1687018415, '0.67'],
-                                                                                        [1687018420, '0.67'],
-                                                                                        [1687018425, '0.67'],
-                                                                                        [1687018430, '0.67'],
-                                                                                        [1687018435, '0.67'],
-                                                                                        [1687018440, '0.67'],
-                                                                                        [1687018445, '0.67'],
-                                                                                        [1687018450, '0.67'],
-                                                                                        [1687018455, '0.67'],
-                                                                                        [1687018460, '0.67'],
-                                                                                        [1687018465, '0.67'],
-                                                                                        [1687018470, '0.67'],
-                                                                                        [1687018475, '0.67'],
-                                                                                        [1687018480, '0.67'],
-                                                                                        [1687018485, '0.67'],
-                                                                                        [1687018490, '0.67'],
-                                                                                        [1687018495, '0.67'],
-                                                                                        [1687018500, '0.67'],
-                                                                                        [1687018505, '0.67'],
-                                                                                        [1687018510, '0.67'],
-                                                                                        [1687018515, '0.67'],
-                                                                                        [1687018520, '0.67'],
-                                                                                        [1687018525, '0.67'],
-                                                                                        [1687018530, '0.67'],
-                                                                                        [1687018535, '0.67'],
-                                                                                        [1687018540, '0.67'],
-                                                                                        [1687018545, '0.67'],
-                                                                                        [1687018550, '0.67'],
-                                                                                        [1687018555, '0.67'],
-                                                                                        [1687018560, '0.67'],
-                                                                                        [1687018565, '0.67'],
-                                                                                        [1687018570, '0.67'],
-                                                                                        [1687018575, '0.74'],
-                                                                                        [1687018580, '0.74'],
-                                                                                        [1687018585, '0.74'],
-                                                                                        [1687018590, '0.74'],
-                                                                                        [1687018595, '0.74'],
-                                                                                        [1687018600, '0.74'],
-                                                                                        [1687018605, '0.74'],
-                                                                                        [1687018610, '0.74'],
-                                                                                        [1687018615, '0.74'],
-                                                                                        [1687018620, '0.74'],
-                                                                                        [1687018625, '0.74'],
-                                                                                        [1687018630, '0.74'],
-                                                                                        [1687018635, '0.592'],
-                                                                                        [1687018640, '0.592'],
-                                                                                        [1687018645, '0.592'],
-                                                                                        [1687018650, '0.592'],
-                                                                                        [1687018655, '0.592'],
-                                                                                        [1687018660, '0.592'],
-                                                                                        [1687018665, '0.592'],
-                                                                                        [1687018670, '0.592'],
-                                                                                        [1687018675, '0.592'],
-                                                                                        [1687018680, '0.592'],
-                                                                                        [1687018685, '0.592'],
-                                                                                        [1687018690, '0.592'],
-                                                                                        [1687018695, '0.652'],
-                                                                                        [1687018700, '0.652'],
-                                                                                        [1687018705, '0.652'],
-                                                                                        [1687018710, '0.652'],
-                                                                                        [1687018715, '0.652'],
-                                                                                        [1687018720, '0.652'],
-                                                                                        [1687018725, '0.652'],
-                                                                                        [1687018730, '0.652'],
-                                                                                        [1687018735, '0.652']]}]}}
-  result = test.extract_query_result(query)
-  return [[test.correct_time(sublist[0], start), float(sublist[1])] for sublist in result]
-
-
-def mock_get_container_resource_req(deployment, start, end):
-  query = {'status': 'success', 'data': {'resultType': 'matrix', 'result': [{'metric': {},
-                                                                             'values': [[1687017345, '52428800'],
-                                                                                        [1687017350, '52428800'],
-                                                                                        [1687017355, '52428800'],
-                                                                                        [1687017360, '52428800'],
-                                                                                        [1687017365, '52428800'],
-                                                                                        [1687017370, '52428800'],
-                                                                                        [1687017375, '52428800'],
-                                                                                        [1687017380, '52428800'],
-                                                                                        [1687017385, '52428800'],
-                                                                                        [1687017390, '52428800'],
-                                                                                        [1687017395, '52428800'],
-                                                                                        [1687017400, '52428800'],
-                                                                                        [1687017405, '52428800'],
-                                                                                        [1687017410, '52428800'],
-                                                                                        [1687017415, '52428800'],
-                                                                                        [1687017420, '52428800'],
-                                                                                        [1687017425, '52428800'],
-                                                                                        [1687017430, '52428800'],
-                                                                                        [1687017435, '52428800'],
-                                                                                        [1687017440, '52428800'],
-                                                                                        [1687017445, '52428800'],
-                                                                                        [1687017450, '52428800'],
-                                                                                        [1687017455, '52428800'],
-                                                                                        [1687017460, '52428800'],
-                                                                                        [1687017465, '52428800'],
-                                                                                        [1687017470, '52428800'],
-                                                                                        [1687017475, '52428800'],
-                                                                                        [1687017480, '52428800'],
-                                                                                        [1687017485, '52428800'],
-                                                                                        [1687017490, '52428800'],
-                                                                                        [1687017495, '57671680'],
-                                                                                        [1687017500, '57671680'],
-                                                                                        [1687017505, '57671680'],
-                                                                                        [1687017510, '57671680'],
-                                                                                        [1687017515, '57671680'],
-                                                                                        [1687017520, '57671680'],
-                                                                                        [1687017525, '57671680'],
-                                                                                        [1687017530, '57671680'],
-                                                                                        [1687017535, '57671680'],
-                                                                                        [1687017540, '57671680'],
-                                                                                        [1687017545, '57671680'],
-                                                                                        [1687017550, '57671680'],
-                                                                                        [1687017555, '57671680'],
-                                                                                        [1687017560, '57671680'],
-                                                                                        [1687017565, '57671680'],
-                                                                                        [1687017570, '57671680'],
-                                                                                        [1687017575, '57671680'],
-                                                                                        [1687017580, '57671680'],
-                                                                                        [1687017585, '57671680'],
-                                                                                        [1687017590, '57671680'],
-                                                                                        [1687017595, '57671680'],
-                                                                                        [1687017600, '57671680'],
-                                                                                        [1687017605, '57671680'],
-                                                                                        [1687017610, '57671680'],
-                                                                                        [1687017615, '115343360'],
-                                                                                        [1687017620, '115343360'],
-                                                                                        [1687017625, '115343360'],
-                                                                                        [1687017630, '115343360'],
-                                                                                        [1687017635, '115343360'],
-                                                                                        [1687017640, '115343360'],
-                                                                                        [1687017645, '115343360'],
-                                                                                        [1687017650, '115343360'],
-                                                                                        [1687017655, '115343360'],
-                                                                                        [1687017660, '115343360'],
-                                                                                        [1687017665, '115343360'],
-                                                                                        [1687017670, '115343360'],
-                                                                                        [1687017675, '173015040'],
-                                                                                        [1687017680, '173015040'],
-                                                                                        [1687017685, '173015040'],
-                                                                                        [1687017690, '173015040'],
-                                                                                        [1687017695, '173015040'],
-                                                                                        [1687017700, '173015040'],
-                                                                                        [1687017705, '173015040'],
-                                                                                        [1687017710, '173015040'],
-                                                                                        [1687017715, '173015040'],
-                                                                                        [1687017720, '173015040'],
-                                                                                        [1687017725, '173015040'],
-                                                                                        [1687017730, '173015040'],
-                                                                                        [1687017735, '191889408'],
-                                                                                        [1687017740, '191889408'],
-                                                                                        [1687017745, '191889408'],
-                                                                                        [1687017750, '191889408'],
-                                                                                        [1687017755, '191889408'],
-                                                                                        [1687017760, '191889408'],
-                                                                                        [1687017765, '191889408'],
-                                                                                        [1687017770, '191889408'],
-                                                                                        [1687017775, '191889408'],
-                                                                                        [1687017780, '191889408'],
-                                                                                        [1687017785, '191889408'],
-                                                                                        [1687017790, '191889408'],
-                                                                                        [1687017795, '191889408'],
-                                                                                        [1687017800, '191889408'],
-                                                                                        [1687017805, '191889408'],
-                                                                                        [1687017810, '191889408'],
-                                                                                        [1687017815, '191889408'],
-                                                                                        [1687017820, '191889408'],
-                                                                                        [1687017825, '191889408'],
-                                                                                        [1687017830, '191889408'],
-                                                                                        [1687017835, '191889408'],
-                                                                                        [1687017840, '191889408'],
-                                                                                        [1687017845, '191889408'],
-                                                                                        [1687017850, '191889408'],
-                                                                                        [1687017855, '213909504'],
-                                                                                        [1687017860, '213909504'],
-                                                                                        [1687017865, '213909504'],
-                                                                                        [1687017870, '213909504'],
-                                                                                        [1687017875, '213909504'],
-                                                                                        [1687017880, '213909504'],
-                                                                                        [1687017885, '213909504'],
-                                                                                        [1687017890, '213909504'],
-                                                                                        [1687017895, '213909504'],
-                                                                                        [1687017900, '213909504'],
-                                                                                        [1687017905, '213909504'],
-                                                                                        [1687017910, '213909504'],
-                                                                                        [1687017915, '235929600'],
-                                                                                        [1687017920, '235929600'],
-                                                                                        [1687017925, '235929600'],
-                                                                                        [1687017930, '235929600'],
-                                                                                        [1687017935, '235929600'],
-                                                                                        [1687017940, '235929600'],
-                                                                                        [1687017945, '235929600'],
-                                                                                        [1687017950, '235929600'],
-                                                                                        [1687017955, '235929600'],
-                                                                                        [1687017960, '235929600'],
-                                                                                        [1687017965, '235929600'],
-                                                                                        [1687017970, '235929600'],
-                                                                                        [1687017975, '213909504'],
-                                                                                        [1687017980, '213909504'],
-                                                                                        [1687017985, '213909504'],
-                                                                                        [1687017990, '213909504'],
-                                                                                        [1687017995, '213909504'],
-                                                                                        [1687018000, '213909504'],
-                                                                                        [1687018005, '213909504'],
-                                                                                        [1687018010, '213909504'],
-                                                                                        [1687018015, '213909504'],
-                                                                                        [1687018020, '213909504'],
-                                                                                        [1687018025, '213909504'],
-                                                                                        [1687018030, '213909504'],
-                                                                                        [1687018035, '195035136'],
-                                                                                        [1687018040, '195035136'],
-                                                                                        [1687018045, '195035136'],
-                                                                                        [1687018050, '195035136'],
-                                                                                        [1687018055, '195035136'],
-                                                                                        [1687018060, '195035136'],
-                                                                                        [1687018065, '195035136'],
-                                                                                        [1687018070, '195035136'],
-                                                                                        [1687018075, '195035136'],
-                                                                                        [1687018080, '195035136'],
-                                                                                        [1687018085, '195035136'],
-                                                                                        [1687018090, '195035136'],
-                                                                                        [1687018095, '195035136'],
-                                                                                        [1687018100, '195035136'],
-                                                                                        [1687018105, '195035136'],
-                                                                                        [1687018110, '195035136'],
-                                                                                        [1687018115, '195035136'],
-                                                                                        [1687018120, '195035136'],
-                                                                                        [1687018125, '195035136'],
-                                                                                        [1687018130, '195035136'],
-                                                                                        [1687018135, '195035136'],
-                                                                                        [1687018140, '195035136'],
-                                                                                        [1687018145, '195035136'],
-                                                                                        [1687018150, '195035136'],
-                                                                                        [1687018155, '325058560'],
-                                                                                        [1687018160, '325058560'],
-                                                                                        [1687018165, '325058560'],
-                                                                                        [1687018170, '325058560'],
-                                                                                        [1687018175, '325058560'],
-                                                                                        [1687018180, '325058560'],
-                                                                                        [1687018185, '325058560'],
-                                                                                        [1687018190, '325058560'],
-                                                                                        [1687018195, '325058560'],
-                                                                                        [1687018200, '325058560'],
-                                                                                        [1687018205, '325058560'],
-                                                                                        [1687018210, '325058560'],
-                                                                                        [1687018215, '325058560'],
-                                                                                        [1687018220, '325058560'],
-                                                                                        [1687018225, '325058560'],
-                                                                                        [1687018230, '325058560'],
-                                                                                        [1687018235, '325058560'],
-                                                                                        [1687018240, '325058560'],
-                                                                                        [1687018245, '325058560'],
-                                                                                        [1687018250, '325058560'],
-                                                                                        [1687018255, '325058560'],
-                                                                                        [1687018260, '325058560'],
-                                                                                        [1687018265, '325058560'],
-                                                                                        [1687018270, '325058560'],
-                                                                                        [1687018275, '325058560'],
-                                                                                        [1687018280, '325058560'],
-                                                                                        [1687018285, '325058560'],
-                                                                                        [1687018290, '325058560'],
-                                                                                        [1687018295, '325058560'],
-                                                                                        [1687018300, '325058560'],
-                                                                                        [1687018305, '325058560'],
-                                                                                        [1687018310, '325058560'],
-                                                                                        [1687018315, '325058560'],
-                                                                                        [1687018320, '325058560'],
-                                                                                        [1687018325, '325058560'],
-                                                                                        [1687018330, '325058560'],
-                                                                                        [1687018335, '361758720'],
-                                                                                        [1687018340, '361758720'],
-                                                                                        [1687018345, '361758720'],
-                                                                                        [1687018350, '361758720'],
-                                                                                        [1687018355, '361758720'],
-                                                                                        [1687018360, '361758720'],
-                                                                                        [1687018365, '361758720'],
-                                                                                        [1687018370, '361758720'],
-                                                                                        [1687018375, '361758720'],
-                                                                                        [1687018380, '361758720'],
-                                                                                        [1687018385, '361758720'],
-                                                                                        [1687018390, '361758720'],
-                                                                                        [1687018395, '361758720'],
-                                                                                        [1687018400, '361758720'],
-                                                                                        [1687018405, '361758720'],
-                                                                                        [1687018410, '361758720'],
-                                                                                        [1687018415, '361758720'],
-                                                                                        [1687018420, '361758720'],
-                                                                                        [1687018425, '361758720'],
-                                                                                        [1687018430, '361758720'],
-                                                                                        [1687018435, '361758720'],
-                                                                                        [1687018440, '361758720'],
-                                                                                        [1687018445, '361758720'],
-                                                                                        [1687018450, '361758720'],
-                                                                                        [1687018455, '361758720'],
-                                                                                        [1687018460, '361758720'],
-                                                                                        [1687018465, '361758720'],
-                                                                                        [1687018470, '361758720'],
-                                                                                        [1687018475, '361758720'],
-                                                                                        [1687018480, '361758720'],
-                                                                                        [1687018485, '361758720'],
-                                                                                        [1687018490, '361758720'],
-                                                                                        [1687018495, '361758720'],
-                                                                                        [1687018500, '361758720'],
-                                                                                        [1687018505, '361758720'],
-                                                                                        [1687018510, '361758720'],
-                                                                                        [1687018515, '361758720'],
-                                                                                        [1687018520, '361758720'],
-                                                                                        [1687018525, '361758720'],
-                                                                                        [1687018530, '361758720'],
-                                                                                        [1687018535, '361758720'],
-                                                                                        [1687018540, '361758720'],
-                                                                                        [1687018545, '361758720'],
-                                                                                        [1687018550, '361758720'],
-                                                                                        [1687018555, '361758720'],
-                                                                                        [1687018560, '361758720'],
-                                                                                        [1687018565, '361758720'],
-                                                                                        [1687018570, '361758720'],
-                                                                                        [1687018575, '398458880'],
-                                                                                        [1687018580, '398458880'],
-                                                                                        [1687018585, '398458880'],
-                                                                                        [1687018590, '398458880'],
-                                                                                        [1687018595, '398458880'],
-                                                                                        [1687018600, '398458880'],
-                                                                                        [1687018605, '398458880'],
-                                                                                        [1687018610, '398458880'],
-                                                                                        [1687018615, '398458880'],
-                                                                                        [1687018620, '398458880'],
-                                                                                        [1687018625, '398458880'],
-                                                                                        [1687018630, '398458880'],
-                                                                                        [1687018635, '318767104'],
-                                                                                        [1687018640, '318767104'],
-                                                                                        [1687018645, '318767104'],
-                                                                                        [1687018650, '318767104'],
-                                                                                        [1687018655, '318767104'],
-                                                                                        [1687018660, '318767104'],
-                                                                                        [1687018665, '318767104'],
-                                                                                        [1687018670, '318767104'],
-                                                                                        [1687018675, '318767104'],
-                                                                                        [1687018680, '318767104'],
-                                                                                        [1687018685, '318767104'],
-                                                                                        [1687018690, '318767104'],
-                                                                                        [1687018695, '352321536'],
-                                                                                        [1687018700, '352321536'],
-                                                                                        [1687018705, '352321536'],
-                                                                                        [1687018710, '352321536'],
-                                                                                        [1687018715, '352321536'],
-                                                                                        [1687018720, '352321536'],
-                                                                                        [1687018725, '352321536'],
-                                                                                        [1687018730, '352321536'],
-                                                                                        [1687018735, '352321536']]}]}}
-  result = test.extract_query_result(query)
-  return [[test.correct_time(sublist[0], start), float(sublist[1])] for sublist in result]
-
-
-def mock_get_replica_count(deployment, start, end):
-  query = {'status': 'success', 'data': {'resultType': 'matrix', 'result': [{'metric': {
-    '__name__': 'kube_deployment_spec_replicas', 'container': 'kube-state-metrics', 'deployment': 'resource-consumer',
-    'endpoint': 'http', 'instance': '10.244.0.5:8080', 'job': 'kube-state-metrics', 'namespace': 'polaris',
-    'pod': 'prometheus-kube-state-metrics-66df9d47b4-2frqf', 'service': 'prometheus-kube-state-metrics'},
-    'values': [[1687017345, '1'],
-               [1687017350, '1'],
-               [1687017355, '1'],
-               [1687017360, '1'],
-               [1687017365, '1'],
-               [1687017370, '1'],
-               [1687017375, '1'],
-               [1687017380, '1'],
-               [1687017385, '1'],
-               [1687017390, '1'],
-               [1687017395, '1'],
-               [1687017400, '1'],
-               [1687017405, '1'],
-               [1687017410, '1'],
-               [1687017415, '1'],
-               [1687017420, '1'],
-               [1687017425, '1'],
-               [1687017430, '1'],
-               [1687017435, '1'],
-               [1687017440, '1'],
-               [1687017445, '1'],
-               [1687017450, '1'],
-               [1687017455, '1'],
-               [1687017460, '1'],
-               [1687017465, '1'],
-               [1687017470, '1'],
-               [1687017475, '1'],
-               [1687017480, '1'],
-               [1687017485, '1'],
-               [1687017490, '1'],
-               [1687017495, '1'],
-               [1687017500, '1'],
-               [1687017505, '1'],
-               [1687017510, '1'],
-               [1687017515, '1'],
-               [1687017520, '1'],
-               [1687017525, '1'],
-               [1687017530, '1'],
-               [1687017535, '1'],
-               [1687017540, '1'],
-               [1687017545, '1'],
-               [1687017550, '1'],
-               [1687017555, '1'],
-               [1687017560, '1'],
-               [1687017565, '1'],
-               [1687017570, '1'],
-               [1687017575, '1'],
-               [1687017580, '1'],
-               [1687017585, '1'],
-               [1687017590, '1'],
-               [1687017595, '1'],
-               [1687017600, '1'],
-               [1687017605, '1'],
-               [1687017610, '1'],
-               [1687017615, '2'],
-               [1687017620, '2'],
-               [1687017625, '2'],
-               [1687017630, '2'],
-               [1687017635, '2'],
-               [1687017640, '2'],
-               [1687017645, '2'],
-               [1687017650, '2'],
-               [1687017655, '2'],
-               [1687017660, '2'],
-               [1687017665, '2'],
-               [1687017670, '2'],
-               [1687017675, '3'],
-               [1687017680, '3'],
-               [1687017685, '3'],
-               [1687017690, '3'],
-               [1687017695, '3'],
-               [1687017700, '3'],
-               [1687017705, '3'],
-               [1687017710, '3'],
-               [1687017715, '3'],
-               [1687017720, '3'],
-               [1687017725, '3'],
-               [1687017730, '3'],
-               [1687017735, '3'],
-               [1687017740, '3'],
-               [1687017745, '3'],
-               [1687017750, '3'],
-               [1687017755, '3'],
-               [1687017760, '3'],
-               [1687017765, '3'],
-               [1687017770, '3'],
-               [1687017775, '3'],
-               [1687017780, '3'],
-               [1687017785, '3'],
-               [1687017790, '3'],
-               [1687017795, '3'],
-               [1687017800, '3'],
-               [1687017805, '3'],
-               [1687017810, '3'],
-               [1687017815, '3'],
-               [1687017820, '3'],
-               [1687017825, '3'],
-               [1687017830, '3'],
-               [1687017835, '3'],
-               [1687017840, '3'],
-               [1687017845, '3'],
-               [1687017850, '3'],
-               [1687017855, '3'],
-               [1687017860, '3'],
-               [1687017865, '3'],
-               [1687017870, '3'],
-               [1687017875, '3'],
-               [1687017880, '3'],
-               [1687017885, '3'],
-               [1687017890, '3'],
-               [1687017895, '3'],
-               [1687017900, '3'],
-               [1687017905, '3'],
-               [1687017910, '3'],
-               [1687017915, '3'],
-               [1687017920, '3'],
-               [1687017925, '3'],
-               [1687017930, '3'],
-               [1687017935, '3'],
-               [1687017940, '3'],
-               [1687017945, '3'],
-               [1687017950, '3'],
-               [1687017955, '3'],
-               [1687017960, '3'],
-               [1687017965, '3'],
-               [1687017970, '3'],
-               [1687017975, '3'],
-               [1687017980, '3'],
-               [1687017985, '3'],
-               [1687017990, '3'],
-               [1687017995, '3'],
-               [1687018000, '3'],
-               [1687018005, '3'],
-               [1687018010, '3'],
-               [1687018015, '3'],
-               [1687018020, '3'],
-               [1687018025, '3'],
-               [1687018030, '3'],
-               [1687018035, '3'],
-               [1687018040, '3'],
-               [1687018045, '3'],
-               [1687018050, '3'],
-               [1687018055, '3'],
-               [1687018060, '3'],
-               [1687018065, '3'],
-               [1687018070, '3'],
-               [1687018075, '3'],
-               [1687018080, '3'],
-               [1687018085, '3'],
-               [1687018090, '3'],
-               [1687018095, '3'],
-               [1687018100, '3'],
-               [1687018105, '3'],
-               [1687018110, '3'],
-               [1687018115, '3'],
-               [1687018120, '3'],
-               [1687018125, '3'],
-               [1687018130, '3'],
-               [1687018135, '3'],
-               [1687018140, '3'],
-               [1687018145, '3'],
-               [1687018150, '3'],
-               [1687018155, '5'],
-               [1687018160, '5'],
-               [1687018165, '5'],
-               [1687018170, '5'],
-               [1687018175, '5'],
-               [1687018180, '5'],
-               [1687018185, '5'],
-               [1687018190, '5'],
-               [1687018195, '5'],
-               [1687018200, '5'],
-               [1687018205, '5'],
-               [1687018210, '5'],
-               [1687018215, '5'],
-               [1687018220, '5'],
-               [1687018225, '5'],
-               [1687018230, '5'],
-               [1687018235, '5'],
-               [1687018240, '5'],
-               [1687018245, '5'],
-               [1687018250, '5'],
-               [1687018255, '5'],
-               [1687018260, '5'],
-               [1687018265, '5'],
-               [1687018270, '5'],
-               [1687018275, '5'],
-               [1687018280, '5'],
-               [1687018285, '5'],
-               [1687018290, '5'],
-               [1687018295, '5'],
-               [1687018300, '5'],
-               [1687018305, '5'],
-               [1687018310, '5'],
-               [1687018315, '5'],
-               [1687018320, '5'],
-               [1687018325, '5'],
-               [1687018330, '5'],
-               [1687018335, '5'],
-               [1687018340, '5'],
-               [1687018345, '5'],
-               [1687018350, '5'],
-               [1687018355, '5'],
-               [1687018360, '5'],
-               [1687018365, '5'],
-               [1687018370, '5'],
-               [1687018375, '5'],
-               [1687018380, '5'],
-               [1687018385, '5'],
-               [1687018390, '5'],
-               [1687018395, '5'],
-               [1687018400, '5'],
-               [1687018405, '5'],
-               [1687018410, '5'],
-               [1687018415, '5'],
-               [1687018420, '5'],
-               [1687018425, '5'],
-               [1687018430, '5'],
-               [1687018435, '5'],
-               [1687018440, '5'],
-               [1687018445, '5'],
-               [1687018450, '5'],
-               [1687018455, '5'],
-               [1687018460, '5'],
-               [1687018465, '5'],
-               [1687018470, '5'],
-               [1687018475, '5'],
-               [1687018480, '5'],
-               [1687018485, '5'],
-               [1687018490, '5'],
-               [1687018495, '5'],
-               [1687018500, '5'],
-               [1687018505, '5'],
-               [1687018510, '5'],
-               [1687018515, '5'],
-               [1687018520, '5'],
-               [1687018525, '5'],
-               [1687018530, '5'],
-               [1687018535, '5'],
-               [1687018540, '5'],
-               [1687018545, '5'],
-               [1687018550, '5'],
-               [1687018555, '5'],
-               [1687018560, '5'],
-               [1687018565, '5'],
-               [1687018570, '5'],
-               [1687018575, '5'],
-               [1687018580, '5'],
-               [1687018585, '5'],
-               [1687018590, '5'],
-               [1687018595, '5'],
-               [1687018600, '5'],
-               [1687018605, '5'],
-               [1687018610, '5'],
-               [1687018615, '5'],
-               [1687018620, '5'],
-               [1687018625, '5'],
-               [1687018630, '5'],
-               [1687018635, '4'],
-               [1687018640, '4'],
-               [1687018645, '4'],
-               [1687018650, '4'],
-               [1687018655, '4'],
-               [1687018660, '4'],
-               [1687018665, '4'],
-               [1687018670, '4'],
-               [1687018675, '4'],
-               [1687018680, '4'],
-               [1687018685, '4'],
-               [1687018690, '4'],
-               [1687018695, '4'],
-               [1687018700, '4'],
-               [1687018705, '4'],
-               [1687018710, '4'],
-               [1687018715, '4'],
-               [1687018720, '4'],
-               [1687018725, '4'],
-               [1687018730, '4'],
-               [1687018735, '4']]}]}}
-  result = test.extract_query_result(query)
-  return [[test.correct_time(sublist[0], start), int(sublist[1])] for sublist in result]
-
-
-def mock_noop(*args):
-  return None
-
-
-test.get_cpu_usage = mock_get_cpu_usage
-test.get_cpu_resource_req = mock_get_cpu_resource_req
-test.get_container_resource_req = mock_get_container_resource_req
-test.get_replica_count = mock_get_replica_count
-
-test_case = test.SloTest('Random Decision', 'resource-consumer', ['resource-consumer-in-place.yaml', 'random.yaml'],
-                         'plot_test')
-
-start = 1687017345
-end = 1687018735
-
-test.plot_test_result(test_case, start, end, mock_observe_load())
+os.makedirs('./result', exist_ok=True)
+test.replay_test_result(archive_file)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The harness modules are imported by their plain names, as the run scripts in test/tools do.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,45 @@
+import struct
+
+import numpy as np
+
+import archive
+from series import Series
+
+
+def test_archive_round_trip(tmp_path):
+  series = {
+    'cpu_usage': Series([1700000000, 1700000015, 1700000030], [49.5, np.nan, 51.25]),
+    'cpu_req': Series([1700000000, 1700000015], [0.1, 0.2]),
+    'pod_count': Series([0, 2 ** 33], [1, 3]),
+    'container_req': Series([], [])
+  }
+  path = tmp_path / 'test.archive'
+  archive.write_archive(path, {'test': 'linear'}, series, {'horizontalelasticitystrategies': [1700000020]})
+
+  loaded = archive.read_archive(path)
+  assert loaded.metadata == {'test': 'linear'}
+  assert loaded.scaling_actions == {'horizontalelasticitystrategies': [1700000020]}
+  for name, expected in series.items():
+    np.testing.assert_array_equal(loaded.series[name].times, expected.times)
+    np.testing.assert_array_equal(loaded.series[name].values, expected.values)
+    assert loaded.series[name].times.dtype == np.int64
+
+
+def test_archive_layout(tmp_path):
+  path = tmp_path / 'test.archive'
+  archive.write_archive(path, {}, {'pod_count': Series([100, 115], [1, 2])}, {})
+  buffer = path.read_bytes()
+
+  magic, version, header_length = struct.unpack_from(archive.preamble_format, buffer)
+  assert (magic, version) == (b'PSLA', 1)
+  data_start = archive.aligned(struct.calcsize(archive.preamble_format) + header_length)
+  # Integral values are stored as int32 and times as uint32 offsets from their base, each column 64 byte aligned.
+  assert buffer[data_start:data_start + 8] == bytes.fromhex('000000000f000000')
+  assert buffer[data_start + 64:data_start + 72] == bytes.fromhex('0100000002000000')
+  assert len(buffer) == data_start + 72
+
+
+def test_compact_values_keeps_precision():
+  assert archive.compact_values([1, 2]).dtype == np.int32
+  assert archive.compact_values([0.5, np.nan]).dtype == np.float32
+  assert archive.compact_values([0.1]).dtype == np.float64
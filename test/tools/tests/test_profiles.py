@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+import profiles
+
+# The same encodings are decoded by cpu-load.profile.spec.ts in the demo-cpu-load-metric-controller.
+encoded_profiles = [
+  ([-5, 250], '50534c50' '0100' '01' '00' '02000000' 'fbffffff' '00ff'),
+  ([1000, 1256], '50534c50' '0100' '02' '00' '02000000' 'e8030000' '0000' '0001'),
+  ([-70000, 0], '50534c50' '0100' '04' '00' '02000000' '90eefeff' '00000000' '70110100')
+]
+
+
+@pytest.mark.parametrize('values, encoded', encoded_profiles)
+def test_encode_profile_uses_the_narrowest_width(values, encoded):
+  assert profiles.encode_profile(values).hex() == encoded
+  np.testing.assert_array_equal(profiles.decode_profile(bytes.fromhex(encoded)), values)
+
+
+def test_profile_round_trip(tmp_path):
+  profile = profiles.diurnal(200, 1500, 1000, period=480, noise=0.05, seed=1)
+  path = tmp_path / 'profile.bin'
+  profiles.write_profile(path, profile)
+  assert profiles.read_profile(path) == profile
+
+
+def test_encode_profile_rounds_half_to_even():
+  encoded = profiles.encode_profile([-2.5, 0.5, 1.5, 2.5, 2.6])
+  assert encoded.hex() == '50534c50' '0100' '01' '00' '05000000' 'feffffff' '0002040405'
+  np.testing.assert_array_equal(profiles.decode_profile(encoded), [-2, 0, 2, 2, 3])
+
+
+def test_encode_profile_rejects_values_beyond_32_bits():
+  with pytest.raises(ValueError):
+    profiles.encode_profile([0, 2 ** 32])
+
+
+def test_decode_profile_rejects_other_formats():
+  with pytest.raises(ValueError):
+    profiles.decode_profile(bytes.fromhex('50534c540100010000000000' '00000000'))
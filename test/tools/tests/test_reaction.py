@@ -0,0 +1,40 @@
+import numpy as np
+
+import reaction
+from series import Series
+
+
+def usage_series():
+  # 50 % with +-2 % noise on every sample. The step at 45 s shows up at 60 s, the usage drops back right at 90 s.
+  times = np.arange(0, 135, 5)
+  values = 50 + np.where(np.arange(len(times)) % 2 == 0, 2.0, -2.0)
+  values[(times >= 60) & (times < 90)] = 80
+  values[times >= 90] = 50 + np.where(np.arange(np.count_nonzero(times >= 90)) % 2 == 0, 2.0, -2.0)
+  return Series(times, values)
+
+
+def test_detection_ignores_noise_within_the_band():
+  starts, ends = reaction.load_steps([100, 200, 100], 135, 45)
+  detected = reaction.detection_times(usage_series(), starts, ends, band=10)
+  np.testing.assert_array_equal(starts, [45, 90])
+  np.testing.assert_array_equal(detected, [60, 90])
+
+
+def test_detection_without_a_change_stays_unmatched():
+  usage = Series(np.arange(0, 90, 5), np.full(18, 50.0))
+  starts, ends = reaction.load_steps([100, 200], 90, 45)
+  assert np.isnan(reaction.detection_times(usage, starts, ends, band=10)).all()
+
+
+def test_step_reactions_split_the_latency_into_stages():
+  usage = usage_series()
+  pods = Series([0, 70, 130], [1, 2, 2])
+  series = {'pod_count': pods, 'container_req': Series([0], [0.5]), 'cpu_req': Series([0], [0.5])}
+  actions = {'horizontalelasticitystrategies': [65.0]}
+  starts, reactions = reaction.step_reactions(usage, series, actions, [100, 200, 100], 135, 45, band=10)
+  horizontal = reactions['horizontalelasticitystrategies']
+  np.testing.assert_array_equal(horizontal['detection'], [15, 0])
+  np.testing.assert_array_equal(horizontal['decision'][:1], [5])
+  np.testing.assert_array_equal(horizontal['actuation'][:1], [5])
+  np.testing.assert_array_equal(horizontal['total'][:1], [25])
+  assert np.isnan(horizontal['decision'][1])
@@ -0,0 +1,33 @@
+import numpy as np
+
+import scoring
+from series import Series
+
+
+def test_score_runs_on_hand_computed_series():
+  times = np.arange(0, 90, 5)
+  # The load steps up at 45 s. The first run leaves the band for 15 s and settles at 55 %, the second one stays at 25 %
+  # on twice the cores it needs.
+  settling = np.where(times < 45, 50.0, np.where(times < 60, 75.0, 55.0))
+  cpu_usage = [Series(times, settling), Series(times, np.full(len(times), 25.0))]
+  cpu_req = [Series(times, np.ones(len(times))), Series(times, np.full(len(times), 2.0))]
+  scaling_actions = [{'horizontalelasticitystrategies': [10, 20], 'verticalelasticitystrategies': [30]}, {}]
+
+  scores = scoring.score_runs(cpu_usage, cpu_req, scaling_actions, [90, 90], [[100, 200], [100, 200]])
+
+  np.testing.assert_array_equal(scores['time_above_target_sec'], [45, 0])
+  np.testing.assert_array_equal(scores['time_below_target_sec'], [0, 90])
+  np.testing.assert_array_equal(scores['absolute_error_integral'], [(3 * 25 + 6 * 5) * 5, 18 * 25 * 5])
+  np.testing.assert_array_equal(scores['overprovisioned_core_sec'], [0, 90])
+  np.testing.assert_array_equal(scores['mean_settling_sec'], [15, 45])
+  np.testing.assert_array_equal(scores['max_settling_sec'], [15, 45])
+  np.testing.assert_array_equal(scores['unsettled_steps'], [0, 1])
+  assert scores['unsettled_steps'].dtype == np.int64
+  np.testing.assert_allclose(scores['scaling_actions_per_min'], [2, 0])
+  np.testing.assert_allclose(scores['horizontal_actions_per_min'], [4 / 3, 0])
+  np.testing.assert_allclose(scores['vertical_actions_per_min'], [2 / 3, 0])
+
+
+def test_rank_skips_runs_without_a_value():
+  scores = {'max_settling_sec': np.array([30.0, np.nan, 10.0])}
+  np.testing.assert_array_equal(scoring.rank(scores, 'max_settling_sec'), [2, 0])
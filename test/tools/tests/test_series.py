@@ -0,0 +1,15 @@
+import numpy as np
+
+from series import Series
+
+
+def test_from_samples_parses_prometheus_values():
+  series = Series.from_samples([[1700000000.5, '1.5'], [1700000015, 'NaN'], [1700000030, '+Inf']], 1700000000, 2)
+  np.testing.assert_array_equal(series.times, [1, 30, 60])
+  np.testing.assert_array_equal(series.values, [1.5, np.nan, np.inf])
+
+
+def test_from_samples_without_samples():
+  series = Series.from_samples([])
+  assert len(series) == 0
+  assert series.times.dtype == np.int64
@@ -0,0 +1,28 @@
+import numpy as np
+
+import simulator
+
+
+def best_fit_model(secondary=simulator.vertical_strategy):
+  config = simulator.StrategyConfig(min_replicas=1, max_replicas=4, min_milli_cpu=200, max_milli_cpu=1000)
+  return simulator.MappingModel('BestFitElasticityDecisionLogic', simulator.horizontal_strategy, secondary,
+                                config=config)
+
+
+def test_best_fit_reads_follow_the_decision_logic():
+  # Scaling up with both, only the horizontal, and neither strategy available.
+  compliance = np.full(3, 150.0)
+  replicas = np.array([2.0, 2.0, 4.0])
+  milli_cpu = np.array([500.0, 1000.0, 1000.0])
+  reads, queries = simulator.decision_reads(best_fit_model(), compliance, replicas, milli_cpu)
+  np.testing.assert_array_equal(reads, [2, 2, 2])
+  np.testing.assert_array_equal(queries, [1, 0, 1])
+
+
+def test_best_fit_without_an_available_strategy_computes_the_future_compliance():
+  # Both strategies are horizontal, so the availability check reads only the Scale, but the future compliance also
+  # reads the pod template.
+  model = best_fit_model(secondary=simulator.horizontal_strategy)
+  reads, queries = simulator.decision_reads(model, np.array([150.0]), np.array([4.0]), np.array([1000.0]))
+  np.testing.assert_array_equal(reads, [2])
+  np.testing.assert_array_equal(queries, [1])
@@ -0,0 +1,29 @@
+import os
+
+import numpy as np
+
+import profiles
+import simulator
+import sweep
+
+mappings = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'slo-mappings', 'base')
+
+
+def best_fit_model():
+  return simulator.MappingModel.from_yaml(os.path.join(mappings, 'best-fit.yaml'),
+                                          os.path.join(mappings, 'resource-consumer.yaml'))
+
+
+def test_configurations_are_scored_against_the_slo_target():
+  loads, lengths = simulator.load_matrix([profiles.linear])
+  metrics = sweep.evaluate_chunk(best_fit_model(), {'target_utilization': np.array([50.0, 90.0])}, loads, lengths, 0)
+  # Scaling for 90 % leaves the usage above the 50 % SLO target for longer, instead of hiding the violations.
+  violations = metrics['violation_sec'][:, 0]
+  assert violations[1] > violations[0]
+
+
+def test_best_reports_integer_parameters_as_ints():
+  result = sweep.SweepResult({'min_replicas': np.array([2.0, 1.0]), 'threshold': np.array([0.5, 0.7])}, ['linear'],
+                             {'violation_sec': np.array([[3.0], [1.0]])})
+  assert result.best() == [{'min_replicas': 1, 'threshold': 0.7}, {'min_replicas': 2, 'threshold': 0.5}]
+  assert isinstance(result.best()[0]['min_replicas'], int)
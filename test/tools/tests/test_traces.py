@@ -0,0 +1,63 @@
+import json
+
+import numpy as np
+import pytest
+
+import traces
+
+# The same trace is replayed by cpu-load.trace.spec.ts in the demo-cpu-load-metric-controller.
+encoded_trace = ('50534c54' '0100' '01' '00' '03000000' 'fbffffff' '983a0000' '00000040fc54d941' '00000000'
+                 '00' 'ff' '69')
+
+
+def test_trace_layout(tmp_path):
+  path = tmp_path / 'test.trace'
+  traces.write_trace(path, 1700000000.0, 15, [-5, 250, 100])
+  assert path.read_bytes().hex() == encoded_trace
+
+  trace = traces.read_trace(path)
+  assert (trace.start, trace.step_sec, len(trace)) == (1700000000.0, 15, 3)
+  np.testing.assert_array_equal(trace.values, [-5, 250, 100])
+  assert [trace.value_at(seconds) for seconds in (0, 14.9, 15, 44, 45)] == [-5, -5, 250, 100, -5]
+
+
+def test_resampler_averages_steps_and_carries_values_over_gaps():
+  resampler = traces.Resampler(15)
+  resampler.add([30, 35, 40, 80], [4, 6, 8, 20])
+  # A later chunk may start before the earlier ones, and invalid samples are dropped.
+  resampler.add([0, 5, 50, np.nan], [1, 3, np.inf, 100])
+  start, values = resampler.result()
+  assert start == 0
+  np.testing.assert_array_equal(values, [2, 2, 6, 6, 6, 20])
+
+
+def test_resampler_without_samples():
+  start, values = traces.Resampler(15).result()
+  assert start == 0.0 and len(values) == 0
+
+
+def test_resample_prometheus_sums_series(tmp_path):
+  path = tmp_path / 'query.json'
+  path.write_text(json.dumps({'data': {'result': [
+    {'values': [[0, '0.1'], [15, '0.2']]},
+    {'values': [[15, '0.5'], [30, '0.5']]}
+  ]}}))
+  start, values = traces.resample_prometheus(path, 15)
+  assert start == 0
+  np.testing.assert_allclose(values, [100, 700, 500])
+
+
+def test_convert_csv(tmp_path):
+  path = tmp_path / 'trace.csv'
+  path.write_text('time,millis\n0,100\n10,200\n20,300\n50,400\n')
+  trace = traces.convert(str(path), str(tmp_path / 'test.trace'), 30)
+  assert trace.step_sec == 30
+  np.testing.assert_array_equal(trace.values, [200, 400])
+  assert trace.profile(step_sec=15) == [200, 200, 400, 400]
+
+
+def test_read_trace_rejects_profiles(tmp_path):
+  path = tmp_path / 'profile.bin'
+  path.write_bytes(bytes.fromhex('50534c500100010000000000000000000000000000000000000000000000000000'))
+  with pytest.raises(ValueError):
+    traces.read_trace(path)
@@ -0,0 +1,219 @@
+import asyncio
+import contextlib
+import contextvars
+import csv
+import functools
+import json
+import os
+import resource
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+
+report_fields = ['name', 'count', 'total_ms', 'self_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms', 'cpu_ms',
+                 'children_cpu_ms']
+
+current_stack = contextvars.ContextVar('timing_stack', default=())
+
+
+def children_cpu_sec():
+  # CPU time of waited-for subprocesses like kubectl, which process_time() does not include.
+  usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+  return usage.ru_utime + usage.ru_stime
+
+
+class Span:
+  def __init__(self, stack, lane, start, end, cpu_sec, children_cpu_sec, args):
+    self.stack = stack
+    self.lane = lane
+    self.start = start
+    self.end = end
+    self.cpu_sec = cpu_sec
+    self.children_cpu_sec = children_cpu_sec
+    self.args = args
+
+  @property
+  def name(self):
+    return self.stack[-1]
+
+  @property
+  def duration(self):
+    return self.end - self.start
+
+
+class Recorder:
+  def __init__(self):
+    self.lock = threading.Lock()
+    self.reset()
+
+  def reset(self):
+    with self.lock:
+      self.spans = []
+      self.lanes = {}
+      self.origin = time.perf_counter()
+      self.started_at = time.time()
+
+  def lane(self):
+    # Spans of one thread or asyncio task always nest, so each of them gets its own lane in the trace.
+    try:
+      task = asyncio.current_task()
+    except RuntimeError:
+      task = None
+    key = ('task', id(task)) if task is not None else ('thread', threading.get_ident())
+    with self.lock:
+      if key not in self.lanes:
+        label = task.get_name() if task is not None else threading.current_thread().name
+        self.lanes[key] = (len(self.lanes) + 1, label)
+      return self.lanes[key][0]
+
+  def add(self, span):
+    with self.lock:
+      self.spans.append(span)
+
+  def snapshot(self):
+    with self.lock:
+      return list(self.spans), list(self.lanes.values()), self.origin
+
+
+recorder = Recorder()
+
+
+@contextlib.contextmanager
+def span(name, **args):
+  stack = current_stack.get() + (name,)
+  token = current_stack.set(stack)
+  lane = recorder.lane()
+  cpu, children_cpu, start = time.process_time(), children_cpu_sec(), time.perf_counter()
+  try:
+    yield
+  finally:
+    end = time.perf_counter()
+    current_stack.reset(token)
+    recorder.add(Span(stack, lane, start, end, time.process_time() - cpu, children_cpu_sec() - children_cpu, args))
+
+
+def timed(name=None):
+  def decorate(function):
+    label = name or function.__name__
+    if asyncio.iscoroutinefunction(function):
+      @functools.wraps(function)
+      async def timed_coroutine(*args, **kwargs):
+        with span(label):
+          return await function(*args, **kwargs)
+
+      return timed_coroutine
+
+    @functools.wraps(function)
+    def timed_function(*args, **kwargs):
+      with span(label):
+        return function(*args, **kwargs)
+
+    return timed_function
+
+  return decorate
+
+
+def in_context(function):
+  # Binds a function to the caller's span stack, so that spans in executor threads nest under the submitting span.
+  return functools.partial(contextvars.copy_context().run, function)
+
+
+def chrome_trace(spans, lanes, origin):
+  pid = os.getpid()
+  events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': lane, 'args': {'name': label}}
+            for lane, label in lanes]
+  for recorded in sorted(spans, key=lambda recorded: (recorded.start, -recorded.end)):
+    events.append({
+      'name': recorded.name,
+      'cat': recorded.stack[0],
+      'ph': 'X',
+      'pid': pid,
+      'tid': recorded.lane,
+      'ts': round((recorded.start - origin) * 1e6, 3),
+      'dur': round(recorded.duration * 1e6, 3),
+      'args': {**{key: str(value) for key, value in recorded.args.items()},
+               'cpu_ms': round(recorded.cpu_sec * 1000, 3),
+               'children_cpu_ms': round(recorded.children_cpu_sec * 1000, 3)}
+    })
+  return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def stack_totals(spans):
+  totals = defaultdict(float)
+  for recorded in spans:
+    totals[recorded.stack] += recorded.duration
+  return totals
+
+
+def self_times(spans):
+  # Children of a gathered phase run concurrently, so a parent's self time is clamped at zero.
+  totals = stack_totals(spans)
+  children = defaultdict(float)
+  for stack, total in totals.items():
+    if len(stack) > 1:
+      children[stack[:-1]] += total
+  return {stack: max(0.0, total - children[stack]) for stack, total in totals.items()}
+
+
+def folded_stacks(spans):
+  # The folded format of flamegraph.pl and speedscope, weighted by self time in microseconds.
+  return [f'{";".join(stack)} {round(duration * 1e6)}' for stack, duration in sorted(self_times(spans).items())
+          if round(duration * 1e6) > 0]
+
+
+def summary(spans):
+  self_by_name = defaultdict(float)
+  for stack, duration in self_times(spans).items():
+    self_by_name[stack[-1]] += duration
+  by_name = defaultdict(list)
+  for recorded in spans:
+    by_name[recorded.name].append(recorded)
+  rows = []
+  for name, named in by_name.items():
+    durations = np.array([recorded.duration for recorded in named]) * 1000
+    rows.append({
+      'name': name,
+      'count': len(named),
+      'total_ms': durations.sum(),
+      'self_ms': self_by_name[name] * 1000,
+      'mean_ms': durations.mean(),
+      'p50_ms': np.percentile(durations, 50),
+      'p95_ms': np.percentile(durations, 95),
+      'max_ms': durations.max(),
+      'cpu_ms': sum(recorded.cpu_sec for recorded in named) * 1000,
+      'children_cpu_ms': sum(recorded.children_cpu_sec for recorded in named) * 1000
+    })
+  return sorted(rows, key=lambda row: -row['total_ms'])
+
+
+def format_summary(rows):
+  lines = [f'{"phase":<28}{"count":>7}{"total s":>10}{"self s":>10}{"p50 ms":>10}{"p95 ms":>10}{"cpu s":>8}'
+           f'{"child s":>9}']
+  for row in rows:
+    lines.append(f'{row["name"][:27]:<28}{row["count"]:>7}{row["total_ms"] / 1000:>10.2f}{row["self_ms"] / 1000:>10.2f}'
+                 f'{row["p50_ms"]:>10.1f}{row["p95_ms"]:>10.1f}{row["cpu_ms"] / 1000:>8.2f}'
+                 f'{row["children_cpu_ms"] / 1000:>9.2f}')
+  return '\n'.join(lines)
+
+
+def export(directory, label=None):
+  spans, lanes, origin = recorder.snapshot()
+  if not spans:
+    return None
+  label = label or time.strftime('%Y%m%d-%H%M%S', time.localtime(recorder.started_at))
+  os.makedirs(directory, exist_ok=True)
+  base = os.path.join(directory, label)
+  with open(f'{base}.trace.json', 'w') as file:
+    json.dump(chrome_trace(spans, lanes, origin), file)
+  with open(f'{base}.folded', 'w') as file:
+    file.write('\n'.join(folded_stacks(spans)) + '\n')
+  rows = summary(spans)
+  with open(f'{base}.csv', 'w', newline='') as file:
+    writer = csv.DictWriter(file, fieldnames=report_fields)
+    writer.writeheader()
+    writer.writerows(rows)
+  print(format_summary(rows))
+  print(f'Timing report written to {base}.csv, trace to {base}.trace.json')
+  return base
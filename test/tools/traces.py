@@ -0,0 +1,153 @@
+import itertools
+import json
+import struct
+
+import numpy as np
+
+import profiles
+
+trace_magic = b'PSLT'
+trace_version = 1
+# magic, version, value width, padding, count, base, step in ms, start as unix seconds, padding to 32 bytes
+preamble_format = '<4sHBxIiId4x'
+default_step_sec = 15
+csv_chunk_rows = 1000000
+
+
+class Trace:
+  def __init__(self, start, step_sec, base, offsets):
+    self.start = start
+    self.step_sec = step_sec
+    self.base = base
+    self.offsets = offsets
+
+  def __len__(self):
+    return len(self.offsets)
+
+  @property
+  def values(self):
+    return self.offsets.astype(np.int64) + self.base
+
+  def value_at(self, seconds):
+    # Replays cyclically like the controller, seconds are counted from the start of the replay.
+    return int(self.offsets[int(seconds // self.step_sec) % len(self.offsets)]) + self.base
+
+  def profile(self, step_sec=profiles.load_step_sec, length=None):
+    # The values the controller emits at every load step, for waiting on and recording a test run.
+    length = length or max(1, int(len(self) * self.step_sec // step_sec))
+    indexes = (np.arange(length) * step_sec // self.step_sec).astype(np.int64) % len(self)
+    return (self.offsets[indexes].astype(np.int64) + self.base).tolist()
+
+
+class Resampler:
+  # Accumulates samples chunk by chunk into the mean per step, so that traces with millions of rows are never held
+  # in memory as a whole. Steps are aligned to multiples of step_sec since the epoch.
+  def __init__(self, step_sec):
+    self.step_sec = step_sec
+    self.start = None
+    self.sums = np.zeros(0)
+    self.counts = np.zeros(0)
+
+  def add(self, timestamps, values):
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.isfinite(timestamps) & np.isfinite(values)
+    timestamps, values = timestamps[valid], values[valid]
+    if len(values) == 0:
+      return
+    earliest = np.floor(timestamps.min() / self.step_sec) * self.step_sec
+    if self.start is None:
+      self.start = earliest
+    elif earliest < self.start:
+      shift = int(round((self.start - earliest) / self.step_sec))
+      self.sums = np.concatenate((np.zeros(shift), self.sums))
+      self.counts = np.concatenate((np.zeros(shift), self.counts))
+      self.start = earliest
+    bins = ((timestamps - self.start) // self.step_sec).astype(np.int64)
+    size = max(len(self.sums), int(bins.max()) + 1)
+    self.sums = np.pad(self.sums, (0, size - len(self.sums))) + np.bincount(bins, weights=values, minlength=size)
+    self.counts = np.pad(self.counts, (0, size - len(self.counts))) + np.bincount(bins, minlength=size)
+
+  def result(self):
+    # Steps without samples carry the previous value over.
+    if self.start is None:
+      return 0.0, np.empty(0)
+    filled = np.maximum.accumulate(np.where(self.counts > 0, np.arange(len(self.counts)), 0))
+    return self.start, (self.sums / np.maximum(self.counts, 1))[filled]
+
+
+def combine(resamplers, step_sec):
+  # Sums the resampled series, e.g., the CPU usage of all pods of a workload. A series counts as 0 outside its range.
+  results = [resampler.result() for resampler in resamplers if resampler.start is not None]
+  if not results:
+    return 0.0, np.empty(0)
+  start = min(result[0] for result in results)
+  offsets = [int(round((result[0] - start) / step_sec)) for result in results]
+  total = np.zeros(max(offset + len(result[1]) for offset, result in zip(offsets, results)))
+  for offset, (_, values) in zip(offsets, results):
+    total[offset:offset + len(values)] += values
+  return start, total
+
+
+def read_csv_chunks(path, time_column=0, value_column=1, skip_header=1, chunk_rows=csv_chunk_rows):
+  with open(path) as file:
+    for _ in range(skip_header):
+      next(file, None)
+    while True:
+      lines = list(itertools.islice(file, chunk_rows))
+      if not lines:
+        return
+      chunk = np.loadtxt(lines, delimiter=',', usecols=(time_column, value_column), ndmin=2)
+      yield chunk[:, 0], chunk[:, 1]
+
+
+def resample_csv(path, step_sec=default_step_sec, scale=1.0, time_unit_sec=1.0, time_column=0, value_column=1,
+                 skip_header=1):
+  resampler = Resampler(step_sec)
+  for timestamps, values in read_csv_chunks(path, time_column, value_column, skip_header):
+    resampler.add(timestamps * time_unit_sec, values * scale)
+  return resampler.result()
+
+
+def resample_prometheus(path, step_sec=default_step_sec, scale=1000.0):
+  # A query_range response or a range vector query result of the Prometheus HTTP API, e.g., of
+  # sum(rate(container_cpu_usage_seconds_total[1m])) in cores, which scale converts to millis.
+  with open(path) as file:
+    result = json.load(file)['data']['result']
+  resamplers = []
+  for series in result:
+    resampler = Resampler(step_sec)
+    samples = np.array(series.get('values', []), dtype=np.float64).reshape(-1, 2)
+    resampler.add(samples[:, 0], samples[:, 1] * scale)
+    resamplers.append(resampler)
+  return combine(resamplers, step_sec)
+
+
+def write_trace(path, start, step_sec, values):
+  base, width, offsets = profiles.compact_values(values)
+  with open(path, 'wb') as file:
+    file.write(struct.pack(preamble_format, trace_magic, trace_version, width, len(offsets), base,
+                           int(round(step_sec * 1000)), start))
+    file.write(offsets.tobytes())
+
+
+def read_trace(path):
+  with open(path, 'rb') as file:
+    preamble = file.read(struct.calcsize(preamble_format))
+  magic, version, width, count, base, step_ms, start = struct.unpack(preamble_format, preamble)
+  if magic != trace_magic or version != trace_version or width not in profiles.value_widths:
+    raise ValueError(f'{path} is not a version {trace_version} CPU load trace')
+  dtype = np.dtype(f'<u{width}')
+  if count == 0:
+    return Trace(start, step_ms / 1000, base, np.empty(0, dtype))
+  offsets = np.memmap(path, dtype, 'r', struct.calcsize(preamble_format), (count,))
+  return Trace(start, step_ms / 1000, base, offsets)
+
+
+def convert(input_path, output_path, step_sec=default_step_sec, scale=None):
+  if input_path.endswith('.json'):
+    start, values = resample_prometheus(input_path, step_sec, 1000.0 if scale is None else scale)
+  else:
+    start, values = resample_csv(input_path, step_sec, 1.0 if scale is None else scale)
+  write_trace(output_path, start, step_sec, values)
+  return read_trace(output_path)